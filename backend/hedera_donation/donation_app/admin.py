@@ -1,21 +1,70 @@
 from django.contrib import admin
-from .models import Campaign, CampaignType, LastIndexCrawl, Token, Donation, HederaUser
+from django.db.models import Q
+from .chain.accounts import normalize_evm_address
+from .changelists import AutocompleteFilter, ScalableModelAdmin
+from .exports import donations_export_response
+from .models import (
+    Campaign, CampaignType, ChunkedUpload, CrawlWindow, DonorLeaderboardEntry, EvmAddressMapping, LastIndexCrawl, StoredBlob, Token, Donation, HederaUser,
+)
+from .search import split_terms, text_query
+
+
+@admin.action(description="Export selected donations as CSV")
+def export_donations_csv(modeladmin, request, queryset):
+    return donations_export_response(queryset.order_by('id'), 'csv', 'donations')
+
+
+@admin.action(description="Export selected donations as NDJSON")
+def export_donations_ndjson(modeladmin, request, queryset):
+    return donations_export_response(queryset.order_by('id'), 'ndjson', 'donations')
+
+
+@admin.action(description="Export donations of selected campaigns as CSV")
+def export_campaign_donations_csv(modeladmin, request, queryset):
+    donations = Donation.objects.filter(campaign__in=queryset.values('id')).order_by('campaign_id', 'date', 'id')
+    return donations_export_response(donations, 'csv', 'campaign-donations')
 
 
 @admin.register(HederaUser)
-class HederaUserAdmin(admin.ModelAdmin):
-    list_display = ('id', 'username', 'email', 'wallet_address',
+class HederaUserAdmin(ScalableModelAdmin):
+    list_display = ('id', 'username', 'email', 'wallet_address', 'evm_address',
                     'is_active', 'date_joined',)
-    search_fields = ('username', 'email', 'wallet_address',)
+    # prefixes and exact values only, each with its index
+    search_fields = ('^username', 'wallet_address__startswith', 'email__exact',)
     list_filter = ('is_active', 'date_joined',)
+    # also orders autocomplete results
+    ordering = ('-id',)
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        term = search_term.strip()
+        if term:
+            # stored normalized, as the indexer resolves them
+            results |= queryset.filter(evm_address=normalize_evm_address(term))
+        return results, may_have_duplicates
 
 
 @admin.register(Campaign)
-class CampaignAdmin(admin.ModelAdmin):
+class CampaignAdmin(ScalableModelAdmin):
     list_display = ('id', 'title', 'organizer', 'goal','current_amount', 'created_at', 'approved_by_admin', 'status',)
-    search_fields = ('title', 'description', 'organizer__username',)
-    list_filter = ('campaign_type', 'created_at', 'approved_by_admin', 'status',)
-    readonly_fields = ('onchain_id', 'percentage_completed', 'transaction_hash_create','transaction_hash_withdrawn',)
+    list_select_related = ('organizer',)
+    search_fields = ('title', 'description',)
+    list_filter = ('campaign_type', ('organizer', AutocompleteFilter), 'created_at', 'approved_by_admin', 'status',)
+    autocomplete_fields = ('organizer',)
+    ordering = ('-id',)
+    readonly_fields = ('onchain_id', 'current_amount', 'percentage_completed', 'transaction_hash_create','transaction_hash_withdrawn',)
+    actions = (export_campaign_donations_csv,)
+
+    def get_search_results(self, request, queryset, search_term):
+        # title and description words through campaign_fulltext_idx, or an id
+        terms = split_terms(search_term)
+        if not terms:
+            return queryset, False
+        matches = Q(search_vector=text_query(terms))
+        term = search_term.strip()
+        if term.isdigit() and int(term) < 2 ** 31:
+            matches |= Q(id=int(term)) | Q(onchain_id=int(term))
+        return queryset.filter(matches), False
 
 
 @admin.register(CampaignType)
@@ -31,15 +80,62 @@ class TokenAdmin(admin.ModelAdmin):
 
 
 @admin.register(Donation)
-class DonationAdmin(admin.ModelAdmin):
+class DonationAdmin(ScalableModelAdmin):
     list_display = ('id', 'campaign', 'user', 'amount', 'date', 'transaction_hash',)
-    search_fields = ('campaign__title', 'user__username', 'transaction_hash',)
-    list_filter = ('date', 'campaign',)
+    list_select_related = ('campaign', 'user',)
+    search_fields = ('transaction_hash', 'user__wallet_address',)
+    list_filter = ('date', ('campaign', AutocompleteFilter), ('user', AutocompleteFilter),)
+    autocomplete_fields = ('campaign', 'user',)
     readonly_fields = ('transaction_hash',)
+    actions = (export_donations_csv, export_donations_ndjson,)
+
+    def get_search_results(self, request, queryset, search_term):
+        # a transaction hash or a donor's wallet, exactly; donors are looked
+        # up first so both sides of the OR are donation indexes
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        users = HederaUser.objects.filter(Q(wallet_address=term) | Q(evm_address=normalize_evm_address(term)))
+        user_ids = list(users.values_list('id', flat=True))
+        return queryset.filter(Q(transaction_hash=term) | Q(user__in=user_ids)), False
+
 
+@admin.register(DonorLeaderboardEntry)
+class DonorLeaderboardEntryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'token', 'total_amount', 'donation_count', 'updated_at',)
+    list_filter = ('token',)
+    readonly_fields = ('user', 'token', 'total_amount', 'donation_count', 'updated_at',)
+
+
+
+@admin.register(EvmAddressMapping)
+class EvmAddressMappingAdmin(admin.ModelAdmin):
+    list_display = ('evm_address', 'account_id', 'updated_at',)
+    search_fields = ('evm_address', 'account_id',)
 
 
 @admin.register(LastIndexCrawl)
 class LastIndexCrawlAdmin(admin.ModelAdmin):
     list_display = ('key', 'start_at', 'value', 'updated_at',)
-    search_fields = ('key', 'start_at', 'value',)
\ No newline at end of file
+    search_fields = ('key', 'start_at', 'value',)
+
+
+@admin.register(CrawlWindow)
+class CrawlWindowAdmin(admin.ModelAdmin):
+    list_display = ('id', 'crawl', 'start_ns', 'end_ns', 'position_ns', 'updated_at',)
+    list_filter = ('crawl',)
+
+
+@admin.register(ChunkedUpload)
+class ChunkedUploadAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'original_name', 'file_name', 'size', 'status', 'updated_at',)
+    list_filter = ('status',)
+    search_fields = ('original_name', 'file_name',)
+    readonly_fields = ('user', 'file_name', 'size', 'part_size', 'expected_sha256', 'sha256',)
+
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'size', 'refcount', 'updated_at',)
+    search_fields = ('sha256',)
+    readonly_fields = ('sha256', 'size', 'refcount',)
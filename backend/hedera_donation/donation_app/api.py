@@ -1,36 +1,57 @@
 import uuid
-from django.http import FileResponse
+from django.db import transaction
+from django.db.models import Subquery
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from ninja import NinjaAPI
 from ninja.errors import HttpError
 from django.conf import settings
-from datetime import datetime, timedelta
-import jwt
 from .models import (
     Campaign,
     CampaignType,
     Donation,
+    DonorLeaderboardEntry,
     Token,
     HederaUser,
 )
 from .schemas import (
     CampaignCreateSchema,
     CampaignDetailResponseSchema,
-    CampaignDonationHistorySchema,
+    CampaignDonationPageSchema,
+    CampaignDonationSummarySchema,
+    CampaignPageSchema,
     CampaignSchema,
     CampaignTypeSchema,
-    DonationHistorySchema,
+    DonationHistoryPageSchema,
+    DonationHistorySummarySchema,
+    DonationIngestResultSchema,
+    DonationIngestSchema,
     LoginResponseSchema,
     LoginSchema,
     TokenSchema,
     TopCampaignSchema,
     TopDonorSchema,
+    UploadCompleteSchema,
+    UploadPartSchema,
+    UploadStartSchema,
+    UploadStatusSchema,
     UserInfoSchema,
     UserUpdateSchema,
 )
-from typing import List
-from django.db.models import Sum
-from django.core.paginator import Paginator
+from typing import List, Literal, Optional
+from .auth import async_jwt_auth, generate_jwt_token, jwt_auth, service_auth
+from .cache import cache_response
+from .exports import donations_export_response
+from .images import enqueue_variants, image_variants
+from .ingest import DonationEvent, ingest_donations
+from .leaderboard import format_token_amount
+from .media import serve_media
+from .pagination import akeyset_paginate
+from .related import sample_related_campaigns
+from .search import match_campaigns
+from .serializers import CampaignSerializer, parse_fields
+from .summaries import campaign_donation_summary, user_donation_summary
+from . import uploads
 
 import os
 from django.core.files.storage import default_storage
@@ -38,34 +59,6 @@ from ninja import File
 from ninja.files import UploadedFile as NinjaUploadedFile
 
 api = NinjaAPI()
-SECRET_KEY = settings.SECRET_KEY
-
-
-# Utility Functions
-def generate_jwt_token(user):
-    payload = {
-        'user_id': user.id,
-        'username': user.username,
-        'wallet_address': user.wallet_address,
-        'exp': datetime.utcnow() + timedelta(days=1),  # Token valid for 1 day
-    }
-    token = jwt.encode(payload, SECRET_KEY, algorithm='HS256')
-    return token
-
-
-def jwt_authentication(request):
-    auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
-        raise HttpError(401, "Authorization header missing or invalid")
-
-    token = auth_header.split(' ')[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        user = HederaUser.objects.get(id=payload['user_id'])
-        request.user = user
-        return user
-    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, HederaUser.DoesNotExist):
-        raise HttpError(401, "Invalid or expired token")
 
 
 # Authentication Endpoints
@@ -90,9 +83,9 @@ def login(request, payload: LoginSchema):
 
 
 # User Management APIs
-@api.get("/user/info", tags=["User Info"], response=UserInfoSchema)
-def get_user_info(request):
-    user = jwt_authentication(request)
+@api.get("/user/info", tags=["User Info"], response=UserInfoSchema, auth=async_jwt_auth)
+async def get_user_info(request):
+    user = await request.auth.auser()
     user_data = {
         "name": user.name,
         "wallet_address": user.wallet_address,
@@ -100,103 +93,148 @@ def get_user_info(request):
         "twitter": user.twitter,
         "bio": user.bio,
         "user_image": user.image,
+        "user_image_variants": image_variants(user.image),
     }
     return UserInfoSchema(**user_data)
 
 
-@api.put("/user/update", tags=["User Info"], response={200: str, 400: str})
+@api.put("/user/update", tags=["User Info"], response={200: str, 400: str}, auth=jwt_auth)
 def update_user(request, payload: UserUpdateSchema):
-    user = jwt_authentication(request)
     try:
-        # Update fields if they are provided in the payload
-        if payload.name is not None:
-            user.name = payload.name
-        if payload.facebook is not None:
-            user.facebook = payload.facebook
-        if payload.twitter is not None:
-            user.twitter = payload.twitter
-        if payload.bio is not None:
-            user.bio = payload.bio
-        if payload.user_image is not None:
-            user.image = payload.user_image
-        user.save()
+        # request.auth.user may be a cached copy: edit the current row, and
+        # write back only the fields given, so concurrent changes to the
+        # others (e.g. evm_address from the indexer) survive
+        with transaction.atomic():
+            user = HederaUser.objects.select_for_update().get(pk=request.auth.id)
+            updated = []
+            # Update fields if they are provided in the payload
+            if payload.name is not None:
+                user.name = payload.name
+                updated.append("name")
+            if payload.facebook is not None:
+                user.facebook = payload.facebook
+                updated.append("facebook")
+            if payload.twitter is not None:
+                user.twitter = payload.twitter
+                updated.append("twitter")
+            if payload.bio is not None:
+                user.bio = payload.bio
+                updated.append("bio")
+            if payload.user_image is not None:
+                user.image = payload.user_image
+                updated.append("image")
+            user.save(update_fields=updated)
 
         return 200, "User information updated successfully."
     except Exception as e:
         return 400, f"Error updating user information: {str(e)}"
 
 
-@api.get("/user/donation-history", tags=["User Info"], response=List[DonationHistorySchema])
-def get_donation_history(request):
-    user = jwt_authentication(request)
-    donations = Donation.objects.filter(user=user).select_related("campaign")
-    return [
-        {
-            "campaign_id": donation.campaign.id,
-            "campaign_title": donation.campaign.title,
-            "campaign_image": donation.campaign.image,
-            "amount": float(donation.amount),
-            "date": donation.date.isoformat(),
-            "transaction_hash":donation.transaction_hash
-        }
-        for donation in donations
-    ]
+@api.get("/user/donation-history", tags=["User Info"], response=DonationHistoryPageSchema, auth=async_jwt_auth)
+async def get_donation_history(request, cursor: Optional[str] = None, limit: Optional[int] = None):
+    donations = Donation.objects.filter(user_id=request.auth.id).select_related("campaign").only(
+        "amount", "date", "transaction_hash", "campaign__id", "campaign__title", "campaign__image"
+    )
+    # newest first, seeking on (date, id) along donation_user_date_idx
+    donations, next_cursor = await akeyset_paginate(donations, ("date", "id"), cursor, limit)
+    return {
+        "items": [
+            {
+                "campaign_id": donation.campaign.id,
+                "campaign_title": donation.campaign.title,
+                "campaign_image": donation.campaign.image,
+                "campaign_image_variants": image_variants(donation.campaign.image),
+                "amount": float(donation.amount),
+                "date": donation.date.isoformat(),
+                "transaction_hash":donation.transaction_hash
+            }
+            for donation in donations
+        ],
+        "next_cursor": next_cursor,
+    }
 
 
-# Campaign Management APIs
-@api.get("/campaigns", tags=["Campaigns"], response=List[CampaignSchema])
-def list_campaigns(request):
-    # jwt_authentication(request)
+@api.get("/user/donation-history/summary", tags=["User Info"], response=DonationHistorySummarySchema,
+         auth=async_jwt_auth)
+async def get_donation_history_summary(request):
+    return await user_donation_summary(request.auth.id)
 
-    # Fetch campaigns with related data for efficient querying
-    campaigns = Campaign.objects.select_related(
-        "organizer", "campaign_type", "token"
-    ).filter(approved_by_admin=True).order_by("-created_at")
 
-    # Serialize campaigns into the expected schema format
-    serialized_campaigns = [
-        {
-            "id": campaign.id,
-            "title": campaign.title,
-            "description": campaign.description,
-            "image": campaign.image,
-            "goal": float(campaign.goal),
-            "current_amount": float(campaign.current_amount),
-            "progress": float(campaign.percentage_completed),
-            "organizer": {
-                "id": campaign.organizer.id,
-                "username": campaign.organizer.username,
-                "email": campaign.organizer.email,
-            },
-            "campaign_type": {
-                "id": campaign.campaign_type.id,
-                "name": campaign.campaign_type.name,
-            } if campaign.campaign_type else None,
-            "token": {
-                "id": campaign.token.id,
-                "name": campaign.token.name,
-                "symbol": campaign.token.symbol,
-                "address": campaign.token.address,
-                "account_id": campaign.token.account_id,
-
-            } if campaign.token else None,
-            "video_link": campaign.video_link,
-            "project_url": campaign.project_url,
-            "created_at": campaign.created_at.isoformat(),
-            "updated_at": campaign.updated_at.isoformat(),
-            "approved_by_admin": campaign.approved_by_admin,
-            "onchain_id":campaign.onchain_id,
-            "status": campaign.status,
-        }
-        for campaign in campaigns
-    ]
+@api.get("/campaigns/{campaign_id}/donations/export", tags=["Donations"], auth=async_jwt_auth)
+async def export_campaign_donations(request, campaign_id: int, format: Literal["csv", "ndjson"] = "csv"):
+    try:
+        campaign = await Campaign.objects.only("id", "organizer_id").aget(id=campaign_id)
+    except Campaign.DoesNotExist:
+        raise Http404("No Campaign matches the given query.")
+    if campaign.organizer_id != request.auth.id:
+        raise HttpError(403, "Only the campaign organizer can export its donations")
+
+    donations = Donation.objects.filter(campaign_id=campaign.id).order_by("date", "id")
+    return donations_export_response(donations, format, f"campaign-{campaign.id}-donations")
 
-    return serialized_campaigns
 
+@api.get("/donations/export", tags=["Donations"], auth=service_auth)
+async def export_donations(request, format: Literal["csv", "ndjson"] = "csv"):
+    # primary key order streams straight off its index; a date sort over the
+    # whole table would have to finish before the first row
+    return donations_export_response(Donation.objects.order_by("id"), format, "donations")
 
-@api.post("/campaigns", tags=["Campaigns"], response=CampaignSchema)
+
+# Campaign Management APIs
+@api.get("/campaigns", tags=["Campaigns"], response=CampaignPageSchema)
+@cache_response(ttl=30, groups=("campaigns",))
+async def list_campaigns(
+    request,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[str] = None,
+):
+    serializer = CampaignSerializer(parse_fields(fields), excerpt=True)
+
+    # Fetch one page of campaigns, newest first, seeking past the cursor
+    rows, next_cursor = await akeyset_paginate(
+        serializer.values(Campaign.objects.filter(approved_by_admin=True), "created_at", "id"),
+        keys=("created_at", "id"),
+        cursor=cursor,
+        limit=limit,
+    )
+
+    # Rows are already plain JSON types, so skip per-row schema validation
+    return api.create_response(request, {
+        "items": [serializer.serialize(row) for row in rows],
+        "next_cursor": next_cursor,
+    }, status=200)
+
+
+# Registered before /campaigns/{campaign_id}, which would take "search" as an id
+@api.get("/campaigns/search", tags=["Campaigns"], response=CampaignPageSchema)
+@cache_response(ttl=30, groups=("campaigns",))
+async def search_campaigns(
+    request,
+    q: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[str] = None,
+):
+    serializer = CampaignSerializer(parse_fields(fields), excerpt=True)
+
+    # Best matches first; the cursor carries the last rank seen
+    rows, next_cursor = await akeyset_paginate(
+        serializer.values(await match_campaigns(q), "rank", "id"),
+        keys=("rank", "id"),
+        cursor=cursor,
+        limit=limit,
+    )
+
+    return api.create_response(request, {
+        "items": [serializer.serialize(row) for row in rows],
+        "next_cursor": next_cursor,
+    }, status=200)
+
+
+@api.post("/campaigns", tags=["Campaigns"], response=CampaignSchema, auth=jwt_auth)
 def create_campaign(request, payload: CampaignCreateSchema):
-    user = jwt_authentication(request)
+    user = request.auth.user
     campaign_type = get_object_or_404(
         CampaignType, id=payload.campaign_type_id) if payload.campaign_type_id else None
     token = get_object_or_404(
@@ -212,224 +250,163 @@ def create_campaign(request, payload: CampaignCreateSchema):
         project_url=payload.project_url,
         organizer=user,
     )
-    # Serialize the response to ensure `datetime` fields are strings
-    return {
-        "id": campaign.id,
-        "title": campaign.title,
-        "description": campaign.description,
-        "image": campaign.image,
-        "goal": campaign.goal,
-        "current_amount": campaign.current_amount,
-        "progress": campaign.percentage_completed,
-        "organizer": {
-            "id": campaign.organizer.id,
-            "username": campaign.organizer.username,
-            "email": campaign.organizer.email,
-        },
-        "campaign_type": {
-            "id": campaign.campaign_type.id,
-            "name": campaign.campaign_type.name,
-        } if campaign.campaign_type else None,
-        "token": {
-            "id": campaign.token.id,
-            "name": campaign.token.name,
-            "symbol": campaign.token.symbol,
-            "address": campaign.token.address,
-            "account_id": campaign.token.account_id,
-        } if campaign.token else None,
-        "video_link": campaign.video_link,
-        "project_url": campaign.project_url,
-        "created_at": campaign.created_at.isoformat(),
-        "updated_at": campaign.updated_at.isoformat(),
-        "approved_by_admin": campaign.approved_by_admin,
-        "onchain_id":campaign.onchain_id,
-        "status": campaign.status,
-    }
+    return CampaignSerializer().serialize_instance(campaign)
 
 
 @api.get("/campaigns/{campaign_id}", tags=["Campaigns"], response=CampaignDetailResponseSchema)
-def get_campaign_details(request, campaign_id: str):
+@cache_response(ttl=30, groups=("campaigns",))
+async def get_campaign_details(request, campaign_id: str):
     # Fetch campaign or raise 404 if not found
-    campaign = get_object_or_404(Campaign, id=campaign_id)
+    serializer = CampaignSerializer()
+    row = await serializer.values(Campaign.objects.filter(id=campaign_id)).afirst()
+    if row is None:
+        raise Http404("No Campaign matches the given query.")
+    campaign = serializer.serialize(row)
 
     # Fetch related campaigns
-    related_campaigns = Campaign.objects.filter(
-        campaign_type=campaign.campaign_type,approved_by_admin=True,status=Campaign.STATUS_PUBLISHED
-    ).exclude(id=campaign_id).order_by("?")[:3]
+    related_campaigns = await sample_related_campaigns(campaign["id"], row["campaign_type__id"])
 
     # Prepare response
     return {
-        "campaign": {
-            "id": campaign.id,
-            "title": campaign.title,
-            "description": campaign.description,
-            "image": campaign.image,
-            "goal": campaign.goal,
-            "current_amount": campaign.current_amount,
-            "progress": campaign.percentage_completed,
-            "organizer": {
-                "id": campaign.organizer.id,
-                "username": campaign.organizer.username,
-                "email": campaign.organizer.email,
-            },
-            "campaign_type": {
-                "id": campaign.campaign_type.id,
-                "name": campaign.campaign_type.name,
-            } if campaign.campaign_type else None,
-            "token": {
-                "id": campaign.token.id,
-                "name": campaign.token.name,
-                "symbol": campaign.token.symbol,
-                "address": campaign.token.address,
-                "account_id": campaign.token.account_id,
-            } if campaign.token else None,
-            "video_link": campaign.video_link,
-            "project_url": campaign.project_url,
-            "created_at": campaign.created_at.isoformat(),
-            "updated_at": campaign.updated_at.isoformat(),
-            "approved_by_admin": campaign.approved_by_admin,
-            "onchain_id":campaign.onchain_id,
-            "status": campaign.status,
-            "transaction_hash_create": campaign.transaction_hash_create,
-            "transaction_hash_withdrawn": campaign.transaction_hash_withdrawn,
-        },
+        "campaign": campaign,
         "related_campaigns": [
             {
                 "id": related.id,
                 "title": related.title,
                 "description": related.description[:100],
                 "image": related.image or "https://placehold.co/600x400",
+                "image_variants": image_variants(related.image),
                 "progress": int(related.percentage_completed),
             }
             for related in related_campaigns
         ],
     }
 
-@api.get("/campaigns/{campaign_id}/donations", tags=["Donations"], response=List[CampaignDonationHistorySchema])
-def get_donation_history_by_campaign(request, campaign_id: int):
-    campaign = get_object_or_404(Campaign, id=campaign_id)
+@api.get("/campaigns/{campaign_id}/donations", tags=["Donations"], response=CampaignDonationPageSchema)
+async def get_donation_history_by_campaign(
+    request, campaign_id: int, cursor: Optional[str] = None, limit: Optional[int] = None
+):
+    try:
+        campaign = await Campaign.objects.only("id", "title", "image").aget(id=campaign_id)
+    except Campaign.DoesNotExist:
+        raise Http404("No Campaign matches the given query.")
+
+    # current_amount is kept up to date by the donation totals trigger,
+    # so this endpoint only reads
+    donations = campaign.donations.select_related("user")
+    # newest first, seeking on (date, id) along donation_campaign_date_idx
+    donations, next_cursor = await akeyset_paginate(donations, ("date", "id"), cursor, limit)
+    return {
+        "items": [
+            {
+                "campaign_id": campaign.id,
+                "campaign_title": campaign.title,
+                "campaign_image": campaign.image,
+                "user_id": donation.user.id,
+                "user_name": donation.user.name,
+                "user_username": donation.user.username,
+                "user_image": donation.user.image,
+                "user_image_variants": image_variants(donation.user.image),
+                "amount": float(donation.amount),
+                "date": donation.date.isoformat(),
+                "transaction_hash": donation.transaction_hash or "N/A",
+            }
+            for donation in donations
+        ],
+        "next_cursor": next_cursor,
+    }
+
 
-    # TODO : Do it in worker, it make slow app
-    total = Donation.objects.filter(campaign = campaign).aggregate(total_amount=Sum('amount'))['total_amount'] or 0
-    campaign.current_amount = total
-    campaign.save()
+@api.get("/campaigns/{campaign_id}/donations/summary", tags=["Donations"], response=CampaignDonationSummarySchema)
+async def get_donation_summary_by_campaign(request, campaign_id: int):
+    try:
+        campaign = await Campaign.objects.only("id", "current_amount").aget(id=campaign_id)
+    except Campaign.DoesNotExist:
+        raise Http404("No Campaign matches the given query.")
+    return await campaign_donation_summary(campaign)
 
-    donations = Donation.objects.filter(campaign=campaign).select_related("user")
-    return [
-        {
-            "campaign_id": donation.campaign.id,
-            "campaign_title": donation.campaign.title,
-            "campaign_image": donation.campaign.image,
-            "user_id": donation.user.id,
-            "user_name": donation.user.name,
-            "user_username": donation.user.username,
-            "user_image": donation.user.image,
-            "amount": float(donation.amount),
-            "date": donation.date.isoformat(),
-            "transaction_hash": donation.transaction_hash or "N/A",
-        }
-        for donation in donations
-    ]
 
+@api.post("/donations/ingest", tags=["Donations"], response=DonationIngestResultSchema, auth=service_auth)
+def ingest_donation_events(request, payload: DonationIngestSchema):
+    events = [DonationEvent(**event.dict()) for event in payload.events]
+    return vars(ingest_donations(events))
 
-@api.get("/user/campaigns", tags=["Campaigns"], response=List[CampaignSchema])
-def get_campaigns_by_user(request):
-    user = jwt_authentication(request)
-    campaigns = Campaign.objects.filter(
-        organizer=user).select_related("campaign_type", "token").order_by("-updated_at")
 
-    return [
-        {
-            "id": campaign.id,
-            "title": campaign.title,
-            "description": campaign.description,
-            "image": campaign.image or "https://placehold.co/600x400",
-            "goal": float(campaign.goal),
-            "current_amount": float(campaign.current_amount),
-            "progress": float(campaign.percentage_completed),
-            "organizer": {
-                "id": campaign.organizer.id,
-                "username": campaign.organizer.username,
-                "email": campaign.organizer.email,
-            },
-            "campaign_type": {
-                "id": campaign.campaign_type.id,
-                "name": campaign.campaign_type.name,
-            } if campaign.campaign_type else None,
-            "token": {
-                "id": campaign.token.id,
-                "name": campaign.token.name,
-                "symbol": campaign.token.symbol,
-                "address": campaign.token.address,       
-                "account_id": campaign.token.account_id,
-
-            } if campaign.token else None,
-            "video_link": campaign.video_link,
-            "project_url": campaign.project_url,
-            "created_at": campaign.created_at.isoformat(),
-            "updated_at": campaign.updated_at.isoformat(),
-            "approved_by_admin": campaign.approved_by_admin,
-            "onchain_id":campaign.onchain_id,
-            "status": campaign.status,
-        }
-        for campaign in campaigns
-    ]
+@api.get("/user/campaigns", tags=["Campaigns"], response=List[CampaignSchema], auth=async_jwt_auth)
+async def get_campaigns_by_user(request, fields: Optional[str] = None):
+    serializer = CampaignSerializer(parse_fields(fields), excerpt=True)
+    rows = serializer.values(Campaign.objects.filter(organizer_id=request.auth.id).order_by("-updated_at"))
+
+    return api.create_response(request, [serializer.serialize(row) async for row in rows], status=200)
 
 
 # Supporting APIs
 @api.get("/campaign-types", tags=["Campaign Types"], response=List[CampaignTypeSchema])
-def list_campaign_types(request):
-    return CampaignType.objects.all()
+@cache_response(ttl=300, groups=("campaign_types",))
+async def list_campaign_types(request):
+    return [campaign_type async for campaign_type in CampaignType.objects.all()]
 
 
 @api.get("/tokens", tags=["Tokens"], response=List[TokenSchema])
-def list_tokens(request):
-    return Token.objects.all()
+@cache_response(ttl=300, groups=("tokens",))
+async def list_tokens(request):
+    return [token async for token in Token.objects.all()]
 
 
 # Leaderboard APIs
 @api.get("/top-campaigns", tags=["Leaderboards"], response=List[TopCampaignSchema])
-def get_top_campaigns(request):
-    campaigns = Campaign.objects.filter(goal__gt=0, approved_by_admin=True).order_by("-percentage_completed")[:6]
+@cache_response(ttl=60, groups=("campaigns",))
+async def get_top_campaigns(request):
+    campaigns = Campaign.objects.summaries().filter(
+        goal__gt=0, approved_by_admin=True).order_by("-percentage_completed")[:6]
     return [
         {
             "id": campaign.id,
             "title": campaign.title,
             "description": campaign.description,
             "image": campaign.image or "https://placehold.co/600x400",
+            "image_variants": image_variants(campaign.image),
             "progress": float(campaign.percentage_completed),
             "status": campaign.status,
             "date": campaign.created_at.isoformat(),
         }
-        for campaign in campaigns
+        async for campaign in campaigns
     ]
 
 
 @api.get("/top-donors", tags=["Leaderboards"], response=List[TopDonorSchema])
-def get_top_donors(request):
-    # Query top donors
-    top_donors = Donation.objects.values("user_id").annotate(
-        total_donations=Sum("amount")
-    ).order_by("-total_donations")[:12]
-
-    # Fetch user information in bulk to avoid multiple queries
-    user_ids = [donor["user_id"] for donor in top_donors]
-    users = HederaUser.objects.filter(id__in=user_ids).only("id", "name", "username")
-    user_map = {user.id: user for user in users}
+@cache_response(ttl=60, groups=("donors",))
+async def get_top_donors(request, token_id: Optional[int] = None):
+    # Read the precomputed leaderboard, one entry per (donor, token). Raw
+    # amounts of tokens with different decimals don't compare, so donors
+    # are ranked within one token: `token_id`, or else the first token.
+    if token_id is None:
+        token_id = Subquery(Token.objects.order_by("id").values("id")[:1])
+    entries = DonorLeaderboardEntry.objects.select_related("user", "token").only(
+        "total_amount",
+        "user__id", "user__name", "user__username",
+        "token__id", "token__symbol", "token__decimal",
+    ).filter(token_id=token_id).order_by("-total_amount")[:12]
 
     # Build response
     response = []
-    for donor in top_donors:
-        user = user_map.get(donor["user_id"])
-        name = user.name if user and user.name else "Unknown"
-        initials = "".join([n[0].upper() for n in name.split()]) if name != None else "Unknown"
+    async for entry in entries:
+        user = entry.user
+        token = entry.token
+        name = user.name or "Unknown"
+        initials = "".join([n[0].upper() for n in name.split()])
+        amount = format_token_amount(entry.total_amount, token.decimal)
 
         response.append({
-            "id": donor["user_id"],
+            "id": user.id,
             "name": name,
-            "username": user.username if user and user.username else "Unknown",
-            "totalDonations": f"{donor['total_donations']} Tokens",
+            "username": user.username or "Unknown",
+            "totalDonations": f"{amount} {token.symbol}",
             "initials": initials,
+            "token_id": token.id,
+            "token_symbol": token.symbol,
+            "token_decimal": token.decimal,
+            "total_amount": float(entry.total_amount),
         })
 
     return response
@@ -439,29 +416,63 @@ def get_top_donors(request):
 def upload_file(request, file: NinjaUploadedFile = File(...)):
     DOMAIN_ROOT = "/api/read-file"
     try:
-        # Generate a unique file name
+        # Named by content: uploading the same file again stores nothing new
         file_extension = os.path.splitext(file.name)[1]
-        unique_file_name = f"{uuid.uuid4().hex}{file_extension}"
-
-        file_name = default_storage.save(unique_file_name, file)
+        file_name = default_storage.save_content(file, file_extension)
         file_url = f"{DOMAIN_ROOT}/{file_name}"
+        enqueue_variants(file_name)
 
         return {"message": "File uploaded successfully", "file_name": file_name, "file_url": file_url}
     except Exception as e:
         raise HttpError(400, f"Error uploading file: {str(e)}")
 
+def _upload_status(upload):
+    return {
+        "upload_id": str(upload.id),
+        "status": upload.status,
+        "size": upload.size,
+        "part_size": upload.part_size,
+        "part_count": upload.part_count,
+        "received_parts": list(upload.parts.order_by("number").values_list("number", flat=True)),
+    }
+
+
+@api.post("/uploads", tags=["File Management"], response=UploadStatusSchema, auth=jwt_auth)
+def start_upload(request, payload: UploadStartSchema):
+    upload = uploads.start(request.auth.id, payload.file_name, payload.size, payload.sha256)
+    return _upload_status(upload)
+
+
+@api.get("/uploads/{upload_id}", tags=["File Management"], response=UploadStatusSchema, auth=jwt_auth)
+def get_upload_status(request, upload_id: uuid.UUID):
+    return _upload_status(uploads.get_upload(upload_id, request.auth.id))
+
+
+@api.put("/uploads/{upload_id}/parts/{number}", tags=["File Management"], response=UploadPartSchema, auth=jwt_auth)
+def upload_part(request, upload_id: uuid.UUID, number: int):
+    """
+    Stores one part; the request body is the part's raw bytes.
+    """
+    upload = uploads.get_upload(upload_id, request.auth.id)
+    return uploads.save_part(upload, number, request)
+
+
+@api.post("/uploads/{upload_id}/complete", tags=["File Management"], response=UploadCompleteSchema, auth=jwt_auth)
+def complete_upload(request, upload_id: uuid.UUID):
+    upload = uploads.complete(uploads.get_upload(upload_id, request.auth.id))
+    enqueue_variants(upload.file_name)
+    return {
+        "message": "File uploaded successfully",
+        "file_name": upload.file_name,
+        "file_url": uploads.file_url(upload.file_name),
+        "sha256": upload.sha256,
+    }
+
+
 @api.get("/read-file/{file_name}", tags=["File Management"])
 def read_file(request, file_name: str):
     """
-    Returns the actual file content by its name.
+    Returns the actual file content by its name, honouring Range and
+    conditional requests.
     """
-    file_path = os.path.join(settings.MEDIA_ROOT, file_name)
-    if not default_storage.exists(file_path):
-        raise HttpError(404, "File not found")
-
-    # Open the file and return as FileResponse
-    try:
-        file = default_storage.open(file_name, "rb")
-        return FileResponse(file, as_attachment=True, filename=file_name)
-    except Exception as e:
-        raise HttpError(500, f"Error reading file: {str(e)}")
\ No newline at end of file
+    return serve_media(request, file_name, as_attachment=True)
@@ -0,0 +1,175 @@
+import copy
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import jwt
+from django.conf import settings
+from ninja.errors import HttpError
+from ninja.security import APIKeyHeader, HttpBearer
+
+from .models import HederaUser
+
+
+def generate_jwt_token(user):
+    payload = {
+        'user_id': user.id,
+        'username': user.username,
+        'wallet_address': user.wallet_address,
+        'exp': datetime.utcnow() + timedelta(days=1),  # Token valid for 1 day
+    }
+    token = jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
+    return token
+
+
+class UserCache:
+    """
+    Small in-process LRU of HederaUser rows keyed by id, with a TTL so other
+    processes' writes become visible quickly. Local saves evict immediately
+    (see signals.py). Callers get a copy, never the cached instance.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                return entry[1]
+        return None
+
+    def _put(self, user_id, user):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, user_id):
+        user = self._cached(user_id)
+        if user is None:
+            user = HederaUser.objects.get(id=user_id)
+            self._put(user_id, user)
+        return copy.copy(user)
+
+    async def aget(self, user_id):
+        user = self._cached(user_id)
+        if user is None:
+            user = await HederaUser.objects.aget(id=user_id)
+            self._put(user_id, user)
+        return copy.copy(user)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+class AuthenticatedUser:
+    """
+    Identity taken from the verified token claims. Handlers that only need the
+    id or wallet never touch the database; `.user` loads the full row on
+    first access.
+    """
+
+    def __init__(self, claims):
+        self.id = claims['user_id']
+        self.username = claims.get('username')
+        self.wallet_address = claims.get('wallet_address')
+        self._user = None
+
+    @property
+    def user(self):
+        if self._user is None:
+            try:
+                self._user = user_cache.get(self.id)
+            except HederaUser.DoesNotExist:
+                raise HttpError(401, "Invalid or expired token")
+        return self._user
+
+    async def auser(self):
+        """
+        `.user` for async handlers.
+        """
+        if self._user is None:
+            try:
+                self._user = await user_cache.aget(self.id)
+            except HederaUser.DoesNotExist:
+                raise HttpError(401, "Invalid or expired token")
+        return self._user
+
+
+def _verify_token(token):
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
+    except jwt.InvalidTokenError:
+        raise HttpError(401, "Invalid or expired token")
+    if 'user_id' not in claims:
+        raise HttpError(401, "Invalid or expired token")
+    return AuthenticatedUser(claims)
+
+
+def request_user_id(request):
+    """
+    Id of the user behind `request`: from the operation's auth once it has
+    run, else from a valid bearer token. None for anonymous requests.
+    """
+    auth = getattr(request, "auth", None)
+    if isinstance(auth, AuthenticatedUser):
+        return auth.id
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return _verify_token(token).id
+    except HttpError:
+        return None
+
+
+class JWTAuth(HttpBearer):
+    def authenticate(self, request, token):
+        return _verify_token(token)
+
+
+class AsyncJWTAuth(HttpBearer):
+    """
+    JWTAuth for async operations: Ninja awaits it on the event loop, while a
+    sync operation would have to bridge it through async_to_sync.
+    """
+
+    async def authenticate(self, request, token):
+        return _verify_token(token)
+
+
+jwt_auth = JWTAuth()
+async_jwt_auth = AsyncJWTAuth()
+
+
+class ServiceKeyAuth(APIKeyHeader):
+    """
+    Shared-secret auth for internal services such as the on-chain indexer.
+    Disabled (every request rejected) while SERVICE_API_KEY is empty.
+    """
+    param_name = "X-API-Key"
+
+    def authenticate(self, request, key):
+        expected = settings.SERVICE_API_KEY
+        if expected and key and hmac.compare_digest(key, expected):
+            return "service"
+        return None
+
+
+service_auth = ServiceKeyAuth()
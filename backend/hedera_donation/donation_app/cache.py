@@ -0,0 +1,161 @@
+import hashlib
+import inspect
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from ninja.decorators import decorate_view
+
+KEY_PREFIX = "api"
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _group_key(group):
+    return f"{KEY_PREFIX}:group:{group}"
+
+
+def _group_versions(cache, groups):
+    """
+    Each invalidation group carries a version stamp that is folded into the
+    response keys, so bumping it orphans every cached response of the group
+    without having to enumerate keys (which shared backends cannot do).
+    """
+    keys = [_group_key(group) for group in groups]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [str(versions[key]) for key in keys]
+
+
+def invalidate(*groups):
+    """
+    Drops cached responses for the given groups once the current transaction
+    commits, so a concurrent reader cannot re-cache pre-commit data.
+    """
+    def bump():
+        get_cache().set_many({_group_key(group): time.time_ns() for group in groups}, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def _etag(body):
+    return f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [tag.strip() for tag in header.split(",")]
+
+
+def _finalize(request, response, etag):
+    if _etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    response["ETag"] = etag
+    # Let clients keep the body but always revalidate; invalidation is server-side.
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+def _bypass(request):
+    return (
+        not settings.API_CACHE_ENABLED
+        or request.method not in ("GET", "HEAD")
+        or "Authorization" in request.headers
+    )
+
+
+def _lookup(request, groups):
+    """
+    Returns (response key, group versions, cached entry or None) for
+    `request`.
+    """
+    cache = get_cache()
+    versions = _group_versions(cache, groups)
+    query = "&".join(sorted(request.GET.urlencode().split("&")))
+    raw_key = f"{'.'.join(versions)}:{request.path}?{query}"
+    key = f"{KEY_PREFIX}:response:{hashlib.md5(raw_key.encode()).hexdigest()}"
+    return key, versions, cache.get(key)
+
+
+def _replica_may_lag(request, versions):
+    """
+    True when the response was read from a replica within
+    DATABASE_REPLICA_MAX_LAG of an invalidation: the replica may not have
+    replayed the write yet, and caching would pin the old data for the TTL.
+    """
+    if getattr(request, "db_read_alias", DEFAULT_DB_ALIAS) == DEFAULT_DB_ALIAS:
+        return False
+    return time.time_ns() - max(map(int, versions)) < settings.DATABASE_REPLICA_MAX_LAG * 10 ** 9
+
+
+def _store(request, key, versions, response, ttl):
+    """
+    Caches a fresh response and returns its ETag, or None if it is not
+    cacheable.
+    """
+    if response.status_code != 200 or response.streaming or _replica_may_lag(request, versions):
+        return None
+    etag = _etag(response.content)
+    get_cache().set(key, (response.content, response["Content-Type"], etag), ttl)
+    return etag
+
+
+def _cached(request, cached):
+    body, content_type, etag = cached
+    return _finalize(request, HttpResponse(body, content_type=content_type), etag)
+
+
+def cache_response(ttl, groups):
+    """
+    Caches the rendered response of a public GET operation for `ttl` seconds,
+    answers If-None-Match with 304 and is invalidated by bumping `groups`.
+    Works for sync and async operations alike.
+
+        @api.get("/tokens", response=List[TokenSchema])
+        @cache_response(ttl=300, groups=("tokens",))
+        async def list_tokens(request):
+            ...
+    """
+
+    def view_decorator(view):
+        if inspect.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if _bypass(request):
+                    return await view(request, *args, **kwargs)
+                # one thread hop for the version stamps and the entry
+                key, versions, cached = await sync_to_async(_lookup)(request, groups)
+                if cached is not None:
+                    return _cached(request, cached)
+                response = await view(request, *args, **kwargs)
+                etag = await sync_to_async(_store)(request, key, versions, response, ttl)
+                return response if etag is None else _finalize(request, response, etag)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if _bypass(request):
+                return view(request, *args, **kwargs)
+            key, versions, cached = _lookup(request, groups)
+            if cached is not None:
+                return _cached(request, cached)
+            response = view(request, *args, **kwargs)
+            etag = _store(request, key, versions, response, ttl)
+            return response if etag is None else _finalize(request, response, etag)
+
+        return wrapper
+
+    return decorate_view(view_decorator)
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import EvmAddressMapping, HederaUser
+
+# shard 0, realm 0: the remaining 8 bytes are the account number
+LONG_ZERO_PREFIX = "0x" + "0" * 24
+
+
+def normalize_evm_address(address):
+    address = address.lower()
+    return address if address.startswith("0x") else f"0x{address}"
+
+
+def long_zero_to_account_id(evm_address):
+    """
+    "0x00000000000000000000000000000000000004d2" -> "0.0.1234", without any
+    I/O. Returns None for alias (ECDSA-derived) addresses.
+    """
+    address = normalize_evm_address(evm_address)
+    if len(address) != 42 or not address.startswith(LONG_ZERO_PREFIX):
+        return None
+    return f"0.0.{int(address[len(LONG_ZERO_PREFIX):], 16)}"
+
+
+def account_id_to_long_zero(account_id):
+    shard, realm, num = (int(part) for part in account_id.split("."))
+    return f"0x{shard:08x}{realm:016x}{num:016x}"
+
+
+def cached_account_ids(addresses):
+    """
+    Account ids known locally for `addresses`: users whose evm_address is
+    set, then EvmAddressMapping rows. Negative entries count only while
+    fresh; stale ones are left out so the caller looks them up again.
+    """
+    found = dict(
+        HederaUser.objects.filter(evm_address__in=addresses).values_list("evm_address", "wallet_address")
+    )
+    rest = set(addresses) - found.keys()
+    if rest:
+        fresh_after = timezone.now() - timedelta(seconds=settings.EVM_ADDRESS_NEGATIVE_TTL)
+        mappings = EvmAddressMapping.objects.filter(evm_address__in=rest).values_list(
+            "evm_address", "account_id", "updated_at"
+        )
+        for address, account_id, updated_at in mappings:
+            if account_id or updated_at >= fresh_after:
+                found[address] = account_id
+    return found
+
+
+def store_account_ids(resolved):
+    """
+    Persists mirror-node answers ({address: account id or None}) and fills
+    HederaUser.evm_address for matching users, so the reverse lookup needs
+    no I/O either.
+    """
+    EvmAddressMapping.objects.bulk_create(
+        [EvmAddressMapping(evm_address=address, account_id=account_id) for address, account_id in resolved.items()],
+        update_conflicts=True,
+        unique_fields=["evm_address"],
+        update_fields=["account_id", "updated_at"],
+    )
+    addresses = {account_id: address for address, account_id in resolved.items() if account_id}
+    users = list(HederaUser.objects.filter(wallet_address__in=addresses, evm_address__isnull=True))
+    for user in users:
+        user.evm_address = addresses[user.wallet_address]
+    HederaUser.objects.bulk_update(users, ["evm_address"])
+
+
+class AccountResolver:
+    """
+    Bulk EVM address -> Hedera account id resolution. Long-zero addresses
+    are decoded locally; the rest come from an in-process memo, then one
+    database round trip, and only then the mirror node (concurrently, at
+    most once per address even across overlapping calls), whose answers
+    are stored for every other process.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._memo = {}
+        self._inflight = {}
+
+    async def resolve(self, addresses):
+        resolved, missing = {}, set()
+        for address in map(normalize_evm_address, addresses):
+            account_id = long_zero_to_account_id(address) or self._memo.get(address)
+            if account_id:
+                resolved[address] = account_id
+            else:
+                missing.add(address)
+        if missing:
+            cached = await sync_to_async(cached_account_ids)(missing)
+            resolved.update(cached)
+            missing = [address for address in missing if address not in cached]
+        if missing:
+            started = [address for address in missing if address not in self._inflight]
+            for address in started:
+                self._inflight[address] = asyncio.ensure_future(self.client.account_id(address))
+            try:
+                answers = await asyncio.gather(*(self._inflight[address] for address in missing))
+                resolved.update(zip(missing, answers))
+                if started:
+                    await sync_to_async(store_account_ids)({address: resolved[address] for address in started})
+            finally:
+                for address in started:
+                    self._inflight.pop(address, None)
+        self._memo.update((address, account_id) for address, account_id in resolved.items() if account_id)
+        return resolved
@@ -0,0 +1,335 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..cache import invalidate
+from ..ingest import DonationEvent, ingest_donations
+from ..models import Campaign, CrawlWindow, LastIndexCrawl
+from .accounts import AccountResolver
+from .decode import concat_batches, decode_batch
+from .mirror import NANOS, MirrorNodeError, format_timestamp, parse_timestamp
+
+CRAWL_KEY = "crawl_onchain"
+
+
+@dataclass
+class IndexerStats:
+    windows: int = 0
+    logs: int = 0
+    donations_inserted: int = 0
+    donations_updated: int = 0
+    campaigns_updated: int = 0
+
+
+def split_windows(start, end, size):
+    """
+    (start, end] in nanoseconds -> consecutive (lo, hi] windows of at most
+    `size` nanoseconds.
+    """
+    windows = []
+    while start < end:
+        hi = min(start + size, end)
+        windows.append((start, hi))
+        start = hi
+    return windows
+
+
+def _crawl_row(key, for_update=False):
+    queryset = LastIndexCrawl.objects.filter(key=key).order_by("id")
+    if for_update:
+        queryset = queryset.select_for_update()
+    crawl = queryset.first()
+    if crawl is None:
+        raise LastIndexCrawl.DoesNotExist(f"No LastIndexCrawl row with key {key!r}")
+    return crawl
+
+
+def high_water_mark(crawl):
+    value = crawl.value or crawl.start_at
+    return parse_timestamp(value) if value else None
+
+
+def crawl_position(key):
+    return high_water_mark(_crawl_row(key))
+
+
+def ensure_tip_window(key, genesis=None):
+    """
+    Creates the window that follows the live tip if the crawl has none yet,
+    starting after the last backfill window, at the high-water mark, or just
+    before `genesis` for a crawl with no starting point. Returns the crawl
+    id, or None when there is nowhere to start from.
+    """
+    with transaction.atomic():
+        crawl = _crawl_row(key, for_update=True)
+        if crawl.windows.filter(end_ns__isnull=True).exists():
+            return crawl.id
+        start = crawl.windows.order_by("-end_ns").values_list("end_ns", flat=True).first()
+        if start is None:
+            start = high_water_mark(crawl)
+        if start is None:
+            if genesis is None:
+                return None
+            start = genesis - 1
+            crawl.value = format_timestamp(start)
+            crawl.save(update_fields=["value", "updated_at"])
+        CrawlWindow.objects.create(crawl=crawl, start_ns=start, position_ns=start)
+        return crawl.id
+
+
+def claim_window(crawl_id, tip):
+    """
+    Locks the earliest unfinished window no other worker holds or leases,
+    until the current transaction ends. `tip` picks the live-tip window
+    instead of a backfill one.
+    """
+    queryset = CrawlWindow.objects.select_for_update(skip_locked=True).filter(
+        Q(claimed_until__isnull=True) | Q(claimed_until__lte=timezone.now()), crawl_id=crawl_id,
+    )
+    if tip:
+        queryset = queryset.filter(end_ns__isnull=True)
+    else:
+        queryset = queryset.filter(end_ns__isnull=False, position_ns__lt=F("end_ns"))
+    return queryset.order_by("start_ns").first()
+
+
+def lease_window(window, seconds):
+    """
+    Keeps other workers off a claimed window for `seconds` after the claiming
+    transaction commits.
+    """
+    window.claimed_until = timezone.now() + timedelta(seconds=seconds)
+    window.save(update_fields=["claimed_until", "updated_at"])
+
+
+def reclaim_window(window):
+    """
+    Locks a leased window again, or returns None if its lease ran out and
+    another worker took it over.
+    """
+    return (
+        CrawlWindow.objects.select_for_update()
+        .filter(pk=window.pk, position_ns=window.position_ns, claimed_until=window.claimed_until)
+        .first()
+    )
+
+
+def release_window(window):
+    """
+    Gives up a lease early, unless another worker took the window over.
+    """
+    CrawlWindow.objects.filter(
+        pk=window.pk, position_ns=window.position_ns, claimed_until=window.claimed_until,
+    ).update(claimed_until=None)
+
+
+def plan_backfill(tip, cut, size):
+    """
+    Hands (tip position, cut] to backfill windows of `size` nanoseconds and
+    restarts the tip window at `cut`. The caller holds the tip's lock.
+    """
+    windows = split_windows(tip.position_ns, cut, size)
+    if tip.start_ns == tip.position_ns:
+        # nothing indexed in it yet: the tip row becomes the first window
+        tip.end_ns = windows.pop(0)[1]
+    else:
+        tip.end_ns = tip.position_ns
+    tip.save(update_fields=["end_ns", "updated_at"])
+    CrawlWindow.objects.bulk_create([
+        CrawlWindow(crawl_id=tip.crawl_id, start_ns=lo, end_ns=hi, position_ns=lo) for lo, hi in windows
+    ])
+    CrawlWindow.objects.create(crawl_id=tip.crawl_id, start_ns=cut, position_ns=cut)
+    return len(windows) + 1
+
+
+def fold_windows(crawl_id):
+    """
+    Advances LastIndexCrawl.value over the contiguous run of indexed windows
+    that starts at it, deleting finished ones. Windows held by other workers
+    are skipped rather than waited for: their own commit folds them later.
+    """
+    crawl = LastIndexCrawl.objects.select_for_update().get(id=crawl_id)
+    start = mark = high_water_mark(crawl)
+    while True:
+        window = (
+            CrawlWindow.objects.select_for_update(skip_locked=True)
+            .filter(crawl_id=crawl_id, start_ns=mark)
+            .first()
+        )
+        if window is None:
+            break
+        mark = window.position_ns
+        if window.end_ns is not None and window.position_ns == window.end_ns:
+            window.delete()
+            continue
+        if window.start_ns != window.position_ns:
+            window.start_ns = window.position_ns
+            window.save(update_fields=["start_ns", "updated_at"])
+        break
+    if mark != start:
+        crawl.value = format_timestamp(mark)
+        crawl.save(update_fields=["value", "updated_at"])
+
+
+def apply_campaign_logs(published, closed):
+    """
+    Applies decoded CampaignPublished / CampaignClosed columns. Publishes go
+    first: on chain a campaign can only be closed after it was published.
+    """
+    updated = 0
+    now = timezone.now()
+    for offchain_id, onchain_id, transaction_hash in zip(
+        published["offchain_id"], published["campaign_onchain_id"], published["transaction_hash"]
+    ):
+        updated += Campaign.objects.filter(id=offchain_id).update(
+            onchain_id=onchain_id,
+            status=Campaign.STATUS_PUBLISHED,
+            transaction_hash_create=transaction_hash,
+            updated_at=now,
+        )
+    for onchain_id, transaction_hash in zip(closed["campaign_onchain_id"], closed["transaction_hash"]):
+        updated += Campaign.objects.filter(onchain_id=onchain_id).update(
+            status=Campaign.STATUS_CLOSED,
+            transaction_hash_withdrawn=transaction_hash,
+            updated_at=now,
+        )
+    if updated:
+        invalidate("campaigns")
+    return updated
+
+
+def commit_chunk(window, end, batch, accounts, stats):
+    """
+    Writes a decoded batch for (window.position_ns, end] and advances the
+    window, ending its lease, inside the caller's transaction, which holds the
+    window's lock: a chunk is applied exactly once, and a crash before commit
+    leaves both untouched.
+    """
+    # Campaign logs first: a donation can follow its campaign's
+    # CampaignPublished within the same chunk
+    stats.campaigns_updated += apply_campaign_logs(batch["CampaignPublished"], batch["CampaignClosed"])
+    donations = batch["DonationReceived"]
+    result = ingest_donations([
+        DonationEvent(campaign_onchain_id, accounts.get(donor_address), amount, transaction_hash, timestamp)
+        for campaign_onchain_id, donor_address, amount, transaction_hash, timestamp in zip(
+            donations["campaign_onchain_id"], donations["donor_address"], donations["amount"],
+            donations["transaction_hash"], donations["timestamp"],
+        )
+    ])
+    stats.donations_inserted += result.inserted
+    stats.donations_updated += result.updated
+
+    window.position_ns = end
+    window.claimed_until = None
+    window.save(update_fields=["position_ns", "claimed_until", "updated_at"])
+    fold_windows(window.crawl_id)
+
+
+class Indexer:
+    """
+    Indexes one LastIndexCrawl key from the mirror node.
+
+    Progress lives in CrawlWindow rows. Each step claims a window with
+    SKIP LOCKED (backfill windows first, then the live tip) and leases it for
+    `lease_seconds`. With no transaction open it then fetches the window's
+    next chunk as `lookahead` sub-windows concurrently (each following its own
+    `links.next` chain), decodes it and resolves its donors in bulk, so a slow
+    mirror node holds no lock or connection. Then it locks the window again
+    and commits the chunk, or drops it if the lease ran out and another worker
+    took the window over. When the tip falls more than two backfill windows behind, the gap is
+    split into backfill windows so every running worker shares the catch-up.
+    """
+
+    def __init__(self, client, key=CRAWL_KEY, window_seconds=300, lookahead=8, backfill_seconds=3600,
+                 lag_seconds=5, lease_seconds=300, log=None):
+        self.client = client
+        self.key = key
+        self.window = window_seconds * NANOS
+        self.lookahead = lookahead
+        self.backfill = backfill_seconds * NANOS
+        self.lag = lag_seconds * NANOS
+        self.lease = lease_seconds
+        self.log = log or (lambda message: None)
+        self.accounts = AccountResolver(client)
+
+    async def _fetch(self, start, end):
+        logs = await self.client.logs(start, end)
+        return len(logs), decode_batch(logs)
+
+    async def _fetch_chunk(self, start, end):
+        parts = await asyncio.gather(*(self._fetch(lo, hi) for lo, hi in split_windows(start, end, self.window)))
+        batch = concat_batches(part for _, part in parts)
+        accounts = await self.accounts.resolve(set(batch["DonationReceived"]["donor_address"]))
+        return sum(count for count, _ in parts), batch, accounts
+
+    def _crawl_id(self):
+        crawl_id = ensure_tip_window(self.key)
+        if crawl_id is None:
+            genesis = async_to_sync(self.client.first_log_timestamp)()
+            if genesis is not None:
+                crawl_id = ensure_tip_window(self.key, genesis)
+        return crawl_id
+
+    def step(self, crawl_id, tip, stats):
+        """
+        Processes one chunk of one window, following the live window up to
+        `tip`. Returns False when there was nothing to do: no free backfill
+        window, and the live window is caught up or held by another worker.
+        """
+        with transaction.atomic():
+            window = claim_window(crawl_id, tip=False) or claim_window(crawl_id, tip=True)
+            if window is None:
+                return False
+            start = window.position_ns
+            if window.end_ns is None:
+                if tip - start > 2 * self.backfill:
+                    created = plan_backfill(window, tip, self.backfill)
+                    self.log(f"Split {format_timestamp(start)} -> {format_timestamp(tip)} into {created} windows")
+                    return True
+                end = min(start + self.window * self.lookahead, tip)
+                if end <= start:
+                    return False
+            else:
+                end = min(start + self.window * self.lookahead, window.end_ns)
+            lease_window(window, self.lease)
+
+        try:
+            count, batch, accounts = async_to_sync(self._fetch_chunk)(start, end)
+        except BaseException:
+            release_window(window)
+            raise
+        with transaction.atomic():
+            if reclaim_window(window) is None:
+                self.log(f"{format_timestamp(start)} -> {format_timestamp(end)}: lease lost, chunk dropped")
+                return True
+            commit_chunk(window, end, batch, accounts, stats)
+        stats.windows += 1
+        stats.logs += count
+        if count:
+            self.log(f"{format_timestamp(start)} -> {format_timestamp(end)}: {count} logs")
+        return True
+
+    def run(self, follow=False, poll_interval=3):
+        stats = IndexerStats()
+        crawl_id = None
+        while True:
+            try:
+                crawl_id = crawl_id or self._crawl_id()
+                # the tip is fixed per pass so a caught-up worker sleeps
+                # instead of chasing the clock in tiny chunks
+                tip = time.time_ns() - self.lag
+                while crawl_id is not None and self.step(crawl_id, tip, stats):
+                    pass
+            except MirrorNodeError as exc:
+                if not follow:
+                    raise
+                self.log(f"Retrying after mirror node error: {exc}")
+            if not follow:
+                return stats
+            time.sleep(poll_interval)
@@ -0,0 +1,94 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+NANOS = 10 ** 9
+
+
+def parse_timestamp(value):
+    """
+    "1700000000.123456789" (or "1700000000") -> integer nanoseconds.
+    """
+    seconds, _, fraction = str(value).partition(".")
+    return int(seconds) * NANOS + int(fraction.ljust(9, "0")[:9] or 0)
+
+
+def format_timestamp(nanos):
+    return f"{nanos // NANOS}.{nanos % NANOS:09d}"
+
+
+class MirrorNodeError(Exception):
+    pass
+
+
+class MirrorNodeClient:
+    """
+    Minimal async client for the Hedera mirror node REST API. Requests run on
+    a pool of `concurrency` threads, so at most that many are in flight at
+    once whichever event loop awaits them; 429s,
+    5xx responses and connection errors are retried with backoff.
+    """
+
+    def __init__(self, base_url, contract_id, concurrency=8, page_size=100, timeout=10, retries=4):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.contract_id = contract_id
+        self.page_size = page_size
+        self.timeout = timeout
+        self.retries = retries
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=concurrency))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=concurrency))
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="mirror-node")
+
+    def close(self):
+        self._executor.shutdown()
+        self.session.close()
+
+    async def get_json(self, path):
+        url = urljoin(self.base_url, path.lstrip("/"))
+        for attempt in range(self.retries + 1):
+            try:
+                response = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, partial(self.session.get, url, timeout=self.timeout)
+                )
+                if response.status_code == 404:
+                    return None
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    return response.json()
+                error = MirrorNodeError(f"{response.status_code} from {url}")
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error = MirrorNodeError(f"{exc.__class__.__name__} from {url}")
+            if attempt == self.retries:
+                raise error
+            await asyncio.sleep(0.25 * 2 ** attempt)
+
+    def _logs_path(self, *filters, limit=None):
+        query = "&".join([*filters, "order=asc", f"limit={limit or self.page_size}"])
+        return f"api/v1/contracts/{self.contract_id}/results/logs?{query}"
+
+    async def logs(self, start, end):
+        """
+        All contract logs with start < timestamp <= end (nanoseconds), in
+        consensus order, following `links.next` until the window is drained.
+        """
+        path = self._logs_path(f"timestamp=gt:{format_timestamp(start)}", f"timestamp=lte:{format_timestamp(end)}")
+        logs = []
+        while path:
+            page = await self.get_json(path) or {}
+            logs.extend(page.get("logs", []))
+            path = (page.get("links") or {}).get("next")
+        return logs
+
+    async def first_log_timestamp(self):
+        page = await self.get_json(self._logs_path(limit=1)) or {}
+        logs = page.get("logs") or []
+        return parse_timestamp(logs[0]["timestamp"]) if logs else None
+
+    async def account_id(self, evm_address):
+        account = await self.get_json(f"api/v1/accounts/{evm_address.lower()}")
+        return account.get("account") if account else None
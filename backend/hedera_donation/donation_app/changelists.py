@@ -0,0 +1,120 @@
+"""
+Admin changelists over tables with millions of rows.
+
+ScalableModelAdmin pages with EstimatedCountPaginator and leaves out the
+"N total" count of the unfiltered table, so a changelist page runs no
+COUNT(*) over a whole table:
+
+- unfiltered, the count is the planner's row estimate (pg_class.reltuples,
+  kept by ANALYZE and autovacuum), exact only for small tables;
+- filtered or searched, rows are counted up to ADMIN_EXACT_COUNT_LIMIT,
+  and past that the count is the planner's estimate for the query.
+
+Counts shown past ADMIN_EXACT_COUNT_LIMIT are therefore approximate, and
+the last page may be short or empty.
+
+AutocompleteFilter filters on a foreign key through the admin's select2
+autocomplete instead of listing every related row in the sidebar; the
+related model's admin needs search_fields, as for autocomplete_fields.
+"""
+from django import forms
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+RELTUPLES_SQL = "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)"
+# submits an AutocompleteFilter when its selection changes; uses django.jQuery
+FILTER_JS = "donation_app/admin/autocomplete_filter.js"
+
+
+def table_estimate(queryset):
+    """
+    The planner's row count for the table behind `queryset`; negative when
+    the table was never analyzed.
+    """
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        cursor.execute(RELTUPLES_SQL, [connection.ops.quote_name(queryset.model._meta.db_table)])
+        row = cursor.fetchone()
+    return row[0] if row else -1
+
+
+def query_estimate(queryset):
+    """
+    The planner's row count for `queryset`.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        if not queryset.query.where:
+            estimate = table_estimate(queryset)
+            if estimate >= limit:
+                return estimate
+            return queryset.count()
+        # COUNT(*) over a LIMIT: stops at `limit` rows however many match
+        count = queryset.order_by()[:limit].count()
+        if count < limit:
+            return count
+        return max(count, query_estimate(queryset.order_by()))
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    template = "admin/donation_app/autocomplete_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        # the parameter RelatedFieldListFilter uses, so links carry over
+        self.lookup_kwarg = f"{field_path}__{field.target_field.name}__exact"
+        self.lookup_val = params.get(self.lookup_kwarg)
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.widget = AutocompleteSelect(field, model_admin.admin_site)
+
+    def has_output(self):
+        return True
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def rendered_widget(self):
+        # rendered with the page, after queryset() turned away invalid values
+        form_field = forms.ModelChoiceField(
+            queryset=self.field.remote_field.model._default_manager.all(),
+            to_field_name=self.field.target_field.name,
+            widget=self.widget,
+            required=False,
+        )
+        return form_field.widget.render(self.lookup_kwarg, self.lookup_val, attrs={"style": "width: 100%"})
+
+    def choices(self, changelist):
+        yield {
+            "selected": self.lookup_val is None,
+            "query_string": changelist.get_query_string(remove=[self.lookup_kwarg]),
+            "display": _("All"),
+        }
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @property
+    def media(self):
+        # changelist pages only load the admin's media, not their filters'
+        media = super().media
+        for list_filter in self.list_filter:
+            if isinstance(list_filter, (list, tuple)) and issubclass(list_filter[1], AutocompleteFilter):
+                field = self.model._meta.get_field(list_filter[0])
+                media += AutocompleteSelect(field, self.admin_site).media + forms.Media(js=["admin/js/jquery.init.js", FILTER_JS])
+        return media
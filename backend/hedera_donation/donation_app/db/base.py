@@ -0,0 +1,190 @@
+"""
+PostgreSQL backend with a bounded per-process connection pool and
+automatic server-side prepared statements:
+
+    DATABASES = {"default": {
+        "ENGINE": "donation_app.db",
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "pool": {"max_size": 32, "timeout": 30, "max_idle": 300, "max_lifetime": 3600},
+            "prepare_threshold": 5,
+        },
+    }}
+
+The OPTIONS mirror Django 5.1's psycopg 3 pool and prepare_threshold.
+Closing a connection returns it to the pool, so CONN_MAX_AGE stays 0 and
+every request (or ASGI request thread) hands its connection back when it
+finishes; CONN_HEALTH_CHECKS pings connections that sat idle.
+
+A SELECT run `prepare_threshold` times on one physical connection is
+PREPAREd there and EXECUTEd from then on, skipping parse and plan. Set it
+to None behind a transaction-mode pooler (PgBouncer), where consecutive
+transactions may land on different server sessions.
+"""
+import re
+from collections import OrderedDict
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.creation import DatabaseCreation as PostgresDatabaseCreation
+from django.utils.asyncio import async_unsafe
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection as Psycopg2Connection, cursor as Psycopg2Cursor
+
+from .pool import close_idle_connections, get_pool
+
+# %s placeholders and %% escapes in Django's SQL
+_PLACEHOLDER = re.compile(r"%([s%])")
+
+
+def number_placeholders(sql):
+    """
+    "... id = %s AND title LIKE '%%x'" -> ("... id = $1 AND title LIKE '%x'", 1)
+    """
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group(1) == "%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER.sub(replace, sql), count
+
+
+class PreparedStatements:
+    """
+    Per-connection bookkeeping: how often each SELECT ran and which ones are
+    prepared, both bounded LRUs. Statements PostgreSQL cannot prepare (e.g.
+    an untyped parameter) are remembered as None.
+    """
+
+    def __init__(self, threshold, max_size=200):
+        self.threshold = threshold
+        self.max_size = max_size
+        self._counts = OrderedDict()
+        self._names = OrderedDict()
+        self._sequence = 0
+
+    def lookup(self, sql):
+        """
+        Returns the statement name, None to run `sql` as is, or "" when it
+        should be prepared now.
+        """
+        if sql in self._names:
+            self._names.move_to_end(sql)
+            return self._names[sql]
+        count = self._counts.pop(sql, 0) + 1
+        if count >= self.threshold:
+            return ""
+        self._counts[sql] = count
+        if len(self._counts) > self.max_size:
+            self._counts.popitem(last=False)
+        return None
+
+    def add(self, sql, name):
+        """
+        Records a new statement; returns the name of one to DEALLOCATE.
+        """
+        self._names[sql] = name
+        if len(self._names) > self.max_size:
+            for old_sql, old_name in self._names.items():
+                if old_name is not None:
+                    del self._names[old_sql]
+                    return old_name
+        return None
+
+    def next_name(self):
+        self._sequence += 1
+        return f"dj_{self._sequence}"
+
+
+class PooledConnection(Psycopg2Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+        self.statements = None
+
+
+class PreparingCursor(Psycopg2Cursor):
+    def execute(self, query, vars=None):
+        statements = self.connection.statements
+        if (
+            statements is None
+            or self.name is not None
+            or not isinstance(query, str)
+            or isinstance(vars, dict)
+            or not query.startswith("SELECT")
+        ):
+            return super().execute(query, vars)
+        name = statements.lookup(query)
+        if name == "":
+            name = self._prepare(statements, query, len(vars or ()))
+        if name is None:
+            return super().execute(query, vars)
+        if vars:
+            return super().execute(f"EXECUTE {name} ({', '.join(['%s'] * len(vars))})", vars)
+        return super().execute(f"EXECUTE {name}")
+
+    def _prepare(self, statements, query, arity):
+        sql, count = number_placeholders(query)
+        name = statements.next_name() if count == arity else None
+        if name is not None:
+            # PREPARE survives a rollback, but a failing one must not abort
+            # the caller's transaction
+            in_transaction = self.connection.info.transaction_status != TRANSACTION_STATUS_IDLE
+            if in_transaction:
+                super().execute("SAVEPOINT dj_prepare")
+            try:
+                super().execute(f"PREPARE {name} AS {sql}")
+            except self.connection.ProgrammingError:
+                name = None
+                if in_transaction:
+                    super().execute("ROLLBACK TO SAVEPOINT dj_prepare")
+            if in_transaction:
+                super().execute("RELEASE SAVEPOINT dj_prepare")
+        evicted = statements.add(query, name)
+        if evicted is not None:
+            super().execute(f"DEALLOCATE {evicted}")
+        return name
+
+
+class DatabaseCreation(PostgresDatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # idle pooled connections would keep DROP DATABASE from running
+        close_idle_connections()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        conn_params.pop("prepare_threshold", None)
+        conn_params["connection_factory"] = PooledConnection
+        conn_params["cursor_factory"] = PreparingCursor
+        return conn_params
+
+    def _pool(self, conn_params):
+        options = self.settings_dict["OPTIONS"].get("pool") or {}
+        key = (self.alias, tuple(sorted((k, str(v)) for k, v in conn_params.items())))
+        return get_pool(key, lambda: super(DatabaseWrapper, self).get_new_connection(conn_params), **options)
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        pool = self._pool(conn_params)
+        connection = pool.getconn(health_check=self.settings_dict["CONN_HEALTH_CHECKS"])
+        threshold = self.settings_dict["OPTIONS"].get("prepare_threshold")
+        if threshold and connection.statements is None:
+            connection.statements = PreparedStatements(threshold)
+        elif not threshold:
+            connection.statements = None
+        connection.pool = pool
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.connection.pool.putconn(self.connection)
@@ -0,0 +1,137 @@
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INERROR, TRANSACTION_STATUS_INTRANS
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of psycopg2 connections made by `connect`.
+
+    At most `max_size` connections exist at once; getconn() waits up to
+    `timeout` seconds for one to be returned. Idle connections are handed
+    out most recently used first, so a quiet process lets the rest sit for
+    `max_idle` seconds and close them. Connections older than
+    `max_lifetime` seconds are replaced when returned, and with
+    `health_check` one idle for more than `check_after` seconds is pinged
+    before it is handed out.
+    """
+
+    def __init__(self, connect, max_size=10, timeout=30, max_idle=300, max_lifetime=3600, check_after=10):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle = deque()  # (connection, created_at, returned_at), oldest return first
+        self._created = {}
+
+    def getconn(self, health_check=False):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"No database connection free within {self.timeout}s (pool of {self.max_size})")
+        try:
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    connection = self._connect()
+                    self._created[connection] = time.monotonic()
+                    return connection
+                connection, created_at, returned_at = entry
+                idle = time.monotonic() - returned_at
+                if connection.closed or idle > self.max_idle:
+                    self._discard(connection)
+                elif health_check and idle > self.check_after and not _ping(connection):
+                    self._discard(connection)
+                else:
+                    self._created[connection] = created_at
+                    return connection
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection):
+        """
+        Takes a connection back, rolling back whatever transaction it was
+        left in. Broken or expired connections are closed instead.
+        """
+        now = time.monotonic()
+        created_at = self._created.pop(connection, now)
+        reusable = False
+        try:
+            if not connection.closed:
+                status = connection.info.transaction_status
+                if status in (TRANSACTION_STATUS_INTRANS, TRANSACTION_STATUS_INERROR):
+                    connection.rollback()
+                    status = connection.info.transaction_status
+                reusable = status == TRANSACTION_STATUS_IDLE and now - created_at < self.max_lifetime
+        except psycopg2.Error:
+            pass
+        stale = []
+        if reusable:
+            with self._lock:
+                self._idle.append((connection, created_at, now))
+                while self._idle and now - self._idle[0][2] > self.max_idle:
+                    stale.append(self._idle.popleft()[0])
+        else:
+            stale.append(connection)
+        self._slots.release()
+        for connection in stale:
+            self._discard(connection)
+
+    def close_idle(self):
+        with self._lock:
+            idle = [connection for connection, _, _ in self._idle]
+            self._idle.clear()
+        for connection in idle:
+            self._discard(connection)
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+
+def _ping(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, connect, **options):
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(connect, **options)
+        return pool
+
+
+def close_idle_connections():
+    """
+    Closes every pooled connection not currently checked out, e.g. before
+    dropping a database.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_idle()
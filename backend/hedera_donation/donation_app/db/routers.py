@@ -0,0 +1,135 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from ..auth import request_user_id
+from ..cache import get_cache
+
+# How far a replica is behind the primary, in seconds: 0 once it has replayed
+# everything it received, NULL on a primary (e.g. an alias of the same DB)
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+_read_state = ContextVar("replica_read_state", default=None)
+
+
+def _pin_key(user_id):
+    return f"db:primary:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """
+    Sends `user_id`'s reads to the primary for READ_YOUR_WRITES_SECONDS, so
+    they see their own write even on a lagging replica.
+    """
+    get_cache().set(_pin_key(user_id), True, settings.READ_YOUR_WRITES_SECONDS)
+
+
+class _ReadState:
+    def __init__(self, request):
+        self.request = request
+        self.alias = None
+        self._pinned = None
+
+    def pinned(self):
+        # decided at the first query, when the operation's auth has run
+        if self._pinned is None:
+            user_id = request_user_id(self.request)
+            self._pinned = user_id is not None and get_cache().get(_pin_key(user_id)) is not None
+        return self._pinned
+
+
+@contextmanager
+def replica_reads(request):
+    """
+    Lets reads made while handling `request` go to a replica.
+    """
+    token = _read_state.set(_ReadState(request))
+    try:
+        yield
+    finally:
+        _read_state.reset(token)
+
+
+class ReplicaSet:
+    """
+    Round-robin over the healthy DATABASE_REPLICAS. A replica is probed at
+    most every DATABASE_REPLICA_CHECK_INTERVAL seconds per process; one that
+    is unreachable or more than DATABASE_REPLICA_MAX_LAG seconds behind is
+    skipped until the next probe. With none healthy, reads use the primary.
+    """
+
+    def __init__(self):
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._health = {}  # alias -> (healthy, checked_at)
+
+    def choose(self, aliases):
+        start = next(self._turn)
+        for offset in range(len(aliases)):
+            alias = aliases[(start + offset) % len(aliases)]
+            if self.healthy(alias):
+                return alias
+        return DEFAULT_DB_ALIAS
+
+    def healthy(self, alias):
+        now = time.monotonic()
+        with self._lock:
+            healthy, checked_at = self._health.get(alias, (False, None))
+        if checked_at is not None and now - checked_at < settings.DATABASE_REPLICA_CHECK_INTERVAL:
+            return healthy
+        healthy = self._probe(alias)
+        with self._lock:
+            self._health[alias] = (healthy, now)
+        return healthy
+
+    def _probe(self, alias):
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                (lag,) = cursor.fetchone()
+        except DatabaseError:
+            connections[alias].close()
+            return False
+        return lag is None or lag <= settings.DATABASE_REPLICA_MAX_LAG
+
+
+replicas = ReplicaSet()
+
+
+class ReplicaRouter:
+    """
+    Sends reads inside replica_reads() to a replica, the same one for the
+    whole request, unless the requesting user is pinned to the primary;
+    everything else uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _read_state.get()
+        if state is None or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        if state.alias is None:
+            # one alias per request, so all of its reads come from one server
+            state.alias = DEFAULT_DB_ALIAS if state.pinned() else replicas.choose(settings.DATABASE_REPLICAS)
+            state.request.db_read_alias = state.alias
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        # explicit, or Django would write to the alias an instance was read from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # every alias holds the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,143 @@
+"""
+Streaming donation exports.
+
+Rows come from a server-side cursor in EXPORT_CHUNK_SIZE batches as plain
+tuples (values_list, no model instances), and are encoded and sent batch by
+batch, so memory stays flat however many donations a campaign has.
+
+The cursor is read inside a transaction held for the whole export. Outside
+one Django declares it WITH HOLD, and PostgreSQL then runs the query to the
+end and stores its result when the DECLARE commits, before the first batch.
+The price is one open (read-only) transaction, and so one pooled
+connection, per export in progress; EXPORT_MAX_CONCURRENT bounds how many
+one process streams at once, and the rest wait before reading anything.
+
+Under ASGI Django consumes a sync iterator into a list before sending it,
+so the response body is an async generator that fetches each batch through
+sync_to_async. WSGI (runserver, the test client) still accepts it, but
+buffers the whole body and warns.
+"""
+import asyncio
+import csv
+import json
+import weakref
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+
+from .middleware import release_connections
+
+# (column header, field lookup)
+DONATION_COLUMNS = (
+    ("donation_id", "id"),
+    ("campaign_id", "campaign_id"),
+    ("campaign_title", "campaign__title"),
+    ("donor_id", "user_id"),
+    ("donor_username", "user__username"),
+    ("donor_wallet", "user__wallet_address"),
+    ("amount", "amount"),
+    ("date", "date"),
+    ("transaction_hash", "transaction_hash"),
+)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+# event loop -> semaphore of EXPORT_MAX_CONCURRENT slots
+_export_slots = weakref.WeakKeyDictionary()
+
+
+def _export_slot():
+    loop = asyncio.get_running_loop()
+    if loop not in _export_slots:
+        _export_slots[loop] = asyncio.Semaphore(settings.EXPORT_MAX_CONCURRENT)
+    return _export_slots[loop]
+
+
+def _plain(value):
+    # Decimal as a string keeps every digit of the amount
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    """
+    File-like target for csv.writer that hands each row back as a string.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _encoder(format):
+    headers = [header for header, _ in DONATION_COLUMNS]
+    if format == "csv":
+        writer = csv.writer(_Echo())
+        return writer.writerow(headers), lambda row: writer.writerow([_plain(value) for value in row])
+
+    def encode(row):
+        return json.dumps(dict(zip(headers, map(_plain, row))), separators=(",", ":")) + "\n"
+
+    return "", encode
+
+
+async def stream_donations(queryset, format):
+    """
+    Yields `queryset`'s donations as `format` ("csv" or "ndjson"), one
+    encoded batch of EXPORT_CHUNK_SIZE rows at a time.
+    """
+    async with _export_slot():
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        header, encode = _encoder(format)
+        if header:
+            yield header.encode()
+        # QuerySet.aiterator() runs values_list() queries on the event loop in
+        # Django 4.2, so fetch (and encode) each batch in the request's thread,
+        # which also owns the transaction
+        rows = queryset.values_list(*(lookup for _, lookup in DONATION_COLUMNS)).iterator(chunk_size=chunk_size)
+
+        def next_batch():
+            return "".join(encode(row) for row in islice(rows, chunk_size)).encode()
+
+        atomic = transaction.atomic(using=queryset.db)
+
+        def finish(*exc_info):
+            # the cursor goes before the transaction that holds it
+            rows.close()
+            atomic.__exit__(*exc_info)
+            # Django skips request_finished when the client went away
+            release_connections()
+
+        await sync_to_async(atomic.__enter__)()
+        try:
+            while True:
+                batch = await sync_to_async(next_batch)()
+                if not batch:
+                    break
+                yield batch
+        except BaseException as exc:
+            # including GeneratorExit, when the client goes away
+            await sync_to_async(finish)(type(exc), exc, exc.__traceback__)
+            raise
+        await sync_to_async(finish)(None, None, None)
+
+
+def donations_export_response(queryset, format, filename):
+    # choose the database now, while the request's replica routing applies
+    queryset = queryset.using(queryset.db)
+    response = StreamingHttpResponse(stream_donations(queryset, format), content_type=EXPORT_FORMATS[format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{format}"'
+    # keeps nginx from buffering the whole export before passing it on
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,166 @@
+"""
+Resized, re-encoded variants of uploaded images.
+
+Each variant of an uploaded "<sha256>.<ext>" is stored next to it as
+"<sha256>.<ext>.<variant>.webp", scaled down to fit VARIANTS[variant] (never
+up). Names follow from the original's and back, so API responses can list
+the variant URLs without looking anything up, and until a variant exists
+media serving redirects it to the original.
+
+Uploads enqueue build_variants() on a process pool of IMAGE_VARIANT_WORKERS
+spawned workers, off the request path. Building skips variants that already
+exist, so re-running it (see manage.py build_image_variants) is harmless.
+"""
+import io
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# name -> bounding box, largest first
+VARIANTS = {
+    "hero": (1600, 900),
+    "card": (640, 400),
+    "thumb": (160, 160),
+}
+VARIANT_FORMAT = "webp"
+VARIANT_QUALITY = 80
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tif", ".tiff"}
+# "<uuid hex>.<ext>" from before content addressing, "<sha256>.<ext>" since
+UPLOAD_NAME = re.compile(r"^(?:[0-9a-f]{32}|[0-9a-f]{64})\.[A-Za-z0-9]+$")
+VARIANT_NAME = re.compile(rf"^(?P<original>(?:[0-9a-f]{{32}}|[0-9a-f]{{64}})\.[A-Za-z0-9]+)\.(?:{'|'.join(VARIANTS)})\.{VARIANT_FORMAT}$")
+
+
+def is_image_upload(name):
+    return bool(UPLOAD_NAME.match(name)) and os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def variant_name(name, variant):
+    return f"{name}.{variant}.{VARIANT_FORMAT}"
+
+
+def image_variants(url):
+    """
+    {"thumb": url, "card": url, "hero": url} for an uploaded image's
+    /api/read-file URL; None for anything else (e.g. external images).
+    """
+    # not at module level: pool workers import this module before
+    # django.setup(), and uploads imports the models
+    from .uploads import FILE_URL_ROOT
+
+    prefix = f"{FILE_URL_ROOT}/"
+    if not url or not url.startswith(prefix) or not is_image_upload(url[len(prefix):]):
+        return None
+    name = url[len(prefix):]
+    return {variant: f"{prefix}{variant_name(name, variant)}" for variant in VARIANTS}
+
+
+def original_for_variant(name):
+    """
+    The stored original a variant name was derived from, or None.
+    """
+    match = VARIANT_NAME.match(name)
+    if match is None or not default_storage.exists(match.group("original")):
+        return None
+    return match.group("original")
+
+
+def _encode(image, box):
+    variant = image.copy()
+    variant.thumbnail(box)
+    buffer = io.BytesIO()
+    variant.save(buffer, VARIANT_FORMAT, quality=VARIANT_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def build_variants(name, force=False):
+    """
+    Writes the missing variants of the uploaded image `name`; with `force`,
+    all of them. Returns the names written.
+    """
+    wanted = {
+        variant: variant_name(name, variant)
+        for variant in VARIANTS
+        if force or not default_storage.exists(variant_name(name, variant))
+    }
+    if not wanted:
+        return []
+    try:
+        with default_storage.open(name, "rb") as file, Image.open(file) as image:
+            # lets JPEG decode at a fraction of full size when that is enough
+            image.draft("RGB", VARIANTS[next(iter(wanted))])
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                alpha = "A" in image.getbands() or "transparency" in image.info
+                image = image.convert("RGBA" if alpha else "RGB")
+            encoded = {target: _encode(image, VARIANTS[variant]) for variant, target in wanted.items()}
+    except (UnidentifiedImageError, OSError) as exc:
+        logger.warning("Cannot build variants of %s: %s", name, exc)
+        return []
+
+    written = []
+    for target, data in encoded.items():
+        if force and default_storage.exists(target):
+            default_storage.delete(target)
+        stored = default_storage.save(target, ContentFile(data))
+        if stored != target:
+            # another worker wrote it first; storage picked a new name for ours
+            default_storage.delete(stored)
+            continue
+        written.append(stored)
+    return written
+
+
+def init_worker():
+    """
+    Pool initializer: spawned workers start without Django configured.
+    """
+    import django
+
+    django.setup()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawned, not forked: the web process has threads and open connections
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_VARIANT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+            )
+        return _executor
+
+
+def _log_failure(future):
+    if future.exception() is not None:
+        logger.error("Building image variants failed", exc_info=future.exception())
+
+
+def enqueue_variants(name):
+    """
+    Builds the variants of `name` in the background, if it is an image.
+    With IMAGE_VARIANT_WORKERS = 0 they are built right away instead.
+    """
+    if not is_image_upload(name):
+        return None
+    if not settings.IMAGE_VARIANT_WORKERS:
+        return build_variants(name)
+    future = _get_executor().submit(build_variants, name)
+    future.add_done_callback(_log_failure)
+    return future
@@ -0,0 +1,136 @@
+import csv
+import io
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db import connection, transaction
+
+from .cache import invalidate
+from .models import Campaign, HederaUser
+from .summaries import forget_donation_summaries
+
+
+@dataclass
+class DonationEvent:
+    """
+    A decoded DonationReceived log.
+
+    `donor` is the donor's Hedera account id (e.g. "0.0.1234"), matched
+    against HederaUser.wallet_address. `timestamp` is the consensus
+    timestamp in seconds ("1700000000.123456789").
+    """
+    campaign_onchain_id: int
+    donor: str
+    amount: Decimal
+    transaction_hash: str
+    timestamp: str
+
+
+@dataclass
+class IngestResult:
+    received: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+
+STAGING_TABLE = "donation_ingest_staging"
+# consensus timestamps, as the mirror node writes them
+TIMESTAMP = re.compile(r"^\d+(\.\d{1,9})?$")
+
+CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+    campaign_id bigint NOT NULL,
+    user_id bigint NOT NULL,
+    amount numeric(40, 2) NOT NULL,
+    consensus_timestamp numeric NOT NULL,
+    transaction_hash varchar(255) NOT NULL
+) ON COMMIT DROP
+"""
+
+# DISTINCT ON keeps the latest event per key: ON CONFLICT cannot touch the
+# same row twice in one statement. Rows whose values did not change are left
+# alone so replays do not fire the totals trigger.
+UPSERT_SQL = f"""
+INSERT INTO donation_app_donation (campaign_id, user_id, amount, date, transaction_hash)
+SELECT DISTINCT ON (campaign_id, user_id, transaction_hash)
+    campaign_id, user_id, amount, to_timestamp(consensus_timestamp), transaction_hash
+FROM {STAGING_TABLE}
+ORDER BY campaign_id, user_id, transaction_hash, consensus_timestamp DESC
+ON CONFLICT ON CONSTRAINT unique_campaign_user_transaction DO UPDATE
+SET amount = EXCLUDED.amount,
+    date = EXCLUDED.date
+WHERE (donation_app_donation.amount, donation_app_donation.date)
+    IS DISTINCT FROM (EXCLUDED.amount, EXCLUDED.date)
+RETURNING (xmax = 0) AS inserted
+"""
+
+
+def resolve_users(wallet_addresses):
+    return dict(
+        HederaUser.objects.filter(wallet_address__in=set(wallet_addresses))
+        .values_list("wallet_address", "id")
+    )
+
+
+def resolve_campaigns(onchain_ids):
+    return dict(
+        Campaign.objects.filter(onchain_id__in=set(onchain_ids))
+        .values_list("onchain_id", "id")
+    )
+
+
+def ingest_donations(events):
+    """
+    Upserts a batch of DonationEvents in one transaction: users and campaigns
+    are resolved with one query each, rows are COPY'd into a temp staging
+    table and merged with a single INSERT ... ON CONFLICT. Campaign totals are
+    updated by the statement-level trigger inside the same transaction.
+    Events whose donor or campaign is unknown, or whose timestamp is not a
+    consensus timestamp, are skipped.
+    """
+    result = IngestResult(received=len(events))
+    if not events:
+        return result
+
+    users = resolve_users(event.donor for event in events)
+    campaigns = resolve_campaigns(event.campaign_onchain_id for event in events)
+
+    buffer = io.StringIO()
+    # CSV quotes whatever a transaction hash contains
+    writer = csv.writer(buffer)
+    staged_campaigns, staged_users = set(), set()
+    for event in events:
+        user_id = users.get(event.donor)
+        campaign_id = campaigns.get(event.campaign_onchain_id)
+        if (user_id is None or campaign_id is None or not event.transaction_hash
+                or not TIMESTAMP.match(str(event.timestamp))):
+            result.skipped += 1
+            continue
+        writer.writerow([campaign_id, user_id, event.amount, event.timestamp, event.transaction_hash])
+        staged_campaigns.add(campaign_id)
+        staged_users.add(user_id)
+
+    if not staged_campaigns:
+        return result
+
+    buffer.seek(0)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(CREATE_STAGING_SQL)
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} (campaign_id, user_id, amount, consensus_timestamp, transaction_hash) FROM STDIN (FORMAT csv)",
+            buffer,
+        )
+        cursor.execute(UPSERT_SQL)
+        for (inserted,) in cursor.fetchall():
+            if inserted:
+                result.inserted += 1
+            else:
+                result.updated += 1
+        # Still inside any outer transaction: leave the staging table empty
+        cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+        if result.inserted or result.updated:
+            invalidate("campaigns", "donors")
+            forget_donation_summaries(staged_campaigns, staged_users)
+    return result
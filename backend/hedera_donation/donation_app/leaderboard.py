@@ -0,0 +1,54 @@
+from django.db import connection, transaction
+
+from .cache import invalidate
+
+# Recompute every (token, donor) total in one statement: upsert the rows that
+# changed and drop entries whose donations no longer exist.
+REFRESH_SQL = """
+WITH totals AS (
+    SELECT c.token_id, d.user_id, SUM(d.amount) AS total_amount, COUNT(*) AS donation_count
+    FROM donation_app_donation d
+    JOIN donation_app_campaign c ON c.id = d.campaign_id
+    GROUP BY c.token_id, d.user_id
+),
+upserted AS (
+    INSERT INTO donation_app_donorleaderboardentry (token_id, user_id, total_amount, donation_count, updated_at)
+    SELECT token_id, user_id, total_amount, donation_count, NOW() FROM totals
+    ON CONFLICT (token_id, user_id) DO UPDATE
+    SET total_amount = EXCLUDED.total_amount,
+        donation_count = EXCLUDED.donation_count,
+        updated_at = EXCLUDED.updated_at
+    WHERE (donation_app_donorleaderboardentry.total_amount, donation_app_donorleaderboardentry.donation_count)
+        IS DISTINCT FROM (EXCLUDED.total_amount, EXCLUDED.donation_count)
+    RETURNING 1
+),
+deleted AS (
+    DELETE FROM donation_app_donorleaderboardentry e
+    WHERE NOT EXISTS (
+        SELECT 1 FROM totals t WHERE t.token_id = e.token_id AND t.user_id = e.user_id
+    )
+    RETURNING 1
+)
+SELECT (SELECT COUNT(*) FROM upserted), (SELECT COUNT(*) FROM deleted)
+"""
+
+
+def refresh_leaderboard():
+    """
+    Rebuilds DonorLeaderboardEntry from the donations table.
+    Returns (rows_upserted, rows_deleted).
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(REFRESH_SQL)
+        upserted, deleted = cursor.fetchone()
+        if upserted or deleted:
+            invalidate("donors")
+    return upserted, deleted
+
+
+def format_token_amount(amount, decimal):
+    """
+    Converts an on-chain integer amount into whole-token units.
+    """
+    value = amount.scaleb(-decimal) if decimal else amount
+    return f"{value.normalize():f}"
@@ -0,0 +1,179 @@
+import asyncio
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+HOST = "127.0.0.1"
+
+
+def _servers(sync_port, async_port):
+    manage = os.path.join(settings.BASE_DIR, "manage.py")
+    return (
+        # what the container used to run: WSGI, one thread per connection
+        ("sync", sync_port, [sys.executable, manage, "runserver", "--noreload", f"{HOST}:{sync_port}"]),
+        # what it runs now: ASGI on one event loop
+        ("async", async_port, [
+            sys.executable, "-m", "uvicorn", "hedera_donation.asgi:application",
+            "--host", HOST, "--port", str(async_port), "--no-access-log",
+        ]),
+    )
+
+
+def _wait_for(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"Server on port {port} exited with {process.returncode}")
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"Server on port {port} did not start within {timeout}s")
+
+
+def _thread_count(pid):
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("Threads:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+async def _slow_request(port, path, delay):
+    """
+    One slow client: sends the request line, dawdles for `delay` seconds
+    before finishing the headers, then reads the whole response.
+    """
+    started = time.perf_counter()
+    try:
+        reader, writer = await asyncio.open_connection(HOST, port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n".encode())
+        await writer.drain()
+        await asyncio.sleep(delay)
+        writer.write(b"Connection: close\r\n\r\n")
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        writer.close()
+        status = int(status_line.split()[1])
+    except (OSError, IndexError, ValueError):
+        status = None
+    return status, time.perf_counter() - started
+
+
+async def _slow_reader(port, path, headers):
+    """
+    One slow download: sends the whole request, then reads the response a
+    little at a time until cancelled.
+    """
+    try:
+        reader, writer = await asyncio.open_connection(HOST, port)
+    except OSError:
+        return
+    try:
+        lines = "".join(f"{header}\r\n" for header in headers)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n{lines}Connection: close\r\n\r\n".encode())
+        await writer.drain()
+        while await reader.read(1024):
+            await asyncio.sleep(0.1)
+    except OSError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _run(port, pid, path, connections, delay, readers=0, reader_path=None, reader_headers=()):
+    peak_threads = 0
+    done = asyncio.Event()
+    downloads = [
+        asyncio.ensure_future(_slow_reader(port, reader_path or path, reader_headers))
+        for _ in range(readers)
+    ]
+    if downloads:
+        # let every download get its response started first
+        await asyncio.sleep(2)
+
+    async def sample_threads():
+        nonlocal peak_threads
+        while not done.is_set():
+            peak_threads = max(peak_threads, _thread_count(pid) or 0)
+            await asyncio.sleep(0.05)
+
+    sampler = asyncio.ensure_future(sample_threads())
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_slow_request(port, path, delay) for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    for download in downloads:
+        download.cancel()
+    await asyncio.gather(sampler, *downloads, return_exceptions=True)
+    return results, elapsed, peak_threads
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the WSGI server (runserver) with the ASGI one (uvicorn) under many "
+        "concurrent slow clients hitting one read endpoint, optionally while --readers "
+        "clients download --reader-path slowly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/campaigns", help="Endpoint to request (default: %(default)s)")
+        parser.add_argument("--connections", type=int, default=1000, help="Concurrent connections")
+        parser.add_argument("--delay", type=float, default=1.0,
+                            help="Seconds each client waits before finishing its request")
+        parser.add_argument("--readers", type=int, default=0,
+                            help="Slow downloads kept open while the clients run")
+        parser.add_argument("--reader-path", help="Endpoint the slow downloads read (default: --path)")
+        parser.add_argument("--reader-header", action="append", default=[],
+                            help='Header sent by the slow downloads, e.g. "X-API-Key: secret"')
+        parser.add_argument("--server", choices=["sync", "async", "both"], default="both",
+                            help="Server(s) to benchmark; WSGI buffers streamed bodies whole (default: %(default)s)")
+        parser.add_argument("--sync-port", type=int, default=8101)
+        parser.add_argument("--async-port", type=int, default=8102)
+
+    def handle(self, *args, **options):
+        # every client holds a socket on both ends of the connection
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        wanted = 2 * (options["connections"] + options["readers"]) + 256
+        if soft < wanted:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+        for label, port, command in _servers(options["sync_port"], options["async_port"]):
+            if options["server"] not in (label, "both"):
+                continue
+            process = subprocess.Popen(command, cwd=settings.BASE_DIR,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                _wait_for(port, process)
+                results, elapsed, peak_threads = asyncio.run(
+                    _run(port, process.pid, options["path"], options["connections"], options["delay"],
+                         options["readers"], options["reader_path"], options["reader_header"])
+                )
+            finally:
+                process.terminate()
+                process.wait()
+
+            latencies = sorted(latency for status, latency in results if status == 200)
+            failed = len(results) - len(latencies)
+            if not latencies:
+                self.stdout.write(f"{label:>5}: all {failed} requests failed")
+                continue
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            self.stdout.write(
+                f"{label:>5}: {len(latencies)} ok, {failed} failed in {elapsed:.1f}s "
+                f"= {len(latencies) / elapsed:,.0f} req/s; "
+                f"p50 {statistics.median(latencies) * 1000:.0f} ms, p99 {p99 * 1000:.0f} ms; "
+                f"peak {peak_threads} server threads"
+            )
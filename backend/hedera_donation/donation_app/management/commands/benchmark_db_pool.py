@@ -0,0 +1,84 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from donation_app.models import Campaign
+
+# label -> environment for the settings module
+VARIANTS = (
+    ("connect per request", {"POSTGRES_POOL_ENABLED": "False", "POSTGRES_CONN_MAX_AGE": "0"}),
+    ("pooled", {"POSTGRES_POOL_ENABLED": "True", "POSTGRES_PREPARE_THRESHOLD": "0"}),
+    ("pooled + prepared", {"POSTGRES_POOL_ENABLED": "True", "POSTGRES_PREPARE_THRESHOLD": "5"}),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure /api/campaigns/{id} latency with a new connection per request, pooled "
+        "connections, and pooled connections with prepared statements."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--campaign", type=int, help="Campaign id (default: the first approved one)")
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--worker", action="store_true", help=
+                            "Internal: run one variant in this process and print its timings as JSON")
+
+    def handle(self, *args, **options):
+        if options["worker"]:
+            return self.run_worker(options)
+
+        campaign_id = options["campaign"] or (
+            Campaign.objects.filter(approved_by_admin=True).order_by("id").values_list("id", flat=True).first()
+        )
+        if campaign_id is None:
+            raise CommandError("No approved campaign to request; pass --campaign.")
+
+        manage = os.path.join(settings.BASE_DIR, "manage.py")
+        for label, env in VARIANTS:
+            # settings are read once per process, so each variant gets its own
+            result = subprocess.run(
+                [sys.executable, manage, "benchmark_db_pool", "--worker",
+                 "--campaign", str(campaign_id), "--requests", str(options["requests"])],
+                env={**os.environ, **env, "API_CACHE_ENABLED": "False"},
+                capture_output=True, text=True, cwd=settings.BASE_DIR,
+            )
+            if result.returncode:
+                raise CommandError(f"{label} failed:\n{result.stderr}")
+            timings = json.loads(result.stdout.strip().splitlines()[-1])
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            self.stdout.write(
+                f"{label:>20}: mean {statistics.fmean(timings) * 1000:.2f} ms, "
+                f"p50 {statistics.median(timings) * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms"
+            )
+
+    def run_worker(self, options):
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        path = f"/api/campaigns/{options['campaign']}"
+
+        def start_response(status, headers):
+            if not status.startswith("200"):
+                raise CommandError(f"{path} answered {status}")
+
+        timings = []
+        # the first requests warm the pool and cross the prepare threshold
+        for i in range(options["requests"] + 50):
+            environ = factory.get(path).environ
+            started = time.perf_counter()
+            # a full request cycle, including the connection handling that
+            # request_started / request_finished trigger
+            response = handler(environ, start_response)
+            b"".join(response)
+            response.close()
+            if i >= 50:
+                timings.append(time.perf_counter() - started)
+        self.stdout.write(json.dumps(sorted(timings)))
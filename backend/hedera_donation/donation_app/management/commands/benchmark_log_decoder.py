@@ -0,0 +1,81 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from donation_app.chain.decode import (
+    CAMPAIGN_CLOSED, CAMPAIGN_PUBLISHED, DONATION_RECEIVED, EVENTS, decode_batch,
+)
+
+
+def _word(value):
+    return f"{value:064x}"
+
+
+def synthetic_logs(count, seed=0):
+    """
+    Mirror-node shaped logs: mostly donations, with some publishes/closes.
+    """
+    rng = random.Random(seed)
+    logs = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.98:
+            topics = [DONATION_RECEIVED, "0x" + _word(rng.getrandbits(160))]
+            data = _word(rng.randrange(10000)) + _word(rng.getrandbits(96)) + _word(rng.getrandbits(128))
+        elif roll < 0.99:
+            topics = [CAMPAIGN_PUBLISHED, "0x" + _word(i), "0x" + _word(rng.randrange(10000))]
+            data = _word(rng.getrandbits(160)) + _word(rng.getrandbits(160)) + _word(rng.getrandbits(96))
+        else:
+            topics = [CAMPAIGN_CLOSED, "0x" + _word(rng.getrandbits(160))]
+            data = _word(rng.randrange(10000)) + _word(rng.getrandbits(128))
+        logs.append({
+            "topics": topics,
+            "data": "0x" + data,
+            "transaction_hash": "0x" + _word(rng.getrandbits(256)),
+            "timestamp": f"{1700000000 + i}.{rng.randrange(10 ** 9):09d}",
+        })
+    return logs
+
+
+def decode_per_log(logs):
+    """
+    Baseline: one log at a time, the way the TypeScript worker decodes.
+    """
+    rows = []
+    for log in logs:
+        spec = EVENTS.get(log["topics"][0])
+        if spec is None:
+            continue
+        data = log["data"][2:]
+        row = {"event": spec.name, "transaction_hash": log["transaction_hash"], "timestamp": log["timestamp"]}
+        for index, (column, kind) in enumerate(spec.topics, start=1):
+            topic = log["topics"][index]
+            row[column] = "0x" + topic[-40:] if kind == "address" else int(topic, 16)
+        for index, (column, kind) in enumerate(spec.data):
+            word = data[64 * index:64 * (index + 1)]
+            row[column] = "0x" + word[24:] if kind == "address" else int(word, 16)
+        rows.append(row)
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Measure decoded logs per second for the batched log decoder against a per-log baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logs", type=int, default=100000, help="Logs per batch")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        logs = synthetic_logs(options["logs"])
+        for label, decode in (("per-log", decode_per_log), ("batched", decode_batch)):
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                decode(logs)
+                timings.append(time.perf_counter() - started)
+            best = min(timings)
+            self.stdout.write(
+                f"{label:>8}: {len(logs)} logs in {best * 1000:.0f} ms (best of {len(timings)}) "
+                f"= {len(logs) / best:,.0f} logs/s"
+            )
@@ -0,0 +1,39 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from donation_app.images import init_worker, build_variants, is_image_upload
+from donation_app.models import Campaign, HederaUser
+from donation_app.uploads import FILE_URL_ROOT
+
+
+def _referenced_uploads():
+    prefix = f"{FILE_URL_ROOT}/"
+    urls = set(Campaign.objects.filter(image__startswith=prefix).values_list("image", flat=True))
+    urls |= set(HederaUser.objects.filter(image__startswith=prefix).values_list("image", flat=True))
+    return sorted(name for name in (url[len(prefix):] for url in urls) if is_image_upload(name))
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the thumb/card/hero variants of every uploaded campaign and avatar image. "
+        "Variants that already exist are skipped, so it is safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+        parser.add_argument("--force", action="store_true", help="Rebuild variants that already exist")
+
+    def handle(self, *args, **options):
+        names = _referenced_uploads()
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        ) as pool:
+            written = sum(
+                len(variants)
+                for variants in pool.map(build_variants, names, [options["force"]] * len(names))
+            )
+        self.stdout.write(f"{len(names)} images checked, {written} variants written.")
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from donation_app.models import StoredBlob
+from donation_app.storage import recount_references
+
+
+class Command(BaseCommand):
+    help = "Delete stored files no campaign or user image has referred to for a while, with their image variants."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=settings.BLOB_GC_GRACE,
+            help="Seconds since a file was last uploaded or referred to (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Recompute refcounts from the campaign and user images first",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options["recount"]:
+            recount_references()
+        cutoff = timezone.now() - timedelta(seconds=options["older_than"])
+        deleted = freed = 0
+        while True:
+            # Rows stay locked until their files are gone: an upload of the
+            # same content waits on the row, then stores the file again.
+            with transaction.atomic():
+                batch = list(
+                    StoredBlob.objects.select_for_update(skip_locked=True)
+                    .filter(refcount=0, updated_at__lt=cutoff)
+                    .values_list("sha256", "size")[: options["batch_size"]]
+                )
+                if not batch:
+                    break
+                for sha256, size in batch:
+                    default_storage.delete_blob(sha256)
+                    freed += size
+                StoredBlob.objects.filter(sha256__in=[sha256 for sha256, _ in batch]).delete()
+            deleted += len(batch)
+        self.stdout.write(f"Deleted {deleted} stored files, {freed} bytes.")
@@ -0,0 +1,161 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from donation_app.models import Campaign, Donation, HederaUser
+
+# Synthetic data, generated server-side so seeding 1M donations takes seconds.
+# The totals trigger is disabled during the bulk insert and totals are
+# recomputed once at the end.
+SEED_SQL = """
+SET CONSTRAINTS ALL IMMEDIATE;
+
+INSERT INTO donation_app_hederauser (username, wallet_address, is_active, date_joined, image)
+SELECT 'bench_user_' || g, '0.0.' || (9000000 + g), true, NOW(), NULL
+FROM generate_series(1, %(users)s) g
+ON CONFLICT DO NOTHING;
+
+INSERT INTO donation_app_campaigntype (name)
+SELECT 'bench_type_' || g FROM generate_series(1, 10) g;
+
+INSERT INTO donation_app_token (name, symbol, address, decimal)
+VALUES ('Bench Token', 'BENCH', '0xbench', 8);
+
+INSERT INTO donation_app_campaign (
+    title, description, image, goal, current_amount, percentage_completed,
+    organizer_id, campaign_type_id, token_id, created_at, updated_at,
+    approved_by_admin, status, onchain_id
+)
+SELECT
+    'bench_campaign_' || g, repeat('lorem ipsum ', 50), NULL, 1000 + g, 0, 0,
+    (SELECT MIN(id) FROM donation_app_hederauser WHERE username LIKE 'bench_user_%%') + (g %% %(users)s),
+    (SELECT MIN(id) FROM donation_app_campaigntype WHERE name LIKE 'bench_type_%%') + (g %% 10),
+    (SELECT MAX(id) FROM donation_app_token WHERE symbol = 'BENCH'),
+    NOW() - (g || ' minutes')::interval, NOW() - (g || ' seconds')::interval,
+    g %% 5 <> 0,
+    (ARRAY['NEW', 'PENDING', 'PUBLISHED', 'CLOSED'])[1 + g %% 4],
+    CASE WHEN g %% 4 >= 2 THEN g END
+FROM generate_series(1, %(campaigns)s) g;
+
+ALTER TABLE donation_app_donation DISABLE TRIGGER USER;
+
+INSERT INTO donation_app_donation (campaign_id, user_id, amount, date, transaction_hash)
+SELECT
+    c.min_id + (g %% %(campaigns)s),
+    u.min_id + ((g::bigint * 7919) %% %(users)s),
+    (g %% 1000) + 1,
+    NOW() - (g || ' seconds')::interval,
+    '0xbench' || g
+FROM generate_series(1, %(donations)s) g,
+    (SELECT MIN(id) AS min_id FROM donation_app_campaign WHERE title LIKE 'bench_campaign_%%') c,
+    (SELECT MIN(id) AS min_id FROM donation_app_hederauser WHERE username LIKE 'bench_user_%%') u;
+
+ALTER TABLE donation_app_donation ENABLE TRIGGER USER;
+
+UPDATE donation_app_campaign c
+SET current_amount = d.total,
+    percentage_completed = ROUND(d.total / c.goal * 100, 2)
+FROM (SELECT campaign_id, SUM(amount) AS total FROM donation_app_donation GROUP BY campaign_id) d
+WHERE d.campaign_id = c.id AND c.title LIKE 'bench_campaign_%%';
+
+ANALYZE donation_app_hederauser;
+ANALYZE donation_app_campaign;
+ANALYZE donation_app_donation;
+"""
+
+
+def hot_queries():
+    """
+    The querysets behind the API endpoints and the on-chain worker.
+    """
+    campaign = Campaign.objects.order_by("-id").only("id", "organizer_id", "campaign_type_id").first()
+    donation = Donation.objects.order_by("-id").only("id", "transaction_hash").first()
+    user = HederaUser.objects.order_by("-id").only("id", "wallet_address").first()
+    if not (campaign and donation and user):
+        return []
+    return [
+        ("GET /campaigns (first page)",
+         Campaign.objects.filter(approved_by_admin=True).order_by("-created_at", "-id")[:21]),
+        ("GET /top-campaigns",
+         Campaign.objects.filter(goal__gt=0, approved_by_admin=True).order_by("-percentage_completed")[:6]),
+        ("GET /campaigns/{id} related seek",
+         Campaign.objects.filter(
+             campaign_type_id=campaign.campaign_type_id, approved_by_admin=True,
+             status=Campaign.STATUS_PUBLISHED, id__gte=campaign.id // 2,
+         ).order_by("id")[:1]),
+        ("GET /user/campaigns",
+         Campaign.objects.filter(organizer_id=campaign.organizer_id).order_by("-updated_at")),
+        ("GET /campaigns/{id}/donations",
+         Donation.objects.filter(campaign_id=campaign.id).order_by("-date", "-id")[:50]),
+        ("GET /user/donation-history",
+         Donation.objects.filter(user_id=user.id).order_by("-date", "-id")[:50]),
+        ("Donation by transaction hash",
+         Donation.objects.filter(transaction_hash=donation.transaction_hash)),
+        ("POST /login wallet lookup",
+         HederaUser.objects.filter(wallet_address=user.wallet_address)),
+        ("Worker: campaigns awaiting publish",
+         Campaign.objects.filter(
+             approved_by_admin=True, status__in=[Campaign.STATUS_NEW, Campaign.STATUS_PENDING],
+             onchain_id__isnull=True,
+         )),
+        ("Worker: campaign by onchain_id",
+         Campaign.objects.filter(onchain_id=campaign.id)),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Print EXPLAIN ANALYZE plans for the hot queries with and without the "
+        "access-pattern indexes. Seeding writes synthetic rows: use a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed-donations", type=int, default=0,
+                            help="Insert this many synthetic donations first (e.g. 1000000)")
+        parser.add_argument("--seed-campaigns", type=int, default=10000)
+        parser.add_argument("--seed-users", type=int, default=50000)
+
+    def handle(self, *args, **options):
+        if options["seed_donations"]:
+            started = time.monotonic()
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(SEED_SQL, {
+                    "users": options["seed_users"],
+                    "campaigns": options["seed_campaigns"],
+                    "donations": options["seed_donations"],
+                })
+            self.stdout.write(f"Seeded {options['seed_donations']} donations in {time.monotonic() - started:.1f}s")
+
+        queries = hot_queries()
+        if not queries:
+            self.stdout.write("No data to explain; run with --seed-donations.")
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING("=== Before: access-pattern indexes dropped ==="))
+        # DDL is transactional in Postgres: drop, explain, roll back.
+        with transaction.atomic():
+            self._drop_indexes()
+            self._explain(queries)
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.MIGRATE_HEADING("=== After: with indexes ==="))
+        self._explain(queries)
+
+    def _drop_indexes(self):
+        with connection.cursor() as cursor:
+            for model in (Campaign, Donation):
+                for index in model._meta.indexes:
+                    cursor.execute(f'DROP INDEX "{index.name}"')
+            table = HederaUser._meta.db_table
+            for name, info in connection.introspection.get_constraints(cursor, table).items():
+                if info["columns"] == ["wallet_address"] and info["unique"]:
+                    cursor.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT "{name}"')
+                elif info["columns"] == ["wallet_address"] and info["index"]:
+                    cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+    def _explain(self, queries):
+        for label, queryset in queries:
+            self.stdout.write(self.style.SUCCESS(f"--- {label}"))
+            self.stdout.write(queryset.explain(analyze=True, buffers=True))
+            self.stdout.write("")
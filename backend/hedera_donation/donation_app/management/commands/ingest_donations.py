@@ -0,0 +1,48 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from donation_app.ingest import DonationEvent, IngestResult, ingest_donations
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-ingest decoded DonationReceived events from an NDJSON file "
+        "(one {campaign_onchain_id, donor, amount, transaction_hash, timestamp} per line)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file, or - for stdin")
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        stream = sys.stdin if options["path"] == "-" else open(options["path"])
+        total = IngestResult()
+        started = time.monotonic()
+        batch = []
+        try:
+            for line in stream:
+                if not line.strip():
+                    continue
+                batch.append(DonationEvent(**json.loads(line)))
+                if len(batch) >= options["batch_size"]:
+                    self._flush(batch, total)
+                    batch = []
+            self._flush(batch, total)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.monotonic() - started
+        rate = total.received / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{total.received} events: {total.inserted} inserted, {total.updated} updated, "
+            f"{total.skipped} skipped in {elapsed:.1f}s ({rate:.0f}/s)"
+        ))
+
+    def _flush(self, batch, total):
+        result = ingest_donations(batch)
+        for field in ("received", "inserted", "updated", "skipped"):
+            setattr(total, field, getattr(total, field) + getattr(result, field))
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from donation_app.models import ChunkedUpload, ChunkedUploadPart
+
+
+class Command(BaseCommand):
+    help = "Delete chunked uploads that were never completed, with their stored parts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=settings.UPLOAD_EXPIRY,
+            help="Seconds since an upload last received a part (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options["older_than"])
+        stale = ChunkedUpload.objects.filter(status=ChunkedUpload.STATUS_PENDING, updated_at__lt=cutoff)
+        names = list(ChunkedUploadPart.objects.filter(upload__in=stale).values_list("storage_name", flat=True))
+        deleted, _ = stale.delete()
+        for name in names:
+            default_storage.delete(name)
+        self.stdout.write(f"Purged {deleted} objects, {len(names)} stored parts.")
@@ -0,0 +1,49 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+
+from donation_app.models import Campaign, Donation
+
+
+class Command(BaseCommand):
+    help = "Recompute Campaign.current_amount from donations and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--campaign", type=int, help="Only reconcile this campaign id")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing")
+
+    def handle(self, *args, **options):
+        campaign_ids = Campaign.objects.order_by("id").values_list("id", flat=True)
+        if options["campaign"]:
+            campaign_ids = campaign_ids.filter(id=options["campaign"])
+
+        fixed = 0
+        for campaign_id in campaign_ids.iterator():
+            with transaction.atomic():
+                # Lock the row first so concurrent trigger updates queue behind us
+                # and the sum below sees every committed donation.
+                campaign = Campaign.objects.select_for_update().only(
+                    "id", "goal", "current_amount", "percentage_completed"
+                ).get(id=campaign_id)
+                total = Donation.objects.filter(campaign_id=campaign_id).aggregate(
+                    total=Sum("amount")
+                )["total"] or Decimal(0)
+                if total == campaign.current_amount:
+                    continue
+
+                self.stdout.write(
+                    f"Campaign {campaign_id}: current_amount {campaign.current_amount} -> {total}"
+                )
+                fixed += 1
+                if options["dry_run"]:
+                    continue
+
+                fields = {"current_amount": total}
+                if campaign.goal > 0:
+                    fields["percentage_completed"] = round(total / campaign.goal * 100, 2)
+                Campaign.objects.filter(id=campaign_id).update(**fields)
+
+        verb = "would be fixed" if options["dry_run"] else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"{fixed} campaign(s) {verb}."))
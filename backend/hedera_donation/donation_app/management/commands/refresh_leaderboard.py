@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from donation_app.leaderboard import refresh_leaderboard
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-token top donors leaderboard."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and refresh every N seconds (default: run once)",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        while True:
+            upserted, deleted = refresh_leaderboard()
+            self.stdout.write(f"Leaderboard refreshed: {upserted} updated, {deleted} removed.")
+            if interval <= 0:
+                break
+            time.sleep(interval)
@@ -0,0 +1,59 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from donation_app.chain.indexer import CRAWL_KEY, Indexer
+from donation_app.chain.mirror import MirrorNodeClient
+from donation_app.models import LastIndexCrawl
+
+
+class Command(BaseCommand):
+    help = (
+        "Index DonationPlatform events from the mirror node into the database, "
+        "starting at the LastIndexCrawl position. Several workers can run at once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--key", default=CRAWL_KEY, help="LastIndexCrawl key (default: %(default)s)")
+        parser.add_argument("--follow", action="store_true", help="Keep following the chain tip")
+        parser.add_argument("--poll-interval", type=float, default=3)
+        parser.add_argument("--window", type=int, default=300, help="Seconds of chain time per window")
+        parser.add_argument("--concurrency", type=int, default=8, help="Windows fetched in parallel")
+        parser.add_argument("--backfill-window", type=int, default=3600,
+                            help="Seconds per backfill window when the tip falls behind; "
+                                 "run more workers to share the backfill")
+        parser.add_argument("--lag", type=int, default=5,
+                            help="Stay this many seconds behind the tip so the mirror node has caught up")
+        parser.add_argument("--lease", type=int, default=300,
+                            help="Seconds a worker may take to fetch a chunk before others may take its window over")
+
+    def handle(self, *args, **options):
+        if not LastIndexCrawl.objects.filter(key=options["key"]).exists():
+            raise CommandError(f"No LastIndexCrawl row with key {options['key']!r}; create one in the admin first.")
+
+        client = MirrorNodeClient(
+            settings.MIRROR_NODE_URL,
+            settings.HEDERA_CONTRACT_ID,
+            concurrency=options["concurrency"],
+        )
+        indexer = Indexer(
+            client,
+            key=options["key"],
+            window_seconds=options["window"],
+            lookahead=options["concurrency"],
+            backfill_seconds=options["backfill_window"],
+            lag_seconds=options["lag"],
+            lease_seconds=options["lease"],
+            log=self.stdout.write,
+        )
+        started = time.monotonic()
+        try:
+            stats = indexer.run(follow=options["follow"], poll_interval=options["poll_interval"])
+        finally:
+            client.close()
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats.windows} windows, {stats.logs} logs: {stats.donations_inserted} donations inserted, "
+            f"{stats.donations_updated} updated, {stats.campaigns_updated} campaign updates "
+            f"in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,145 @@
+"""
+Serving uploaded files from default_storage.
+
+Answers If-None-Match / If-Modified-Since with 304 and a single-range
+Range header with 206. Uploads are named by their SHA-256 (or, before
+that, a random uuid) and never rewritten, so those get a year-long
+immutable Cache-Control. An image
+variant that is not built yet redirects to its original (see images.py).
+
+With MEDIA_ACCEL_REDIRECT set (e.g. "/protected-media/"), the headers are
+decided here and the bytes left to nginx through X-Accel-Redirect, which
+also handles Range there. Otherwise the body is an async generator that
+reads MEDIA_CHUNK_SIZE bytes at a time: under ASGI Django 4.2 would load a
+FileResponse's whole file into memory before sending it.
+"""
+import mimetypes
+import os
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .images import original_for_variant
+
+# uploads and their image variants ("<sha256>.png", "<sha256>.png.card.webp",
+# or "<uuid>.png" from before content addressing)
+IMMUTABLE_NAME = re.compile(r"^(?:[0-9a-f]{32}|[0-9a-f]{64})(\.[A-Za-z0-9]+)*$")
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _stat(name):
+    try:
+        if not name or not default_storage.exists(name):
+            raise Http404("File not found")
+        size = default_storage.size(name)
+    except SuspiciousFileOperation:
+        raise Http404("File not found")
+    try:
+        # whole seconds, as in HTTP dates
+        modified = int(default_storage.get_modified_time(name).timestamp())
+    except NotImplementedError:
+        modified = None
+    return size, modified
+
+
+def _byte_range(header, size):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to send the
+    whole file (no header, or several ranges), or "unsatisfiable".
+    """
+    match = RANGE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            return "unsatisfiable"
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    if start >= size:
+        return "unsatisfiable"
+    end = min(int(last), size - 1) if last else size - 1
+    if end < start:
+        return None
+    return start, end
+
+
+async def _read(name, start, length):
+    file = await sync_to_async(default_storage.open)(name, "rb")
+    try:
+        if start:
+            await sync_to_async(file.seek)(start)
+        while length > 0:
+            data = await sync_to_async(file.read)(min(settings.MEDIA_CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+    finally:
+        await sync_to_async(file.close)()
+
+
+def _variant_fallback(request, name):
+    """
+    Redirects an image variant that is not built yet to its original.
+    """
+    original = original_for_variant(name)
+    if original is None:
+        raise Http404("File not found")
+    response = HttpResponseRedirect(request.path[: -len(name)] + original)
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def serve_media(request, name, as_attachment=False):
+    try:
+        size, modified = _stat(name)
+    except Http404:
+        return _variant_fallback(request, name)
+    etag = quote_etag(f"{modified or 0:x}-{size:x}")
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=modified)
+    if not_modified is not None:
+        response = not_modified
+    elif settings.MEDIA_ACCEL_REDIRECT:
+        response = HttpResponse()
+        # where the file is under MEDIA_ROOT, which need not be its name
+        location = os.path.relpath(default_storage.path(name), settings.MEDIA_ROOT).replace(os.sep, "/")
+        response["X-Accel-Redirect"] = f"{settings.MEDIA_ACCEL_REDIRECT.rstrip('/')}/{location}"
+    else:
+        byte_range = None
+        # If-Range: only honour the range while the client's copy is current
+        if_range = request.headers.get("If-Range")
+        if if_range is None or if_range.strip() == etag:
+            byte_range = _byte_range(request.headers.get("Range"), size)
+        if byte_range == "unsatisfiable":
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+        elif byte_range is None:
+            response = StreamingHttpResponse(_read(name, 0, size))
+            response["Content-Length"] = str(size)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(_read(name, start, end - start + 1), status=206)
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["Content-Length"] = str(end - start + 1)
+        response["Accept-Ranges"] = "bytes"
+
+    if response.status_code in (200, 206):
+        response["Content-Type"] = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if as_attachment:
+            response["Content-Disposition"] = f'attachment; filename="{name.rsplit("/", 1)[-1]}"'
+    response["ETag"] = etag
+    if modified is not None:
+        response["Last-Modified"] = http_date(modified)
+    if IMMUTABLE_NAME.match(name):
+        response["Cache-Control"] = f"public, max-age={365 * 24 * 60 * 60}, immutable"
+    else:
+        response["Cache-Control"] = "public, no-cache"
+    return response
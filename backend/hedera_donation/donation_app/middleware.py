@@ -0,0 +1,80 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils.decorators import sync_and_async_middleware
+
+from .auth import request_user_id
+from .db.routers import pin_to_primary, replica_reads
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def _routes_to_replica(request):
+    return request.method in SAFE_METHODS and request.path.startswith(settings.DATABASE_REPLICA_PATHS)
+
+
+def _pin_writer(request, response):
+    """
+    After a successful write, keeps the writer's reads on the primary for a
+    while (read-your-writes).
+    """
+    if request.method in SAFE_METHODS or not 200 <= response.status_code < 400:
+        return
+    user_id = request_user_id(request)
+    if user_id is not None:
+        pin_to_primary(user_id)
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response):
+    """
+    Runs read-only API requests inside replica_reads() so the ReplicaRouter
+    may send their queries to a replica.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if _routes_to_replica(request):
+                with replica_reads(request):
+                    return await get_response(request)
+            response = await get_response(request)
+            if request.method not in SAFE_METHODS:
+                await sync_to_async(_pin_writer)(request, response)
+            return response
+    else:
+        def middleware(request):
+            if _routes_to_replica(request):
+                with replica_reads(request):
+                    return get_response(request)
+            response = get_response(request)
+            _pin_writer(request, response)
+            return response
+    return middleware
+
+
+def release_connections():
+    """
+    Hands the current thread's database connections back (to the pool),
+    unless they are inside a transaction, which belongs to whoever opened it.
+    """
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+@sync_and_async_middleware
+def release_connections_middleware(get_response):
+    """
+    Under ASGI, hands the request's database connections back as soon as its
+    response is built rather than after a slow client has read all of it. A
+    streamed body that reads the database opens a connection of its own.
+    """
+    if not iscoroutinefunction(get_response):
+        # WSGI: request_finished closes them when the thread is done anyway
+        return get_response
+
+    async def middleware(request):
+        response = await get_response(request)
+        # on the request's own thread, where its connections live
+        await sync_to_async(release_connections)()
+        return response
+    return middleware
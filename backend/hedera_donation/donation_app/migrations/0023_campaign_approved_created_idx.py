@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0022_alter_campaign_current_amount_alter_campaign_goal_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(condition=models.Q(('approved_by_admin', True)), fields=['-created_at', '-id'], name='campaign_approved_created_idx'),
+        ),
+    ]
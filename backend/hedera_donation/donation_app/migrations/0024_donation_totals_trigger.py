@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# Keeps Campaign.current_amount / percentage_completed in step with the
+# donations table. Donations are also written directly by the on-chain
+# worker, so this lives in the database rather than in Django signals.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION donation_app_apply_donation_delta(p_campaign_id bigint, p_delta numeric)
+RETURNS void AS $$
+BEGIN
+    IF p_delta = 0 THEN
+        RETURN;
+    END IF;
+    UPDATE donation_app_campaign
+    SET current_amount = current_amount + p_delta,
+        percentage_completed = CASE
+            WHEN goal > 0 THEN ROUND((current_amount + p_delta) / goal * 100, 2)
+            ELSE percentage_completed
+        END
+    WHERE id = p_campaign_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION donation_app_donation_totals()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM donation_app_apply_donation_delta(NEW.campaign_id, NEW.amount);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM donation_app_apply_donation_delta(OLD.campaign_id, -OLD.amount);
+    ELSIF OLD.campaign_id = NEW.campaign_id THEN
+        PERFORM donation_app_apply_donation_delta(NEW.campaign_id, NEW.amount - OLD.amount);
+    ELSE
+        PERFORM donation_app_apply_donation_delta(OLD.campaign_id, -OLD.amount);
+        PERFORM donation_app_apply_donation_delta(NEW.campaign_id, NEW.amount);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER donation_app_donation_totals
+AFTER INSERT OR DELETE OR UPDATE OF amount, campaign_id ON donation_app_donation
+FOR EACH ROW EXECUTE FUNCTION donation_app_donation_totals();
+
+UPDATE donation_app_campaign c
+SET current_amount = COALESCE(
+    (SELECT SUM(d.amount) FROM donation_app_donation d WHERE d.campaign_id = c.id), 0
+);
+
+UPDATE donation_app_campaign
+SET percentage_completed = ROUND(current_amount / goal * 100, 2)
+WHERE goal > 0;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS donation_app_donation_totals ON donation_app_donation;
+DROP FUNCTION IF EXISTS donation_app_donation_totals();
+DROP FUNCTION IF EXISTS donation_app_apply_donation_delta(bigint, numeric);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0023_campaign_approved_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0024_donation_totals_trigger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonorLeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=40)),
+                ('donation_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('token', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='donation_app.token')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='donation_app.hederauser')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-total_amount'], name='leaderboard_total_idx'), models.Index(fields=['token', '-total_amount'], name='leaderboard_token_total_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='donorleaderboardentry',
+            constraint=models.UniqueConstraint(fields=('token', 'user'), name='unique_leaderboard_token_user'),
+        ),
+    ]
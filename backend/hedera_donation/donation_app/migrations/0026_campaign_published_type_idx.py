@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0025_donorleaderboardentry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(condition=models.Q(('approved_by_admin', True), ('status', 'PUBLISHED')), fields=['campaign_type', 'id'], name='campaign_published_type_idx'),
+        ),
+    ]
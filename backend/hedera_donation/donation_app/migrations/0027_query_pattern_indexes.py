@@ -0,0 +1,79 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:13
+
+from django.db import migrations, models
+from django.db.models import Count, Exists, Min, OuterRef
+
+
+def merge_duplicate_wallets(apps, schema_editor):
+    """
+    Folds users sharing a wallet_address into the oldest of them, so that
+    the column can become unique: their campaigns and donations move to it
+    (a donation it already has is dropped as the duplicate it is) and their
+    leaderboard entries are deleted, for refresh_leaderboard to rebuild.
+    """
+    HederaUser = apps.get_model('donation_app', 'HederaUser')
+    Campaign = apps.get_model('donation_app', 'Campaign')
+    Donation = apps.get_model('donation_app', 'Donation')
+    DonorLeaderboardEntry = apps.get_model('donation_app', 'DonorLeaderboardEntry')
+
+    duplicated = (
+        HederaUser.objects.values('wallet_address')
+        .annotate(users=Count('id'), keep=Min('id'))
+        .filter(users__gt=1)
+    )
+    for wallet in list(duplicated):
+        keep = wallet['keep']
+        others = HederaUser.objects.filter(wallet_address=wallet['wallet_address']).exclude(id=keep)
+        for other in others.values_list('id', flat=True):
+            kept_donation = Donation.objects.filter(
+                user_id=keep, campaign_id=OuterRef('campaign_id'), transaction_hash=OuterRef('transaction_hash'),
+            )
+            Donation.objects.filter(user_id=other).filter(Exists(kept_donation)).delete()
+            Donation.objects.filter(user_id=other).update(user_id=keep)
+        Campaign.objects.filter(organizer__in=others).update(organizer_id=keep)
+        DonorLeaderboardEntry.objects.filter(user__in=others).delete()
+        others.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0026_campaign_published_type_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_wallets, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='hederauser',
+            name='wallet_address',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(condition=models.Q(('approved_by_admin', True), ('goal__gt', 0)), fields=['-percentage_completed'], name='campaign_top_progress_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['organizer', '-updated_at'], name='campaign_organizer_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(condition=models.Q(('approved_by_admin', True), ('onchain_id__isnull', True)), fields=['status'], name='campaign_unpublished_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['onchain_id'], name='campaign_onchain_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['campaign', '-date', '-id'], name='donation_campaign_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['user', '-date', '-id'], name='donation_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['transaction_hash'], name='donation_tx_hash_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+from importlib import import_module
+
+from django.db import migrations
+
+row_triggers = import_module('donation_app.migrations.0024_donation_totals_trigger')
+
+# Replace the per-row totals trigger from 0024 with statement-level triggers
+# over transition tables: a bulk insert of N donations now costs one UPDATE
+# per touched campaign instead of N single-row UPDATEs.
+UPDATE_FROM_DELTAS = """
+        UPDATE donation_app_campaign c
+        SET current_amount = c.current_amount + d.amount,
+            percentage_completed = CASE
+                WHEN c.goal > 0 THEN ROUND((c.current_amount + d.amount) / c.goal * 100, 2)
+                ELSE c.percentage_completed
+            END
+        FROM (
+            SELECT campaign_id, SUM(amount) AS amount FROM ({rows}) r GROUP BY campaign_id
+        ) d
+        WHERE c.id = d.campaign_id AND d.amount <> 0;
+"""
+
+CREATE_TRIGGERS = f"""
+DROP TRIGGER IF EXISTS donation_app_donation_totals ON donation_app_donation;
+DROP FUNCTION IF EXISTS donation_app_donation_totals();
+DROP FUNCTION IF EXISTS donation_app_apply_donation_delta(bigint, numeric);
+
+CREATE FUNCTION donation_app_donation_totals()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+{UPDATE_FROM_DELTAS.format(rows="SELECT campaign_id, amount FROM new_rows")}
+    ELSIF TG_OP = 'DELETE' THEN
+{UPDATE_FROM_DELTAS.format(rows="SELECT campaign_id, -amount AS amount FROM old_rows")}
+    ELSE
+{UPDATE_FROM_DELTAS.format(rows="SELECT campaign_id, amount FROM new_rows UNION ALL SELECT campaign_id, -amount FROM old_rows")}
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER donation_app_donation_totals_insert
+AFTER INSERT ON donation_app_donation
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION donation_app_donation_totals();
+
+CREATE TRIGGER donation_app_donation_totals_update
+AFTER UPDATE ON donation_app_donation
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION donation_app_donation_totals();
+
+CREATE TRIGGER donation_app_donation_totals_delete
+AFTER DELETE ON donation_app_donation
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION donation_app_donation_totals();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS donation_app_donation_totals_insert ON donation_app_donation;
+DROP TRIGGER IF EXISTS donation_app_donation_totals_update ON donation_app_donation;
+DROP TRIGGER IF EXISTS donation_app_donation_totals_delete ON donation_app_donation;
+DROP FUNCTION IF EXISTS donation_app_donation_totals();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0027_query_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS + row_triggers.CREATE_TRIGGER),
+    ]
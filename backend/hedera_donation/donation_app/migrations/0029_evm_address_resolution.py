@@ -0,0 +1,27 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0028_donation_totals_statement_trigger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvmAddressMapping',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('evm_address', models.CharField(max_length=42, unique=True)),
+                ('account_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='hederauser',
+            name='evm_address',
+            field=models.CharField(blank=True, db_index=True, max_length=42, null=True),
+        ),
+    ]
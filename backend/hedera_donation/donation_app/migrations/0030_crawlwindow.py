@@ -0,0 +1,37 @@
+# Generated by Django 4.2.17 on 2026-10-18 09:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0029_evm_address_resolution'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlWindow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_ns', models.BigIntegerField()),
+                ('end_ns', models.BigIntegerField(blank=True, null=True)),
+                ('position_ns', models.BigIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('crawl', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='windows', to='donation_app.lastindexcrawl')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='crawlwindow',
+            constraint=models.UniqueConstraint(fields=('crawl', 'start_ns'), name='unique_crawl_window_start'),
+        ),
+        migrations.AddConstraint(
+            model_name='crawlwindow',
+            constraint=models.UniqueConstraint(condition=models.Q(('end_ns__isnull', True)), fields=('crawl',), name='unique_crawl_tip_window'),
+        ),
+        migrations.AddConstraint(
+            model_name='crawlwindow',
+            constraint=models.CheckConstraint(check=models.Q(('position_ns__gte', models.F('start_ns')), models.Q(('end_ns__isnull', True), ('position_ns__lte', models.F('end_ns')), _connector='OR')), name='crawl_window_position_in_range'),
+        ),
+    ]
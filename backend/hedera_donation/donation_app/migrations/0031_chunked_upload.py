@@ -0,0 +1,51 @@
+# Generated by Django 4.2.17 on 2026-10-18 10:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0030_crawlwindow'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChunkedUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('original_name', models.CharField(max_length=255)),
+                ('file_name', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField()),
+                ('part_size', models.IntegerField()),
+                ('expected_sha256', models.CharField(blank=True, max_length=64, null=True)),
+                ('sha256', models.CharField(blank=True, max_length=64, null=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('COMPLETE', 'Complete')], default='PENDING', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='donation_app.hederauser')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ChunkedUploadPart',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.IntegerField()),
+                ('size', models.IntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('storage_name', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parts', to='donation_app.chunkedupload')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='chunkeduploadpart',
+            constraint=models.UniqueConstraint(fields=('upload', 'number'), name='unique_upload_part_number'),
+        ),
+        migrations.AddIndex(
+            model_name='chunkedupload',
+            index=models.Index(fields=['status', 'updated_at'], name='upload_status_updated_idx'),
+        ),
+    ]
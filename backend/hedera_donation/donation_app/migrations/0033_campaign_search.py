@@ -0,0 +1,76 @@
+# Generated by Django 4.2.17 on 2026-10-18 10:21
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+SEARCH_VECTOR = """
+    setweight(to_tsvector('english', coalesce({row}.title, '')), 'A')
+    || setweight(to_tsvector('english', coalesce({row}.description, '')), 'B')
+"""
+
+# Recomputes search_vector whenever title or description change. Any other
+# write keeps the stored vector, whatever value the statement carried.
+CREATE_TRIGGER = f"""
+CREATE FUNCTION donation_app_campaign_search_vector()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT'
+       OR NEW.title IS DISTINCT FROM OLD.title
+       OR NEW.description IS DISTINCT FROM OLD.description THEN
+        NEW.search_vector := {SEARCH_VECTOR.format(row="NEW")};
+    ELSE
+        NEW.search_vector := OLD.search_vector;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER donation_app_campaign_search_vector
+BEFORE INSERT OR UPDATE ON donation_app_campaign
+FOR EACH ROW EXECUTE FUNCTION donation_app_campaign_search_vector();
+
+UPDATE donation_app_campaign c SET search_vector = {SEARCH_VECTOR.format(row="c")};
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS donation_app_campaign_search_vector ON donation_app_campaign;
+DROP FUNCTION IF EXISTS donation_app_campaign_search_vector();
+"""
+
+# Typo tolerance and title autocomplete need pg_trgm, a contrib extension
+# that some Postgres builds leave out; search.py checks for it at runtime.
+CREATE_TRIGRAM_INDEX = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS campaign_title_trgm_idx ON donation_app_campaign
+            USING gin (title gin_trgm_ops) WHERE approved_by_admin;
+    END IF;
+END;
+$$;
+"""
+
+DROP_TRIGRAM_INDEX = "DROP INDEX IF EXISTS campaign_title_trgm_idx;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0032_stored_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('approved_by_admin', True)), fields=['search_vector'], name='campaign_search_idx'),
+        ),
+        migrations.RunSQL(CREATE_TRIGRAM_INDEX, DROP_TRIGRAM_INDEX),
+    ]
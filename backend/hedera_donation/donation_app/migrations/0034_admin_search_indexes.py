@@ -0,0 +1,37 @@
+# Generated by Django 4.2.17 on 2026-10-18 10:32
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    # CREATE/DROP INDEX CONCURRENTLY: the tables stay writable while the
+    # indexes build, which cannot happen inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('donation_app', '0033_campaign_search'),
+    ]
+
+    operations = [
+        # the full index is built before the partial one goes, so
+        # /campaigns/search always has one
+        AddIndexConcurrently(
+            model_name='campaign',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='campaign_fulltext_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='campaign',
+            name='campaign_search_idx',
+        ),
+        AddIndexConcurrently(
+            model_name='donation',
+            index=models.Index(fields=['-date', '-id'], name='donation_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='hederauser',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('username'), name='text_pattern_ops'), name='user_username_prefix_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-18 10:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donation_app', '0034_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crawlwindow',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,4 +1,10 @@
+import uuid
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Round, Upper
 
 class HederaUser(models.Model):
     username = models.CharField(
@@ -6,7 +12,8 @@ class HederaUser(models.Model):
     email = models.EmailField(unique=True, blank=True, null=True)
     is_active = models.BooleanField(default=True)
     date_joined = models.DateTimeField(auto_now_add=True)
-    wallet_address = models.CharField(max_length=255)
+    wallet_address = models.CharField(max_length=255, unique=True)
+    evm_address = models.CharField(max_length=42, blank=True, null=True, db_index=True)
     name = models.CharField(max_length=255, blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
     facebook = models.CharField(blank=True, null=True)
@@ -17,6 +24,13 @@ class HederaUser(models.Model):
     def __str__(self):
         return self.username or "Anonymous"
 
+    class Meta:
+        indexes = [
+            # admin search by username prefix, in any case; wallet prefixes
+            # use the varchar_pattern_ops index that comes with unique=True
+            models.Index(OpClass(Upper('username'), name='text_pattern_ops'), name='user_username_prefix_idx'),
+        ]
+
     
 class CampaignType(models.Model):
     name = models.CharField(max_length=255)
@@ -36,6 +50,17 @@ class Token(models.Model):
         return f"{self.name} ({self.symbol})"
 
 
+class CampaignQuerySet(models.QuerySet):
+    def summaries(self):
+        """
+        Card-sized projection for leaderboards and related campaign blocks.
+        """
+        return self.only(
+            "id", "title", "description", "image", "percentage_completed",
+            "status", "created_at", "campaign_type",
+        )
+
+
 class Campaign(models.Model):
     STATUS_NEW = 'NEW'
     STATUS_PENDING = 'PENDING'
@@ -67,12 +92,64 @@ class Campaign(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_NEW)
     transaction_hash_create = models.CharField(max_length=255, blank=True, null=True)
     transaction_hash_withdrawn = models.CharField(max_length=255, blank=True, null=True)
+    # weighted title (A) and description (B) lexemes, kept by a trigger (see search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = CampaignQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='campaign_approved_created_idx',
+                condition=models.Q(approved_by_admin=True),
+            ),
+            models.Index(
+                fields=['campaign_type', 'id'],
+                name='campaign_published_type_idx',
+                condition=models.Q(approved_by_admin=True, status='PUBLISHED'),
+            ),
+            # /top-campaigns
+            models.Index(
+                fields=['-percentage_completed'],
+                name='campaign_top_progress_idx',
+                condition=models.Q(approved_by_admin=True, goal__gt=0),
+            ),
+            # /user/campaigns
+            models.Index(fields=['organizer', '-updated_at'], name='campaign_organizer_updated_idx'),
+            # worker: approved campaigns still waiting to be published on-chain
+            models.Index(
+                fields=['status'],
+                name='campaign_unpublished_idx',
+                condition=models.Q(approved_by_admin=True, onchain_id__isnull=True),
+            ),
+            models.Index(fields=['onchain_id'], name='campaign_onchain_id_idx'),
+            # /campaigns/search, and the admin's search of all campaigns
+            GinIndex(fields=['search_vector'], name='campaign_fulltext_idx'),
+        ]
 
+    # kept by the donation totals trigger (migration 0028)
+    TRIGGER_FIELDS = ("current_amount", "percentage_completed")
 
     def save(self, *args, **kwargs):
-        if self.goal > 0:
-            self.percentage_completed = (self.current_amount / self.goal) * 100
+        if self._state.adding:
+            if self.goal > 0:
+                self.percentage_completed = round(self.current_amount / self.goal * 100, 2)
+            return super().save(*args, **kwargs)
+        # an existing row: never write back totals loaded before later donations
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.TRIGGER_FIELDS
+            ]
+            kwargs["update_fields"] = update_fields
         super().save(*args, **kwargs)
+        if "goal" in update_fields:
+            Campaign.objects.filter(pk=self.pk, goal__gt=0).update(
+                percentage_completed=Round(F("current_amount") / F("goal") * 100, 2),
+            )
+        self.refresh_from_db(fields=self.TRIGGER_FIELDS)
 
     def __str__(self):
         return self.title
@@ -100,6 +177,13 @@ class Donation(models.Model):
                 name='unique_campaign_user_transaction'
             )
         ]
+        indexes = [
+            models.Index(fields=['campaign', '-date', '-id'], name='donation_campaign_date_idx'),
+            models.Index(fields=['user', '-date', '-id'], name='donation_user_date_idx'),
+            models.Index(fields=['transaction_hash'], name='donation_tx_hash_idx'),
+            # admin changelist, newest first
+            models.Index(fields=['-date', '-id'], name='donation_date_idx'),
+        ]
 
 
 
@@ -110,4 +194,165 @@ class LastIndexCrawl(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.key}: {self.value}"
\ No newline at end of file
+        return f"{self.key}: {self.value}"
+
+
+class CrawlWindow(models.Model):
+    """
+    A disjoint slice (start_ns, end_ns] of consensus time for one crawl key,
+    indexed up to position_ns. The window with a null end_ns follows the live
+    tip; bounded windows are backfill claimed by workers with SKIP LOCKED.
+    A worker leases the window it fetches until claimed_until, holding no
+    lock meanwhile. The contiguous prefix is folded back into
+    LastIndexCrawl.value (see chain/indexer.py).
+    """
+    crawl = models.ForeignKey(LastIndexCrawl, on_delete=models.CASCADE, related_name='windows')
+    start_ns = models.BigIntegerField()
+    end_ns = models.BigIntegerField(null=True, blank=True)
+    position_ns = models.BigIntegerField()
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.crawl.key}: ({self.start_ns}, {self.end_ns or 'tip'}] at {self.position_ns}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['crawl', 'start_ns'], name='unique_crawl_window_start'),
+            models.UniqueConstraint(
+                fields=['crawl'], condition=models.Q(end_ns__isnull=True), name='unique_crawl_tip_window'
+            ),
+            models.CheckConstraint(
+                check=models.Q(position_ns__gte=models.F('start_ns')) & (
+                    models.Q(end_ns__isnull=True) | models.Q(position_ns__lte=models.F('end_ns'))
+                ),
+                name='crawl_window_position_in_range',
+            ),
+        ]
+
+
+class EvmAddressMapping(models.Model):
+    """
+    Mirror-node answers for EVM address -> Hedera account id, so each alias
+    is looked up once. A null account_id records "not found" and is retried
+    after EVM_ADDRESS_NEGATIVE_TTL seconds (see chain/accounts.py).
+    """
+    evm_address = models.CharField(max_length=42, unique=True)
+    account_id = models.CharField(max_length=255, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.evm_address} -> {self.account_id or '?'}"
+
+
+class DonorLeaderboardEntry(models.Model):
+    """
+    Precomputed donation totals per (token, donor), rebuilt by the
+    refresh_leaderboard command so /top-donors never aggregates donations.
+    """
+    token = models.ForeignKey(Token, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    user = models.ForeignKey(HederaUser, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    total_amount = models.DecimalField(max_digits=40, decimal_places=2)
+    donation_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} - {self.total_amount} {self.token.symbol}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['token', 'user'],
+                name='unique_leaderboard_token_user'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['-total_amount'], name='leaderboard_total_idx'),
+            models.Index(fields=['token', '-total_amount'], name='leaderboard_token_total_idx'),
+        ]
+
+
+class ChunkedUpload(models.Model):
+    """
+    A resumable upload: the client sends `size` bytes as numbered parts of
+    `part_size` bytes (the last one shorter), in any order and retrying as
+    needed, then completes it into `file_name` (see uploads.py).
+    """
+    STATUS_PENDING = 'PENDING'
+    STATUS_COMPLETE = 'COMPLETE'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_COMPLETE, 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(HederaUser, on_delete=models.CASCADE, related_name='uploads')
+    original_name = models.CharField(max_length=255)
+    # content-addressed name, set on completion
+    file_name = models.CharField(max_length=255, blank=True, default='')
+    size = models.BigIntegerField()
+    part_size = models.IntegerField()
+    # hex SHA-256 the client expects (optional) and the one computed on completion
+    expected_sha256 = models.CharField(max_length=64, blank=True, null=True)
+    sha256 = models.CharField(max_length=64, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.original_name} ({self.status})"
+
+    @property
+    def part_count(self):
+        return max(1, -(-self.size // self.part_size))
+
+    def part_length(self, number):
+        if number < self.part_count:
+            return self.part_size
+        return self.size - self.part_size * (self.part_count - 1)
+
+    class Meta:
+        indexes = [
+            # purge_uploads: abandoned uploads
+            models.Index(fields=['status', 'updated_at'], name='upload_status_updated_idx'),
+        ]
+
+
+class ChunkedUploadPart(models.Model):
+    upload = models.ForeignKey(ChunkedUpload, on_delete=models.CASCADE, related_name='parts')
+    number = models.IntegerField()
+    size = models.IntegerField()
+    sha256 = models.CharField(max_length=64)
+    # where default_storage put the part's bytes
+    storage_name = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.upload_id} #{self.number}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['upload', 'number'], name='unique_upload_part_number'),
+        ]
+
+
+class StoredBlob(models.Model):
+    """
+    A file in content-addressed storage (see storage.py) and how many
+    campaign and user images refer to it.
+    """
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    size = models.BigIntegerField()
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # last upload of, or change in references to, the blob
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.sha256} ({self.refcount} refs)"
+
+    class Meta:
+        indexes = [
+            # collect_blobs: blobs nothing refers to
+            models.Index(fields=['updated_at'], name='blob_unreferenced_idx', condition=models.Q(refcount=0)),
+        ]
@@ -0,0 +1,79 @@
+import base64
+import binascii
+import json
+from functools import reduce
+
+from django.conf import settings
+from django.db.models import Q
+from ninja.errors import HttpError
+
+
+def encode_cursor(values):
+    """
+    Packs the sort-key values of the last row of a page into an opaque string.
+    """
+    raw = json.dumps([v.isoformat() if hasattr(v, "isoformat") else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise HttpError(400, "Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HttpError(400, "Invalid cursor")
+    return values
+
+
+def clamp_page_size(limit):
+    if limit is None:
+        return settings.API_PAGE_SIZE
+    return max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+
+
+def _seek(queryset, keys, cursor):
+    queryset = queryset.order_by(*[f"-{key}" for key in keys])
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        # (k1, k2, ...) < (v1, v2, ...) expanded into OR-ed prefix equalities
+        clauses = []
+        for i, key in enumerate(keys):
+            equal = {keys[j]: values[j] for j in range(i)}
+            clauses.append(Q(**equal, **{f"{key}__lt": values[i]}))
+        queryset = queryset.filter(reduce(lambda a, b: a | b, clauses))
+    return queryset
+
+
+def _page(rows, keys, limit):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            [last[key] if isinstance(last, dict) else getattr(last, key) for key in keys]
+        )
+    return rows, next_cursor
+
+
+def keyset_paginate(queryset, keys, cursor=None, limit=None):
+    """
+    Keyset (seek) pagination over `keys`, all sorted descending.
+
+    Rows after the cursor are selected with a row-wise "less than" predicate
+    instead of OFFSET, and one extra row is fetched to know whether another
+    page exists, so no COUNT(*) is needed. Returns (rows, next_cursor).
+    """
+    limit = clamp_page_size(limit)
+    rows = list(_seek(queryset, keys, cursor)[: limit + 1])
+    return _page(rows, keys, limit)
+
+
+async def akeyset_paginate(queryset, keys, cursor=None, limit=None):
+    """
+    keyset_paginate() for async views.
+    """
+    limit = clamp_page_size(limit)
+    rows = [row async for row in _seek(queryset, keys, cursor)[: limit + 1]]
+    return _page(rows, keys, limit)
@@ -0,0 +1,63 @@
+import random
+
+from django.db.models import Max, Min
+
+from .cache import get_cache
+from .models import Campaign
+
+BOUNDS_TTL = 300
+
+
+def _published_campaigns(campaign_type_id):
+    return Campaign.objects.filter(
+        campaign_type_id=campaign_type_id,
+        approved_by_admin=True,
+        status=Campaign.STATUS_PUBLISHED,
+    )
+
+
+async def _id_bounds(campaign_type_id):
+    """
+    Lowest and highest published campaign id of a type; both ends are single
+    probes on campaign_published_type_idx, and the pair is cached briefly.
+    """
+    key = f"related:bounds:{campaign_type_id}"
+    cache = get_cache()
+    bounds = await cache.aget(key)
+    if bounds is None:
+        agg = await _published_campaigns(campaign_type_id).aaggregate(lo=Min("id"), hi=Max("id"))
+        bounds = (agg["lo"], agg["hi"])
+        await cache.aset(key, bounds, BOUNDS_TTL)
+    return bounds
+
+
+async def sample_related_campaigns(campaign_id, campaign_type_id, count=3):
+    """
+    Picks up to `count` random published campaigns of `campaign_type_id`
+    without ORDER BY RANDOM(): each pick seeks the first id at or after a
+    random pivot in the type's id range, and the lowest ids fill in when
+    pivots collide or land past the last row. Everything runs as one query.
+    """
+    lo, hi = await _id_bounds(campaign_type_id)
+    if lo is None:
+        return []
+
+    base = _published_campaigns(campaign_type_id).summaries().exclude(id=campaign_id)
+
+    pivots = [random.randint(lo, hi) for _ in range(count)]
+    seeks = [base.filter(id__gte=pivot).order_by("id")[:1] for pivot in pivots]
+    filler = base.order_by("id")[:count]
+    rows = [row async for row in filler.union(*seeks)]
+
+    # Prefer the randomly seeked rows; fall back to the filler ones
+    by_id = {row.id: row for row in rows}
+    seeked_ids = []
+    for pivot in sorted(set(pivots)):
+        match = min((row_id for row_id in by_id if row_id >= pivot), default=None)
+        if match is not None and match not in seeked_ids:
+            seeked_ids.append(match)
+    picked = [by_id[row_id] for row_id in seeked_ids]
+    picked += [row for row in sorted(rows, key=lambda r: r.id) if row.id not in seeked_ids]
+    picked = picked[:count]
+    random.shuffle(picked)
+    return picked
@@ -1,5 +1,7 @@
+from decimal import Decimal
 from typing import List, Optional
 from ninja import Schema
+from pydantic import Field
 
 
 class UserSchema(Schema):
@@ -21,15 +23,22 @@ class TokenSchema(Schema):
     account_id: Optional[str] = None
 
 
+class ImageVariantsSchema(Schema):
+    thumb: str
+    card: str
+    hero: str
+
+
 class CampaignSchema(Schema):
     id: int
     title: Optional[str] = None
     description: Optional[str] = None
     image: Optional[str] = None
-    goal: float
-    current_amount: float
-    progress: float
-    organizer: UserSchema
+    image_variants: Optional[ImageVariantsSchema] = None
+    goal: Optional[float] = None
+    current_amount: Optional[float] = None
+    progress: Optional[float] = None
+    organizer: Optional[UserSchema] = None
     campaign_type: Optional[CampaignTypeSchema] = None
     token: Optional[TokenSchema] = None
     video_link: Optional[str] = None
@@ -65,6 +74,10 @@ class TopDonorSchema(Schema):
     username: str
     totalDonations: str
     initials: str
+    token_id: int
+    token_symbol: str
+    token_decimal: int
+    total_amount: float
 
 
 class TopCampaignSchema(Schema):
@@ -72,23 +85,15 @@ class TopCampaignSchema(Schema):
     title: str
     description: str
     image: str
+    image_variants: Optional[ImageVariantsSchema] = None
     progress: float
     status: str
     date: str
 
 
-class CampaignListSchema(Schema):
-    id: int
-    title: str
-    description: str
-    image: str
-    progress: float
-
-
-class PaginatedCampaignsSchema(Schema):
-    current_page: int
-    total_pages: int
-    campaigns: List[CampaignListSchema]
+class CampaignPageSchema(Schema):
+    items: List[CampaignSchema]
+    next_cursor: Optional[str] = None
 
 
 class UserUpdateSchema(Schema):
@@ -106,12 +111,14 @@ class UserInfoSchema(Schema):
     twitter: Optional[str] = None
     bio: Optional[str] = None
     user_image: Optional[str] = None
+    user_image_variants: Optional[ImageVariantsSchema] = None
 
 
 class DonationHistorySchema(Schema):
     campaign_id: int
     campaign_title: str
     campaign_image: Optional[str] = None
+    campaign_image_variants: Optional[ImageVariantsSchema] = None
     amount: float
     date: str
     transaction_hash:Optional[str] = None
@@ -125,11 +132,39 @@ class CampaignDonationHistorySchema(Schema):
     user_name: Optional[str]
     user_username: Optional[str]
     user_image: Optional[str]
+    user_image_variants: Optional[ImageVariantsSchema] = None
     amount: float
     date: str
     transaction_hash: Optional[str]
 
 
+class DonationHistoryPageSchema(Schema):
+    items: List[DonationHistorySchema]
+    next_cursor: Optional[str] = None
+
+
+class CampaignDonationPageSchema(Schema):
+    items: List[CampaignDonationHistorySchema]
+    next_cursor: Optional[str] = None
+
+
+class TokenDonationTotalSchema(Schema):
+    token_id: int
+    token_symbol: str
+    donation_count: int
+    amount: float
+
+
+class DonationHistorySummarySchema(Schema):
+    donation_count: int
+    totals: List[TokenDonationTotalSchema]
+
+
+class CampaignDonationSummarySchema(Schema):
+    donation_count: int
+    donor_count: int
+    total_amount: float
+
 
 
 class RelatedCampaignSchema(Schema):
@@ -137,6 +172,7 @@ class RelatedCampaignSchema(Schema):
     title: str
     description: str
     image: str
+    image_variants: Optional[ImageVariantsSchema] = None
     progress: float
 
 
@@ -145,6 +181,27 @@ class CampaignDetailResponseSchema(Schema):
     related_campaigns: List[RelatedCampaignSchema]
 
 
+class DonationEventSchema(Schema):
+    campaign_onchain_id: int
+    donor: str
+    amount: Decimal
+    # an EVM hash ("0x...") or a Hedera transaction id ("0.0.1234@1700000000.1")
+    transaction_hash: str = Field(pattern=r"^[0-9A-Za-z.@-]+$", max_length=255)
+    # consensus timestamp in seconds, "1700000000.123456789"
+    timestamp: str = Field(pattern=r"^\d+(\.\d{1,9})?$")
+
+
+class DonationIngestSchema(Schema):
+    events: List[DonationEventSchema]
+
+
+class DonationIngestResultSchema(Schema):
+    received: int
+    inserted: int
+    updated: int
+    skipped: int
+
+
 class LoginSchema(Schema):
     wallet_address: str
 
@@ -155,3 +212,32 @@ class LoginResponseSchema(Schema):
     wallet_address: str
     image: Optional[str]
     name: Optional[str]
+
+
+class UploadStartSchema(Schema):
+    file_name: str
+    size: int
+    # hex SHA-256 of the whole file, checked on completion when given
+    sha256: Optional[str] = None
+
+
+class UploadStatusSchema(Schema):
+    upload_id: str
+    status: str
+    size: int
+    part_size: int
+    part_count: int
+    received_parts: List[int]
+
+
+class UploadPartSchema(Schema):
+    number: int
+    size: int
+    sha256: str
+
+
+class UploadCompleteSchema(Schema):
+    message: str
+    file_name: str
+    file_url: str
+    sha256: str
@@ -0,0 +1,137 @@
+"""
+Campaign search for /campaigns/search.
+
+Approved campaigns match on search_vector, the trigger-maintained tsvector
+of their title (weight A) and description (B), through the GIN index
+campaign_fulltext_idx. Every query word must match; the last one also
+matches as a prefix of a title word, so results follow the user's typing.
+
+With pg_trgm installed, titles whose words are close to the query also
+match (word_similarity over campaign_title_trgm_idx), which forgives
+typos. Ranks add ts_rank and that similarity and are cast to double
+precision, so a rank read back from a cursor compares equal to itself.
+
+Ranking needs every candidate's score, so at most SEARCH_MAX_MATCHES
+candidates are ranked, newest first. Common words fill them from a walk
+down campaign_approved_created_idx, stopped after SEARCH_WALK_ROWS rows
+whatever the planner thinks of the query; only when that walk comes up
+short are the matches collected from the GIN indexes, and then they are
+few. A query costs milliseconds either way.
+"""
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+from ninja.errors import HttpError
+
+from .models import Campaign
+
+SEARCH_CONFIG = "english"
+# words of a query used; the rest are ignored
+MAX_TERMS = 8
+TERM = re.compile(r"[^\W_]+")
+
+# The inner LIMIT can only be served by walking the created_at index, and
+# the match cannot be pushed below it.
+WALK_MATCHES_SQL = """
+SELECT id FROM (
+    SELECT id, title, search_vector FROM donation_app_campaign
+    WHERE approved_by_admin
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s
+) newest
+WHERE search_vector @@ to_tsquery(%s, %s) {trigram}
+LIMIT %s
+"""
+WALK_TRIGRAM_SQL = "OR title %%> %s"
+
+_trigram = {}
+
+
+def has_trigram(alias):
+    """
+    Whether pg_trgm is installed in the database behind `alias`; checked
+    once per process and database.
+    """
+    if alias not in _trigram:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram[alias] = cursor.fetchone() is not None
+    return _trigram[alias]
+
+
+def split_terms(text):
+    return TERM.findall(text.lower())[:MAX_TERMS]
+
+
+def parse_terms(text):
+    terms = split_terms(text)
+    if not terms:
+        raise HttpError(400, "Search query must contain a word")
+    return terms
+
+
+def _tsquery(terms):
+    *words, last = terms
+    # the last word, possibly still being typed: whole anywhere, or a title prefix
+    return " & ".join(words + [f"({last} | {last}:*A)"])
+
+
+def text_query(terms):
+    """
+    The full-text query for `terms`, matched against search_vector.
+    """
+    return SearchQuery(_tsquery(terms), search_type="raw", config=SEARCH_CONFIG)
+
+
+def _walk_matches(alias, tsquery, phrase):
+    sql = WALK_MATCHES_SQL.format(trigram=WALK_TRIGRAM_SQL if phrase else "")
+    params = [settings.SEARCH_WALK_ROWS, SEARCH_CONFIG, tsquery]
+    params += [phrase] if phrase else []
+    with connections[alias].cursor() as cursor:
+        cursor.execute(sql, params + [settings.SEARCH_MAX_MATCHES])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _candidates(queryset, tsquery, phrase):
+    """
+    Ids of up to SEARCH_MAX_MATCHES campaigns of `queryset` matching, and
+    `phrase` if titles can be matched by similarity, else None.
+    """
+    alias = queryset.db
+    if not has_trigram(alias):
+        phrase = None
+    ids = _walk_matches(alias, tsquery, phrase)
+    if len(ids) < settings.SEARCH_MAX_MATCHES:
+        query = SearchQuery(tsquery, search_type="raw", config=SEARCH_CONFIG)
+        matches = Q(search_vector=query)
+        if phrase:
+            matches |= Q(title__trigram_word_similar=phrase)
+        # NULLS LAST is an order no index provides: all matches come from
+        # the GIN indexes, which the walk showed to be few
+        ids = list(
+            queryset.filter(matches)
+            .order_by(F("created_at").desc(nulls_last=True), F("id").desc(nulls_last=True))
+            .values_list("id", flat=True)[: settings.SEARCH_MAX_MATCHES]
+        )
+    return ids, phrase
+
+
+async def match_campaigns(text):
+    """
+    Approved campaigns matching `text`, annotated with `rank`.
+    """
+    terms = parse_terms(text)
+    tsquery = _tsquery(terms)
+    ids, phrase = await sync_to_async(_candidates)(
+        Campaign.objects.filter(approved_by_admin=True), tsquery, " ".join(terms)
+    )
+
+    rank = SearchRank(F("search_vector"), text_query(terms))
+    if phrase:
+        rank = rank + TrigramWordSimilarity(phrase, "title")
+    return Campaign.objects.filter(id__in=ids).annotate(rank=Cast(rank, FloatField()))
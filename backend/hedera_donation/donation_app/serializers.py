@@ -0,0 +1,121 @@
+from django.db.models.functions import Left
+from ninja.errors import HttpError
+
+from .images import image_variants
+
+# List views ship only the start of the description; the detail view has it all.
+DESCRIPTION_EXCERPT_LENGTH = 300
+
+
+def _float(value):
+    return float(value) if value is not None else None
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _nested(*names):
+    def build(*values):
+        return dict(zip(names, values)) if values[0] is not None else None
+    return build
+
+
+def _plain(value):
+    return value
+
+
+# Output key -> (columns read with .values(), builder turning them into the value)
+CAMPAIGN_FIELDS = {
+    "id": (("id",), _plain),
+    "title": (("title",), _plain),
+    "description": (("description",), _plain),
+    "image": (("image",), _plain),
+    "image_variants": (("image",), image_variants),
+    "goal": (("goal",), _float),
+    "current_amount": (("current_amount",), _float),
+    "progress": (("percentage_completed",), _float),
+    "organizer": (
+        ("organizer__id", "organizer__username", "organizer__email"),
+        _nested("id", "username", "email"),
+    ),
+    "campaign_type": (
+        ("campaign_type__id", "campaign_type__name"),
+        _nested("id", "name"),
+    ),
+    "token": (
+        ("token__id", "token__name", "token__symbol", "token__address", "token__account_id"),
+        _nested("id", "name", "symbol", "address", "account_id"),
+    ),
+    "video_link": (("video_link",), _plain),
+    "project_url": (("project_url",), _plain),
+    "created_at": (("created_at",), _isoformat),
+    "updated_at": (("updated_at",), _isoformat),
+    "approved_by_admin": (("approved_by_admin",), _plain),
+    "onchain_id": (("onchain_id",), _plain),
+    "status": (("status",), _plain),
+    "transaction_hash_create": (("transaction_hash_create",), _plain),
+    "transaction_hash_withdrawn": (("transaction_hash_withdrawn",), _plain),
+}
+
+
+def parse_fields(fields):
+    """
+    Turns a `?fields=a,b` query value into the list of campaign keys to emit.
+    `id` is always included.
+    """
+    if not fields:
+        return list(CAMPAIGN_FIELDS)
+    keys = ["id"] + [key.strip() for key in fields.split(",") if key.strip() and key.strip() != "id"]
+    unknown = [key for key in keys if key not in CAMPAIGN_FIELDS]
+    if unknown:
+        raise HttpError(400, f"Unknown fields: {', '.join(unknown)}")
+    return keys
+
+
+class CampaignSerializer:
+    """
+    Builds campaign dicts straight from .values() rows, without instantiating
+    Campaign models, for the given output keys.
+    """
+
+    def __init__(self, keys=None, excerpt=False):
+        self.keys = keys or list(CAMPAIGN_FIELDS)
+        self.excerpt = excerpt
+        self.columns = [column for key in self.keys for column in CAMPAIGN_FIELDS[key][0]]
+
+    def values(self, queryset, *extra):
+        """
+        Projects `queryset` onto the columns needed by the selected keys,
+        plus any `extra` columns the caller needs (e.g. pagination keys).
+        """
+        columns = list(dict.fromkeys(self.columns + list(extra)))
+        if self.excerpt and "description" in columns:
+            columns.remove("description")
+            queryset = queryset.annotate(
+                description_excerpt=Left("description", DESCRIPTION_EXCERPT_LENGTH)
+            )
+            columns.append("description_excerpt")
+        return queryset.values(*columns)
+
+    def serialize(self, row):
+        if self.excerpt and "description_excerpt" in row:
+            row["description"] = row["description_excerpt"]
+        data = {}
+        for key in self.keys:
+            columns, build = CAMPAIGN_FIELDS[key]
+            data[key] = build(*[row[column] for column in columns])
+        return data
+
+    def serialize_instance(self, campaign):
+        """
+        Serializes an already loaded Campaign (e.g. right after create) through
+        the same column mapping, following `a__b` lookups as attributes.
+        """
+        row = {}
+        for column in self.columns:
+            value = campaign
+            for part in column.split("__"):
+                value = getattr(value, part) if value is not None else None
+            row[column] = value
+        return self.serialize(row)
@@ -0,0 +1,83 @@
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+
+from .auth import user_cache
+from .cache import invalidate
+from .models import Campaign, CampaignType, Donation, HederaUser, Token
+from .storage import change_references
+from .summaries import forget_donation_summaries
+
+# Which cached API responses embed data from each model
+INVALIDATION_GROUPS = {
+    Campaign: ("campaigns",),
+    Donation: ("campaigns", "donors"),
+    Token: ("tokens", "campaigns", "donors"),
+    CampaignType: ("campaign_types", "campaigns"),
+    HederaUser: ("campaigns", "donors"),
+}
+
+
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate(*INVALIDATION_GROUPS[sender])
+
+
+for model in INVALIDATION_GROUPS:
+    post_save.connect(invalidate_cached_responses, sender=model, dispatch_uid=f"cache_{model.__name__}_save")
+    post_delete.connect(invalidate_cached_responses, sender=model, dispatch_uid=f"cache_{model.__name__}_delete")
+
+
+def evict_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+post_save.connect(evict_cached_user, sender=HederaUser, dispatch_uid="auth_user_cache_save")
+post_delete.connect(evict_cached_user, sender=HederaUser, dispatch_uid="auth_user_cache_delete")
+
+
+def forget_cached_summaries(sender, instance, **kwargs):
+    forget_donation_summaries(campaign_ids=[instance.campaign_id], user_ids=[instance.user_id])
+
+
+post_save.connect(forget_cached_summaries, sender=Donation, dispatch_uid="donation_summary_save")
+post_delete.connect(forget_cached_summaries, sender=Donation, dispatch_uid="donation_summary_delete")
+
+
+
+# Stored-file refcounts (see storage.py) follow the image each campaign and
+# user refers to; the value loaded is kept to see what a save replaces.
+DEFERRED_IMAGE = object()
+
+
+def remember_image(sender, instance, **kwargs):
+    instance._stored_image = instance.__dict__.get("image", DEFERRED_IMAGE)
+
+
+def stored_image(instance, update_fields=None):
+    if instance._stored_image is DEFERRED_IMAGE and instance.pk is not None:
+        if update_fields is None or "image" in update_fields:
+            instance._stored_image = type(instance).objects.filter(pk=instance.pk).values_list("image", flat=True).first()
+    return instance._stored_image
+
+
+def load_replaced_image(sender, instance, update_fields=None, **kwargs):
+    stored_image(instance, update_fields)
+
+
+def count_image_reference(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and "image" not in update_fields:
+        return
+    previous = None if created else instance._stored_image
+    if instance.image != previous:
+        change_references(old_urls=[previous], new_urls=[instance.image])
+    instance._stored_image = instance.image
+
+
+def release_image_reference(sender, instance, **kwargs):
+    change_references(old_urls=[stored_image(instance)])
+
+
+for model in (Campaign, HederaUser):
+    post_init.connect(remember_image, sender=model, dispatch_uid=f"blob_{model.__name__}_init")
+    pre_save.connect(load_replaced_image, sender=model, dispatch_uid=f"blob_{model.__name__}_pre_save")
+    post_save.connect(count_image_reference, sender=model, dispatch_uid=f"blob_{model.__name__}_save")
+    # before the row goes, while a deferred image can still be read
+    pre_delete.connect(release_image_reference, sender=model, dispatch_uid=f"blob_{model.__name__}_delete")
@@ -0,0 +1,15 @@
+'use strict';
+{
+    // Reloads the changelist filtered on the value picked in an
+    // AutocompleteFilter (donation_app/changelists.py), back on page one.
+    django.jQuery(document).on('change', '.autocomplete-filter select', function() {
+        const params = new URLSearchParams(window.location.search);
+        params.delete('p');
+        if (this.value) {
+            params.set(this.name, this.value);
+        } else {
+            params.delete(this.name);
+        }
+        window.location.search = params.toString();
+    });
+}
@@ -0,0 +1,168 @@
+"""
+Content-addressed storage for uploads (the default storage, see STORAGES).
+
+save_content() streams a file to a temporary name under MEDIA_ROOT while
+hashing it, then keeps one copy per SHA-256 at "ab/cd/<sha256>": two
+levels of 256 directories keep each of them small. The blob's name is
+"<sha256><ext>"; the extension only picks the Content-Type, so the same
+bytes uploaded as .jpg and .jpeg are stored once. When the blob already
+exists the temporary file is dropped instead of moved into place.
+
+Moving into place is an os.replace() on the same filesystem, which is
+atomic: API replicas sharing MEDIA_ROOT on one volume may save the same
+content at once and both end up with one complete file, without locks.
+
+A StoredBlob row per blob counts the campaign and user images that refer
+to it (kept by signals.py). manage.py collect_blobs deletes blobs nothing
+has referred to for BLOB_GC_GRACE seconds, with their image variants.
+save_content() touches the row before looking for the file, so a blob is
+never collected under a concurrent upload of the same content.
+
+Other names are saved as by FileSystemStorage: those derived from a blob
+("<sha256>.png.card.webp") in the blob's directory, the rest (upload parts,
+files from before content addressing) where they say.
+"""
+import hashlib
+import os
+import re
+import tempfile
+from collections import Counter
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest, Now
+
+from .models import Campaign, HederaUser, StoredBlob
+from .uploads import FILE_URL_ROOT
+
+CONTENT_NAME = re.compile(r"^(?P<sha256>[0-9a-f]{64})(?P<extension>\.[A-Za-z0-9]+)?$")
+DERIVED_NAME = re.compile(r"^(?P<sha256>[0-9a-f]{64})\.[^/\\]+$")
+SHARDED_PATH = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/(?P<name>[0-9a-f]{64}\.[^/]+)$")
+EXTENSION = re.compile(r"^\.[A-Za-z0-9]+$")
+INCOMING_DIR = ".incoming"
+
+
+class ContentMismatch(ValueError):
+    pass
+
+
+def blob_for_url(url):
+    """
+    The SHA-256 of the blob an image URL points at, or None.
+    """
+    prefix = f"{FILE_URL_ROOT}/"
+    match = CONTENT_NAME.match(url[len(prefix):]) if url and url.startswith(prefix) else None
+    return match.group("sha256") if match else None
+
+
+def change_references(old_urls=(), new_urls=()):
+    """
+    Moves blob refcounts from the images in `old_urls` to those in
+    `new_urls`, within the caller's transaction.
+    """
+    deltas = Counter()
+    deltas.subtract(filter(None, map(blob_for_url, old_urls)))
+    deltas.update(filter(None, map(blob_for_url, new_urls)))
+    for sha256, delta in deltas.items():
+        if delta:
+            StoredBlob.objects.filter(sha256=sha256).update(
+                refcount=Greatest(F("refcount") + delta, Value(0)), updated_at=Now()
+            )
+
+
+def recount_references():
+    """
+    Recomputes every refcount from the campaign and user images, for
+    references changed without signals (queryset.update(), raw SQL).
+    """
+    counts = Counter()
+    for model in (Campaign, HederaUser):
+        urls = model.objects.filter(image__startswith=f"{FILE_URL_ROOT}/").values_list("image", flat=True)
+        counts.update(filter(None, map(blob_for_url, urls.iterator())))
+    with transaction.atomic():
+        StoredBlob.objects.exclude(sha256__in=list(counts)).exclude(refcount=0).update(refcount=0, updated_at=Now())
+        for sha256, count in counts.items():
+            StoredBlob.objects.filter(sha256=sha256).exclude(refcount=count).update(refcount=count, updated_at=Now())
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    @staticmethod
+    def _directory(sha256):
+        return f"{sha256[:2]}/{sha256[2:4]}"
+
+    def path(self, name):
+        match = CONTENT_NAME.match(name)
+        if match:
+            name = f"{self._directory(match.group('sha256'))}/{match.group('sha256')}"
+        else:
+            match = DERIVED_NAME.match(name)
+            if match:
+                name = f"{self._directory(match.group('sha256'))}/{name}"
+        return super().path(name)
+
+    def get_available_name(self, name, max_length=None):
+        # saving a blob again is a no-op, never a renamed copy
+        if CONTENT_NAME.match(name):
+            return name
+        return super().get_available_name(name, max_length)
+
+    def _save(self, name, content):
+        if CONTENT_NAME.match(name):
+            return self.save_content(content, CONTENT_NAME.match(name).group("extension") or "")
+        stored = super()._save(name, content)
+        # FileSystemStorage answers with the path on disk, sharded or not
+        match = SHARDED_PATH.match(stored.replace(os.sep, "/"))
+        return match.group("name") if match else stored
+
+    def save_content(self, content, extension="", sha256=None):
+        """
+        Stores `content` (a File) under its SHA-256 and returns its name,
+        "<sha256><extension>". With `sha256`, content hashing to anything
+        else raises ContentMismatch and stores nothing.
+        """
+        if not EXTENSION.match(extension):
+            extension = ""
+        incoming = os.path.join(self.location, INCOMING_DIR)
+        os.makedirs(incoming, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=incoming)
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(handle, "wb") as file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    size += len(chunk)
+                    file.write(chunk)
+            if sha256 is not None and digest.hexdigest() != sha256:
+                raise ContentMismatch(f"Content hashes to {digest.hexdigest()}, not {sha256}")
+            sha256 = digest.hexdigest()
+            name = f"{sha256}{extension}"
+
+            StoredBlob.objects.bulk_create(
+                [StoredBlob(sha256=sha256, size=size)],
+                update_conflicts=True, unique_fields=["sha256"], update_fields=["updated_at"],
+            )
+            path = self.path(name)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temporary, self.file_permissions_mode)
+                os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        return name
+
+    def delete_blob(self, sha256):
+        """
+        Deletes a blob and the files derived from it (image variants).
+        """
+        directory = self._directory(sha256)
+        try:
+            _, files = self.listdir(directory)
+        except FileNotFoundError:
+            return
+        for file in files:
+            if file == sha256 or file.startswith(f"{sha256}."):
+                self.delete(f"{directory}/{file}")
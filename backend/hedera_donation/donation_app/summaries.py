@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .cache import get_cache
+from .models import Donation
+
+
+def _campaign_key(campaign_id):
+    return f"donations:summary:campaign:{campaign_id}"
+
+
+def _user_key(user_id):
+    return f"donations:summary:user:{user_id}"
+
+
+async def campaign_donation_summary(campaign):
+    """
+    Donation and donor counts for `campaign`, cached for
+    DONATION_SUMMARY_TTL seconds. The total is the trigger-maintained
+    current_amount, so it is never stale.
+    """
+    cache = get_cache()
+    key = _campaign_key(campaign.id)
+    counts = await cache.aget(key)
+    if counts is None:
+        counts = await Donation.objects.filter(campaign_id=campaign.id).aaggregate(
+            donation_count=Count("id"), donor_count=Count("user_id", distinct=True)
+        )
+        await cache.aset(key, counts, settings.DONATION_SUMMARY_TTL)
+    return {**counts, "total_amount": float(campaign.current_amount)}
+
+
+async def user_donation_summary(user_id):
+    """
+    A donor's donation count and per-token totals, cached for
+    DONATION_SUMMARY_TTL seconds.
+    """
+    cache = get_cache()
+    key = _user_key(user_id)
+    summary = await cache.aget(key)
+    if summary is None:
+        totals = (
+            Donation.objects.filter(user_id=user_id)
+            .values("campaign__token_id", "campaign__token__symbol")
+            .annotate(donation_count=Count("id"), amount=Sum("amount"))
+            .order_by("campaign__token_id")
+        )
+        summary = {
+            "donation_count": 0,
+            "totals": [],
+        }
+        async for row in totals:
+            summary["donation_count"] += row["donation_count"]
+            summary["totals"].append({
+                "token_id": row["campaign__token_id"],
+                "token_symbol": row["campaign__token__symbol"],
+                "donation_count": row["donation_count"],
+                "amount": float(row["amount"]),
+            })
+        await cache.aset(key, summary, settings.DONATION_SUMMARY_TTL)
+    return summary
+
+
+def forget_donation_summaries(campaign_ids=(), user_ids=()):
+    """
+    Drops the cached summaries of the given campaigns and donors once the
+    current transaction commits.
+    """
+    keys = [_campaign_key(campaign_id) for campaign_id in set(campaign_ids)]
+    keys += [_user_key(user_id) for user_id in set(user_ids)]
+    if keys:
+        transaction.on_commit(lambda: get_cache().delete_many(keys))
@@ -1,3 +1,1298 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
 
-# Create your tests here.
+import psycopg2
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from hedera_donation.asgi import ConcurrencyLimit
+
+from .auth import generate_jwt_token, user_cache
+from .chain.accounts import AccountResolver, account_id_to_long_zero, long_zero_to_account_id
+from .chain.decode import CAMPAIGN_CLOSED, CAMPAIGN_PUBLISHED, DONATION_RECEIVED, concat_batches, decode_batch
+from .chain.indexer import CRAWL_KEY, Indexer, IndexerStats, claim_window, crawl_position, fold_windows
+from .chain.mirror import MirrorNodeClient, format_timestamp, parse_timestamp
+from .changelists import EstimatedCountPaginator
+from .db.base import number_placeholders
+from .db.pool import ConnectionPool, PoolTimeout
+from .db.routers import ReplicaRouter, ReplicaSet, replica_reads, replicas
+from .images import VARIANTS, build_variants, image_variants
+from .search import has_trigram
+from .ingest import DonationEvent, ingest_donations
+from .leaderboard import format_token_amount, refresh_leaderboard
+from .models import (
+    Campaign, CampaignType, CrawlWindow, Donation, DonorLeaderboardEntry, HederaUser, LastIndexCrawl, StoredBlob, Token,
+)
+
+
+# Endpoint tests read from the primary even when POSTGRES_REPLICA_HOSTS is set
+@override_settings(API_CACHE_ENABLED=False, DATABASE_REPLICAS=[])
+class EndpointQueryCountTests(TestCase):
+    """
+    Pins the number of SQL queries each endpoint issues, so that an N+1
+    regression fails here instead of in production.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = HederaUser.objects.create(username="alice", wallet_address="0.0.1001", name="Alice")
+        cls.donor = HederaUser.objects.create(username="bob", wallet_address="0.0.1002", name="Bob")
+        cls.token = Token.objects.create(name="Token", symbol="TKN", address="0x1", decimal=8)
+        cls.campaign_type = CampaignType.objects.create(name="Health")
+        cls.campaigns = [
+            Campaign.objects.create(
+                title=f"Campaign {i}",
+                description="Description",
+                goal=100,
+                organizer=cls.user,
+                campaign_type=cls.campaign_type,
+                token=cls.token,
+                approved_by_admin=True,
+                status=Campaign.STATUS_PUBLISHED,
+            )
+            for i in range(5)
+        ]
+        for i, campaign in enumerate(cls.campaigns):
+            Donation.objects.create(campaign=campaign, user=cls.donor, amount=10, transaction_hash=f"0x{i}")
+        cls.auth = {"HTTP_AUTHORIZATION": f"Bearer {generate_jwt_token(cls.user)}"}
+        cls.donor_auth = {"HTTP_AUTHORIZATION": f"Bearer {generate_jwt_token(cls.donor)}"}
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+
+    def assertGetQueries(self, num, url, **extra):
+        with self.assertNumQueries(num):
+            response = self.client.get(url, **extra)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_list_campaigns(self):
+        response = self.assertGetQueries(1, "/api/campaigns")
+        self.assertEqual(len(response.json()["items"]), 5)
+
+    def test_list_campaigns_fields(self):
+        response = self.assertGetQueries(1, "/api/campaigns?fields=title,progress")
+        self.assertEqual(set(response.json()["items"][0]), {"id", "title", "progress"})
+
+    def test_campaign_details(self):
+        # campaign + related id bounds + related sample
+        self.assertGetQueries(3, f"/api/campaigns/{self.campaigns[0].id}")
+
+    def test_campaign_donations(self):
+        response = self.assertGetQueries(2, f"/api/campaigns/{self.campaigns[0].id}/donations")
+        self.assertEqual(len(response.json()["items"]), 1)
+
+    def test_campaign_donation_summary_is_cached(self):
+        url = f"/api/campaigns/{self.campaigns[0].id}/donations/summary"
+        response = self.assertGetQueries(2, url)
+        self.assertEqual(response.json(), {"donation_count": 1, "donor_count": 1, "total_amount": 10.0})
+        self.assertGetQueries(1, url)
+
+        # a new donation drops the cached counts once it commits
+        with self.captureOnCommitCallbacks(execute=True):
+            Donation.objects.create(campaign=self.campaigns[0], user=self.user, amount=5, transaction_hash="0xa")
+        self.assertEqual(self.client.get(url).json()["donation_count"], 2)
+
+    def test_user_campaigns(self):
+        # the token claims are trusted, so no user lookup
+        response = self.assertGetQueries(1, "/api/user/campaigns", **self.auth)
+        self.assertEqual(len(response.json()), 5)
+
+    def test_user_donation_history(self):
+        response = self.assertGetQueries(1, "/api/user/donation-history", **self.donor_auth)
+        self.assertEqual(len(response.json()["items"]), 5)
+
+    def test_user_donation_history_pages(self):
+        # donations share a timestamp, so the id breaks the tie
+        Donation.objects.filter(user=self.donor).update(date=self.campaigns[0].created_at)
+        seen, cursor = [], None
+        while True:
+            url = "/api/user/donation-history?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            page = self.assertGetQueries(1, url, **self.donor_auth).json()
+            seen += [item["transaction_hash"] for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [f"0x{i}" for i in reversed(range(5))])
+
+    def test_user_donation_summary_is_cached(self):
+        response = self.assertGetQueries(1, "/api/user/donation-history/summary", **self.donor_auth)
+        self.assertEqual(response.json(), {
+            "donation_count": 5,
+            "totals": [{"token_id": self.token.id, "token_symbol": "TKN", "donation_count": 5, "amount": 50.0}],
+        })
+        self.assertGetQueries(0, "/api/user/donation-history/summary", **self.donor_auth)
+
+    def test_user_info_is_cached(self):
+        self.assertGetQueries(1, "/api/user/info", **self.auth)
+        self.assertGetQueries(0, "/api/user/info", **self.auth)
+
+    def test_user_update_keeps_concurrent_changes(self):
+        # caches alice, then the indexer fills in her EVM address behind the cache
+        self.assertGetQueries(1, "/api/user/info", **self.auth)
+        evm_address = "0x00000000000000000000000000000000000003e9"
+        HederaUser.objects.filter(pk=self.user.pk).update(evm_address=evm_address)
+        response = self.client.put(
+            "/api/user/update",
+            {"name": "Alice B", "facebook": "", "twitter": "", "bio": "Hi"},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        user = HederaUser.objects.get(pk=self.user.pk)
+        self.assertEqual((user.name, user.bio, user.evm_address), ("Alice B", "Hi", evm_address))
+
+    def test_invalid_token(self):
+        response = self.client.get("/api/user/campaigns", HTTP_AUTHORIZATION="Bearer nope")
+        self.assertEqual(response.status_code, 401)
+
+    def test_top_campaigns(self):
+        self.assertGetQueries(1, "/api/top-campaigns")
+
+    def test_top_donors(self):
+        self.assertGetQueries(1, "/api/top-donors")
+
+    def test_tokens_and_campaign_types(self):
+        self.assertGetQueries(1, "/api/tokens")
+        self.assertGetQueries(1, "/api/campaign-types")
+
+    def test_create_campaign(self):
+        payload = {
+            "title": "New",
+            "description": "Description",
+            "goal": 50,
+            "campaign_type_id": self.campaign_type.id,
+            "token_id": self.token.id,
+        }
+        # user + campaign type + token + insert
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                "/api/campaigns", payload, content_type="application/json", **self.auth
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    async def test_campaign_donations_export(self):
+        url = f"/api/campaigns/{self.campaigns[0].id}/donations/export"
+        # the async client consumes the streamed body the way ASGI does
+        response = await self.async_client.get(url, headers={"Authorization": self.auth["HTTP_AUTHORIZATION"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        header, row = body.splitlines()
+        self.assertTrue(header.startswith("donation_id,campaign_id,campaign_title,"))
+        self.assertIn(",Campaign 0,", row)
+        self.assertIn(",10.00,", row)
+
+        forbidden = await self.async_client.get(
+            url, headers={"Authorization": self.donor_auth["HTTP_AUTHORIZATION"]}
+        )
+        self.assertEqual(forbidden.status_code, 403)
+
+    @override_settings(SERVICE_API_KEY="secret")
+    async def test_platform_donations_export(self):
+        response = await self.async_client.get("/api/donations/export?format=ndjson", headers={"X-API-Key": "secret"})
+        self.assertEqual(response.status_code, 200)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row["transaction_hash"] for row in rows], [f"0x{i}" for i in range(5)])
+        self.assertEqual(rows[0]["donor_username"], "bob")
+
+
+    @override_settings(SERVICE_API_KEY="secret", EXPORT_MAX_CONCURRENT=1)
+    async def test_exports_wait_for_a_free_slot(self):
+        first = (await self.async_client.get("/api/donations/export", headers={"X-API-Key": "secret"})).streaming_content
+        self.assertTrue((await first.__anext__()).startswith(b"donation_id,"))
+        second = (await self.async_client.get("/api/donations/export", headers={"X-API-Key": "secret"})).streaming_content
+        waiting = asyncio.ensure_future(second.__anext__())
+        await asyncio.sleep(0.05)
+        self.assertFalse(waiting.done())
+
+        self.assertEqual(len(b"".join([chunk async for chunk in first]).splitlines()), 5)
+        self.assertTrue((await asyncio.wait_for(waiting, 5)).startswith(b"donation_id,"))
+        self.assertEqual(len(b"".join([chunk async for chunk in second]).splitlines()), 5)
+
+
+class ConcurrencyLimitTests(SimpleTestCase):
+    async def test_slot_is_held_until_the_response_starts(self):
+        computing = []
+        respond, finish = asyncio.Event(), asyncio.Event()
+
+        async def app(scope, receive, send):
+            await receive()
+            computing.append(scope["path"])
+            if scope["path"] == "/slow":
+                await respond.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            if scope["path"] == "/slow":
+                # a streamed body, or a client reading slowly
+                await finish.wait()
+            await send({"type": "http.response.body", "body": b""})
+
+        def receiver():
+            messages = [{"type": "http.request", "body": b""}]
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                # after the body, as ASGI servers do: wait for a disconnect
+                await asyncio.Event().wait()
+            return receive
+
+        async def send(message):
+            pass
+
+        limited = ConcurrencyLimit(app, 1)
+        slow = asyncio.ensure_future(limited({"type": "http", "path": "/slow"}, receiver(), send))
+        await asyncio.sleep(0.01)
+        fast = asyncio.ensure_future(limited({"type": "http", "path": "/fast"}, receiver(), send))
+        await asyncio.sleep(0.01)
+        self.assertEqual(computing, ["/slow"])
+
+        respond.set()
+        await asyncio.wait_for(fast, 1)
+        self.assertEqual(computing, ["/slow", "/fast"])
+        self.assertFalse(slow.done())
+        finish.set()
+        await slow
+        self.assertFalse(limited._semaphore.locked())
+
+    async def test_streaming_stops_when_the_client_goes_away(self):
+        gone = asyncio.Event()
+        sent = []
+
+        async def app(scope, receive, send):
+            await receive()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            while True:
+                await send({"type": "http.response.body", "body": b"row", "more_body": True})
+                await asyncio.sleep(0.01)
+
+        messages = [{"type": "http.request", "body": b""}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await gone.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message["type"])
+            if len(sent) == 3:
+                gone.set()
+
+        await asyncio.wait_for(ConcurrencyLimit(app, 1)({"type": "http", "path": "/"}, receive, send), 1)
+        self.assertLessEqual(len(sent), 4)
+
+
+# one process, so the local test cache is enough
+@override_settings(API_CACHE_ENABLED=True, DATABASE_REPLICAS=[])
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_async_endpoint_is_cached_and_revalidated(self):
+        Token.objects.create(name="Token", symbol="TKN", address="0x1", decimal=8)
+        response = self.client.get("/api/tokens")
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            cached = self.client.get("/api/tokens")
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(self.client.get("/api/tokens", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # a write bumps the group on commit, so the next read is fresh
+        with self.captureOnCommitCallbacks(execute=True):
+            Token.objects.create(name="Other", symbol="OTH", address="0x2", decimal=8)
+        self.assertEqual(len(self.client.get("/api/tokens").json()), 2)
+
+
+class DonationIngestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.donor = HederaUser.objects.create(username="bob", wallet_address="0.0.1002")
+        cls.token = Token.objects.create(name="Token", symbol="TKN", address="0x1", decimal=8)
+        cls.campaign = Campaign.objects.create(
+            title="Campaign", description="Description", goal=100, organizer=cls.donor,
+            campaign_type=CampaignType.objects.create(name="Health"), token=cls.token,
+            approved_by_admin=True, status=Campaign.STATUS_PUBLISHED, onchain_id=7,
+        )
+
+    def event(self, tx, amount=10):
+        return DonationEvent(
+            campaign_onchain_id=7, donor="0.0.1002", amount=Decimal(amount),
+            transaction_hash=tx, timestamp="1700000000.123456789",
+        )
+
+    def test_ingest_is_idempotent_and_updates_totals(self):
+        events = [self.event("0xa"), self.event("0xb"), self.event("0xb"), self.event("0xc")]
+        events.append(DonationEvent(7, "0.0.9999", Decimal(5), "0xd", "1700000000"))
+
+        result = ingest_donations(events)
+        self.assertEqual((result.inserted, result.updated, result.skipped), (3, 0, 1))
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.current_amount, 30)
+
+        result = ingest_donations(events)
+        self.assertEqual((result.inserted, result.updated), (0, 0))
+
+        result = ingest_donations([self.event("0xa", amount=25)])
+        self.assertEqual(result.updated, 1)
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.current_amount, 45)
+        self.assertEqual(self.campaign.percentage_completed, 45)
+
+    def test_values_cannot_break_out_of_their_columns(self):
+        events = [self.event("0xa\t1\n\\b"), self.event("0xc")]
+        events[1].timestamp = "abc"
+        result = ingest_donations(events)
+        self.assertEqual((result.inserted, result.skipped), (1, 1))
+        self.assertEqual(Donation.objects.get().transaction_hash, "0xa\t1\n\\b")
+
+    @override_settings(SERVICE_API_KEY="secret")
+    def test_malformed_events_are_rejected(self):
+        event = {"campaign_onchain_id": 7, "donor": "0.0.1002", "amount": "10", "transaction_hash": "0xa"}
+        for bad in ({"timestamp": "abc"}, {"timestamp": "1700000000", "transaction_hash": "0xa\tb"}):
+            response = self.client.post(
+                "/api/donations/ingest", {"events": [{**event, **bad}]},
+                content_type="application/json", HTTP_X_API_KEY="secret",
+            )
+            self.assertEqual(response.status_code, 422, response.content)
+        self.assertFalse(Donation.objects.exists())
+
+
+class CampaignTotalsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.donor = HederaUser.objects.create(username="bob", wallet_address="0.0.1002")
+        defaults = {
+            "description": "Description", "goal": 200, "organizer": cls.donor,
+            "campaign_type": CampaignType.objects.create(name="Health"),
+            "token": Token.objects.create(name="Token", symbol="TKN", address="0x1", decimal=8),
+        }
+        cls.campaign = Campaign.objects.create(title="First", **defaults)
+        cls.other = Campaign.objects.create(title="Second", **defaults)
+
+    def totals(self):
+        return [
+            (campaign.current_amount, campaign.percentage_completed)
+            for campaign in Campaign.objects.filter(pk__in=[self.campaign.pk, self.other.pk]).order_by("id")
+        ]
+
+    def test_totals_follow_donations(self):
+        donation = Donation.objects.create(campaign=self.campaign, user=self.donor, amount=10, transaction_hash="0xa")
+        # one multi-row statement
+        Donation.objects.bulk_create([
+            Donation(campaign=self.campaign, user=self.donor, amount=20, transaction_hash="0xb"),
+            Donation(campaign=self.other, user=self.donor, amount=30, transaction_hash="0xc"),
+            Donation(campaign=self.other, user=self.donor, amount=40, transaction_hash="0xd"),
+        ])
+        self.assertEqual(self.totals(), [(30, 15), (70, 35)])
+
+        Donation.objects.filter(pk=donation.pk).update(amount=50)
+        self.assertEqual(self.totals(), [(70, 35), (70, 35)])
+        Donation.objects.filter(pk=donation.pk).update(campaign=self.other)
+        self.assertEqual(self.totals(), [(20, 10), (120, 60)])
+        Donation.objects.filter(campaign=self.other).update(amount=F("amount") + 1)
+        self.assertEqual(self.totals(), [(20, 10), (123, Decimal("61.50"))])
+
+        Donation.objects.filter(transaction_hash__in=["0xa", "0xc"]).delete()
+        self.assertEqual(self.totals(), [(20, 10), (41, Decimal("20.50"))])
+        Donation.objects.all().delete()
+        self.assertEqual(self.totals(), [(0, 0), (0, 0)])
+
+    def test_saving_a_stale_campaign_keeps_its_totals(self):
+        stale = Campaign.objects.get(pk=self.campaign.pk)
+        Donation.objects.create(campaign=self.campaign, user=self.donor, amount=10, transaction_hash="0xa")
+        stale.title = "Renamed"
+        stale.save()
+        self.assertEqual(self.totals()[0], (10, 5))
+        self.assertEqual((stale.current_amount, stale.percentage_completed), (10, 5))
+
+        Donation.objects.create(campaign=self.campaign, user=self.donor, amount=20, transaction_hash="0xb")
+        stale.goal = 80
+        stale.save()
+        self.assertEqual(self.totals()[0], (30, Decimal("37.50")))
+        self.assertEqual(Campaign.objects.get(pk=self.campaign.pk).title, "Renamed")
+
+    def test_reconcile_fixes_drift(self):
+        Donation.objects.create(campaign=self.campaign, user=self.donor, amount=10, transaction_hash="0xa")
+        Campaign.objects.filter(pk=self.campaign.pk).update(current_amount=99, percentage_completed=1)
+        out = io.StringIO()
+        call_command("reconcile_campaign_totals", "--dry-run", stdout=out)
+        self.assertIn("1 campaign(s) would be fixed", out.getvalue())
+        self.assertEqual(self.totals()[0], (99, 1))
+
+        call_command("reconcile_campaign_totals", stdout=out)
+        self.assertEqual(self.totals(), [(10, 5), (0, 0)])
+
+
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = HederaUser.objects.create(username="alice", wallet_address="0.0.1001")
+        cls.bob = HederaUser.objects.create(username="bob", wallet_address="0.0.1002")
+        cls.hbar = Token.objects.create(name="Hbar", symbol="HBAR", address="0x1", decimal=8)
+        cls.usdc = Token.objects.create(name="USD Coin", symbol="USDC", address="0x2", decimal=6)
+        defaults = {
+            "description": "Description", "goal": 100, "organizer": cls.alice,
+            "campaign_type": CampaignType.objects.create(name="Health"),
+        }
+        cls.hbar_campaigns = [Campaign.objects.create(title=f"Hbar {n}", token=cls.hbar, **defaults) for n in range(2)]
+        cls.usdc_campaign = Campaign.objects.create(title="Usdc", token=cls.usdc, **defaults)
+
+    def donate(self, campaign, user, amount, tx):
+        return Donation.objects.create(campaign=campaign, user=user, amount=amount, transaction_hash=tx)
+
+    def entries(self):
+        return {
+            (entry.user.username, entry.token.symbol): (entry.total_amount, entry.donation_count)
+            for entry in DonorLeaderboardEntry.objects.select_related("user", "token")
+        }
+
+    def test_refresh_upserts_and_removes_totals(self):
+        self.donate(self.hbar_campaigns[0], self.alice, 10, "0xa")
+        self.donate(self.hbar_campaigns[1], self.alice, 5, "0xb")
+        self.donate(self.usdc_campaign, self.alice, 7, "0xc")
+        bob_donation = self.donate(self.hbar_campaigns[0], self.bob, 3, "0xd")
+        self.assertEqual(refresh_leaderboard(), (3, 0))
+        self.assertEqual(self.entries(), {
+            ("alice", "HBAR"): (15, 2), ("alice", "USDC"): (7, 1), ("bob", "HBAR"): (3, 1),
+        })
+
+        # only the changed total is written
+        self.donate(self.hbar_campaigns[1], self.bob, 4, "0xe")
+        self.assertEqual(refresh_leaderboard(), (1, 0))
+        self.assertEqual(self.entries()[("bob", "HBAR")], (7, 2))
+
+        bob_donation.delete()
+        Donation.objects.filter(campaign=self.usdc_campaign).delete()
+        self.assertEqual(refresh_leaderboard(), (1, 1))
+        self.assertEqual(self.entries(), {("alice", "HBAR"): (15, 2), ("bob", "HBAR"): (4, 1)})
+        out = io.StringIO()
+        call_command("refresh_leaderboard", stdout=out)
+        self.assertIn("0 updated, 0 removed", out.getvalue())
+
+    def test_top_donors_are_ranked_within_one_token(self):
+        carol = HederaUser.objects.create(username="carol", wallet_address="0.0.1003")
+        # 1 HBAR is 1e8 units, 50 USDC 5e7
+        self.donate(self.hbar_campaigns[0], self.alice, 10 ** 8, "0xa")
+        self.donate(self.hbar_campaigns[1], self.bob, 3 * 10 ** 7, "0xb")
+        self.donate(self.usdc_campaign, carol, 50 * 10 ** 6, "0xc")
+        self.donate(self.usdc_campaign, self.alice, 10 ** 6, "0xd")
+        refresh_leaderboard()
+
+        def top(query=""):
+            return [(donor["username"], donor["totalDonations"]) for donor in self.client.get(f"/api/top-donors{query}").json()]
+
+        self.assertEqual(top(), [("alice", "1 HBAR"), ("bob", "0.3 HBAR")])
+        self.assertEqual(top(f"?token_id={self.usdc.id}"), [("carol", "50 USDC"), ("alice", "1 USDC")])
+
+    def test_format_token_amount(self):
+        self.assertEqual(format_token_amount(Decimal(150), 0), "150")
+        self.assertEqual(format_token_amount(Decimal(0), 8), "0")
+        self.assertEqual(format_token_amount(Decimal(150000000), 8), "1.5")
+        self.assertEqual(format_token_amount(Decimal(12345678), 8), "0.12345678")
+        self.assertEqual(format_token_amount(Decimal("1230000000000000000"), 18), "1.23")
+        self.assertEqual(format_token_amount(Decimal(1), 18), "0.000000000000000001")
+
+
+class StubMirrorNode(ThreadingHTTPServer):
+    """
+    Serves /contracts/<id>/results/logs (paginated via links.next) and
+    /accounts/<evm address> from in-memory data.
+    """
+
+    def __init__(self, logs, accounts, page_size=2):
+        self.logs = sorted(logs, key=lambda log: parse_timestamp(log["timestamp"]))
+        self.accounts = accounts
+        self.page_size = page_size
+        self.account_requests = 0
+        super().__init__(("127.0.0.1", 0), StubMirrorHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubMirrorHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if "/accounts/" in url.path:
+            self.server.account_requests += 1
+            account = self.server.accounts.get(url.path.rsplit("/", 1)[1])
+            return self._send(200 if account else 404, {"account": account})
+
+        logs = self.server.logs
+        for bound in query.get("timestamp", []):
+            op, value = bound.split(":")
+            value = parse_timestamp(value)
+            if op == "gt":
+                logs = [log for log in logs if parse_timestamp(log["timestamp"]) > value]
+            else:
+                logs = [log for log in logs if parse_timestamp(log["timestamp"]) <= value]
+        limit = min(int(query["limit"][0]), self.server.page_size)
+        page, next_link = logs[:limit], None
+        if len(logs) > limit:
+            lte = [bound for bound in query.get("timestamp", []) if bound.startswith("lte:")]
+            params = [("timestamp", f"gt:{page[-1]['timestamp']}"), *(("timestamp", b) for b in lte),
+                      ("order", "asc"), ("limit", str(limit))]
+            next_link = f"{url.path}?{urlencode(params)}"
+        self._send(200, {"logs": page, "links": {"next": next_link}})
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def _word(value):
+    return f"{value:064x}"
+
+
+class IndexerTests(TestCase):
+    donor_address = "0x" + "ab" * 20
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.donor = HederaUser.objects.create(username="bob", wallet_address="0.0.1002")
+        cls.campaign = Campaign.objects.create(
+            title="Campaign", description="Description", goal=100, organizer=cls.donor,
+            campaign_type=CampaignType.objects.create(name="Health"),
+            token=Token.objects.create(name="Token", symbol="TKN", address="0x1", decimal=8),
+            approved_by_admin=True, status=Campaign.STATUS_NEW,
+        )
+        cls.start = int(time.time()) - 3600
+        LastIndexCrawl.objects.create(key=CRAWL_KEY, start_at=str(cls.start))
+
+    def setUp(self):
+        now = int(time.time())
+        logs = [{
+            "topics": [CAMPAIGN_PUBLISHED, "0x" + _word(self.campaign.id), "0x" + _word(7)],
+            "data": "0x" + _word(0) * 3,
+            "transaction_hash": "0xpublish",
+            "timestamp": f"{self.start + 10}.000000001",
+        }]
+        logs += [{
+            "topics": [DONATION_RECEIVED, "0x" + "0" * 24 + self.donor_address[2:]],
+            "data": "0x" + _word(7) + _word(5) + _word(5 * (i + 1)),
+            "transaction_hash": f"0xdonation{i}",
+            "timestamp": f"{self.start + 20 + i * 400}.000000002",
+        } for i in range(7)]
+        # past the lag: must be left for the next run
+        logs.append({**logs[-1], "transaction_hash": "0xtoo-new", "timestamp": f"{now + 60}.0"})
+        self.mirror = StubMirrorNode(logs, {self.donor_address: "0.0.1002"})
+        self.addCleanup(self.mirror.server_close)
+        self.addCleanup(self.mirror.shutdown)
+
+    def run_indexer(self, backfill_seconds=3600):
+        client = MirrorNodeClient(self.mirror.url, "0.0.1", concurrency=4)
+        indexer = Indexer(client, window_seconds=300, lookahead=4, backfill_seconds=backfill_seconds, lag_seconds=5)
+        try:
+            return indexer.run()
+        finally:
+            client.close()
+
+    def test_catch_up_is_exactly_once(self):
+        stats = self.run_indexer()
+        self.assertEqual((stats.logs, stats.donations_inserted, stats.campaigns_updated), (8, 7, 1))
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.onchain_id, self.campaign.status), (7, Campaign.STATUS_PUBLISHED))
+        self.assertEqual(self.campaign.current_amount, 35)
+        self.assertFalse(Donation.objects.filter(transaction_hash="0xtoo-new").exists())
+
+        # one mirror lookup for the alias donor, stored for later runs
+        self.assertEqual(self.mirror.account_requests, 1)
+        self.donor.refresh_from_db()
+        self.assertEqual(self.donor.evm_address, self.donor_address)
+
+        position = LastIndexCrawl.objects.get(key=CRAWL_KEY).value
+        self.assertGreater(parse_timestamp(position), (self.start + 20 + 6 * 400) * 10 ** 9)
+
+        stats = self.run_indexer()
+        self.assertEqual((stats.logs, stats.donations_inserted), (0, 0))
+        self.assertEqual(Donation.objects.count(), 7)
+
+    def test_chunks_are_fetched_outside_transactions_under_a_lease(self):
+        client = MirrorNodeClient(self.mirror.url, "0.0.1", concurrency=4)
+        self.addCleanup(client.close)
+        indexer = Indexer(client, window_seconds=300, lookahead=4, lag_seconds=5)
+        crawl_id = indexer._crawl_id()
+        tip = time.time_ns()
+        depth = len(connection.atomic_blocks)
+        fetched = []
+
+        def taken_over(fetch):
+            def fetch_chunk(start, end):
+                fetched.append((start, end))
+                self.assertEqual(len(connection.atomic_blocks), depth)
+                window = CrawlWindow.objects.get(crawl_id=crawl_id)
+                self.assertGreater(window.claimed_until, timezone.now())
+                # leased, so no other worker can claim it
+                with transaction.atomic():
+                    self.assertIsNone(claim_window(crawl_id, tip=True))
+                # the lease ran out and another worker took the window over
+                CrawlWindow.objects.filter(pk=window.pk).update(
+                    claimed_until=timezone.now() + timedelta(minutes=1),
+                )
+                return async_to_sync(fetch)(start, end)
+            return fetch_chunk
+
+        stats = IndexerStats()
+        with mock.patch("donation_app.chain.indexer.async_to_sync", taken_over):
+            self.assertTrue(indexer.step(crawl_id, tip, stats))
+        self.assertEqual(len(fetched), 1)
+        self.assertEqual((stats.windows, Donation.objects.count()), (0, 0))
+
+        CrawlWindow.objects.filter(crawl_id=crawl_id).update(claimed_until=None)
+        self.assertTrue(indexer.step(crawl_id, tip, stats))
+        self.assertEqual(stats.windows, 1)
+        self.assertIsNone(CrawlWindow.objects.get(crawl_id=crawl_id).claimed_until)
+
+    def test_backfill_windows_fold_into_the_high_water_mark(self):
+        stats = self.run_indexer(backfill_seconds=600)
+        self.assertEqual((stats.logs, stats.donations_inserted), (8, 7))
+
+        crawl = LastIndexCrawl.objects.get(key=CRAWL_KEY)
+        tip = crawl.windows.get()
+        self.assertIsNone(tip.end_ns)
+        self.assertEqual(tip.start_ns, tip.position_ns)
+        self.assertEqual(crawl_position(CRAWL_KEY), tip.position_ns)
+
+
+class CrawlWindowClaimTests(TransactionTestCase):
+    def test_claims_skip_windows_held_by_other_workers(self):
+        crawl = LastIndexCrawl.objects.create(key=CRAWL_KEY, start_at=format_timestamp(100))
+        first, second = (
+            CrawlWindow.objects.create(crawl=crawl, start_ns=start, end_ns=start + 100, position_ns=start)
+            for start in (100, 200)
+        )
+        claimed, release = threading.Event(), threading.Event()
+
+        def worker():
+            with transaction.atomic():
+                self.assertEqual(claim_window(crawl.id, tip=False), first)
+                claimed.set()
+                release.wait(5)
+            connection.close()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        try:
+            claimed.wait(5)
+            with transaction.atomic():
+                self.assertEqual(claim_window(crawl.id, tip=False), second)
+                # finishing the second window cannot fold past the held first one
+                second.position_ns = 300
+                second.save()
+                fold_windows(crawl.id)
+            self.assertEqual(crawl_position(CRAWL_KEY), 100)
+        finally:
+            release.set()
+            thread.join()
+
+        with transaction.atomic():
+            window = claim_window(crawl.id, tip=False)
+            window.position_ns = 200
+            window.save()
+            fold_windows(crawl.id)
+        self.assertEqual(crawl_position(CRAWL_KEY), 300)
+        self.assertFalse(crawl.windows.exists())
+
+
+class AccountResolverTests(TestCase):
+    class Client:
+        def __init__(self, accounts):
+            self.accounts = accounts
+            self.lookups = []
+
+        async def account_id(self, address):
+            self.lookups.append(address)
+            return self.accounts.get(address)
+
+    def test_long_zero_addresses_decode_locally(self):
+        self.assertEqual(long_zero_to_account_id("0x00000000000000000000000000000000000004D2"), "0.0.1234")
+        self.assertEqual(account_id_to_long_zero("0.0.1234"), "0x00000000000000000000000000000000000004d2")
+        self.assertIsNone(long_zero_to_account_id("0x" + "ab" * 20))
+
+    def test_bulk_resolve_uses_the_database_cache(self):
+        alias, unknown = "0x" + "ab" * 20, "0x" + "cd" * 20
+        long_zero = account_id_to_long_zero("0.0.77")
+        client = self.Client({alias: "0.0.1002"})
+
+        resolved = async_to_sync(AccountResolver(client).resolve)([alias, unknown, long_zero, alias.upper()[2:]])
+        self.assertEqual(resolved, {alias: "0.0.1002", unknown: None, long_zero: "0.0.77"})
+        self.assertCountEqual(client.lookups, [alias, unknown])
+
+        # a fresh process: positive and negative answers both come from the table
+        client.lookups.clear()
+        with self.assertNumQueries(2):
+            resolved = async_to_sync(AccountResolver(client).resolve)([alias, unknown])
+        self.assertEqual(resolved, {alias: "0.0.1002", unknown: None})
+        self.assertEqual(client.lookups, [])
+
+        with override_settings(EVM_ADDRESS_NEGATIVE_TTL=-1):
+            async_to_sync(AccountResolver(client).resolve)([alias, unknown])
+        self.assertEqual(client.lookups, [unknown])
+
+
+class LogDecoderTests(TestCase):
+    def test_decodes_columns_and_drops_malformed_logs(self):
+        donor = "0x" + "ab" * 20
+        logs = [
+            {"topics": [DONATION_RECEIVED, "0x" + "0" * 24 + donor[2:]],
+             "data": "0x" + _word(7) + _word(2 ** 200) + _word(9), "transaction_hash": "0xa", "timestamp": "1.1"},
+            {"topics": [CAMPAIGN_CLOSED, "0x" + "0" * 24 + donor[2:]],
+             "data": "0x" + _word(7) + _word(9), "transaction_hash": "0xb", "timestamp": "1.2"},
+            # truncated data, and an unknown event
+            {"topics": [DONATION_RECEIVED, "0x" + "0" * 64], "data": "0x" + _word(1),
+             "transaction_hash": "0xc", "timestamp": "1.3"},
+            {"topics": ["0x" + "f" * 64], "data": "0x", "transaction_hash": "0xd", "timestamp": "1.4"},
+            {"topics": [DONATION_RECEIVED, "0x" + "0" * 64],
+             "data": "0x" + _word(8) + _word(1) + _word(1), "transaction_hash": "0xe", "timestamp": "1.5"},
+        ]
+        batch = decode_batch(logs)
+        self.assertEqual(batch["DonationReceived"], {
+            "donor_address": [donor, "0x" + "0" * 40],
+            "campaign_onchain_id": [7, 8],
+            "amount": [2 ** 200, 1],
+            "total_donation_tokens": [9, 1],
+            "transaction_hash": ["0xa", "0xe"],
+            "timestamp": ["1.1", "1.5"],
+        })
+        self.assertEqual(batch["CampaignClosed"]["campaign_onchain_id"], [7])
+        self.assertEqual(batch["CampaignPublished"]["transaction_hash"], [])
+
+        merged = concat_batches([batch, decode_batch(logs[:1])])
+        self.assertEqual(merged["DonationReceived"]["transaction_hash"], ["0xa", "0xe", "0xa"])
+
+
+class ConnectionPoolTests(TestCase):
+    def make_pool(self, **options):
+        params = connection.get_connection_params()
+        pool = ConnectionPool(lambda: psycopg2.connect(**params), **options)
+        self.addCleanup(pool.close_idle)
+        return pool
+
+    def test_connections_are_reused_and_bounded(self):
+        pool = self.make_pool(max_size=1, timeout=0.1)
+        first = pool.getconn()
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+
+        # a connection returned mid-transaction comes back rolled back
+        first.cursor().execute("SELECT 1")
+        pool.putconn(first)
+        self.assertIs(pool.getconn(), first)
+        self.assertEqual(first.info.transaction_status, TRANSACTION_STATUS_IDLE)
+        pool.putconn(first)
+
+    def test_broken_connections_are_replaced(self):
+        pool = self.make_pool(max_size=1)
+        first = pool.getconn()
+        first.close()
+        pool.putconn(first)
+        second = pool.getconn()
+        self.assertIsNot(second, first)
+        pool.putconn(second)
+
+
+@override_settings(API_CACHE_ENABLED=False, DATABASE_REPLICAS=[])
+class PreparedStatementTests(TestCase):
+    def prepared(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT statement FROM pg_prepared_statements WHERE name LIKE 'dj_%%'")
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_number_placeholders(self):
+        self.assertEqual(
+            number_placeholders("SELECT 1 WHERE a = %s AND b LIKE '%%x' AND c = %s"),
+            ("SELECT 1 WHERE a = $1 AND b LIKE '%x' AND c = $2", 2),
+        )
+
+    def test_hot_selects_are_prepared(self):
+        user = HederaUser.objects.create(username="alice", wallet_address="0.0.1001")
+        campaign = Campaign.objects.create(
+            title="Campaign", description="", goal=100, organizer=user,
+            campaign_type=CampaignType.objects.create(name="Health"),
+            token=Token.objects.create(name="Token", symbol="TKN", address="0x1", decimal=8),
+        )
+        threshold = connection.settings_dict["OPTIONS"]["prepare_threshold"]
+        for _ in range(threshold + 2):
+            response = self.client.get(f"/api/campaigns/{campaign.id}")
+            self.assertEqual(response.json()["campaign"]["title"], "Campaign")
+        self.assertTrue(any('"donation_app_campaign"."id" = $1' in sql for sql in self.prepared()))
+
+    def test_unpreparable_statements_fall_back(self):
+        threshold = connection.settings_dict["OPTIONS"]["prepare_threshold"]
+        with connection.cursor() as cursor:
+            for _ in range(threshold + 1):
+                # PostgreSQL cannot type $1 here; the caller's transaction
+                # must survive the failed PREPARE
+                cursor.execute("SELECT 1 WHERE %s IS NULL", [None])
+                self.assertEqual(cursor.fetchall(), [(1,)])
+        self.assertEqual(Campaign.objects.count(), 0)
+
+
+@override_settings(DATABASE_REPLICAS=["replica_a", "replica_b"])
+class ReplicaRouterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = HederaUser.objects.create(username="alice", wallet_address="0.0.1001")
+        cls.other = HederaUser.objects.create(username="bob", wallet_address="0.0.1002")
+        cls.campaign_type = CampaignType.objects.create(name="Health")
+        cls.token = Token.objects.create(name="Token", symbol="TKN", address="0x1", decimal=8)
+
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.healthy = {"replica_a": True, "replica_b": True}
+        replicas._health.clear()
+        self.addCleanup(replicas._health.clear)
+        patcher = mock.patch.object(replicas, "_probe", side_effect=lambda alias: self.healthy[alias])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def read_alias(self, user=None):
+        extra = {"HTTP_AUTHORIZATION": f"Bearer {generate_jwt_token(user)}"} if user else {}
+        request = RequestFactory().get("/api/campaigns", **extra)
+        with replica_reads(request):
+            return self.router.db_for_read(Campaign)
+
+    def test_round_robin_with_failover(self):
+        self.assertEqual({self.read_alias() for _ in range(4)}, {"replica_a", "replica_b"})
+
+        self.healthy["replica_b"] = False
+        replicas._health.clear()
+        self.assertEqual({self.read_alias() for _ in range(4)}, {"replica_a"})
+
+        self.healthy["replica_a"] = False
+        replicas._health.clear()
+        self.assertEqual(self.read_alias(), "default")
+
+    def test_reads_outside_requests_and_writes_use_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Campaign), "default")
+        request = RequestFactory().get("/api/campaigns")
+        with replica_reads(request):
+            self.assertEqual(self.router.db_for_write(Campaign), "default")
+
+    def test_writer_reads_own_writes_from_the_primary(self):
+        response = self.client.post(
+            "/api/campaigns",
+            {"title": "New", "description": "", "goal": 50,
+             "campaign_type_id": self.campaign_type.id, "token_id": self.token.id},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {generate_jwt_token(self.user)}",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.read_alias(self.user), "default")
+        self.assertIn(self.read_alias(self.other), self.healthy)
+
+    def test_probe_accepts_an_alias_of_the_primary(self):
+        self.assertTrue(ReplicaSet()._probe("default"))
+
+
+@override_settings(UPLOAD_PART_SIZE=4, IMAGE_VARIANT_WORKERS=0, DATABASE_REPLICAS=[])
+class ChunkedUploadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = HederaUser.objects.create(username="alice", wallet_address="0.0.1001")
+        cls.auth = {"HTTP_AUTHORIZATION": f"Bearer {generate_jwt_token(cls.user)}"}
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=media_root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.media_root = media_root.name
+
+    def start(self, data, **payload):
+        response = self.client.post(
+            "/api/uploads", {"file_name": "photo.png", "size": len(data), **payload},
+            content_type="application/json", **self.auth,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def put_part(self, upload_id, number, data):
+        return self.client.put(
+            f"/api/uploads/{upload_id}/parts/{number}", data,
+            content_type="application/octet-stream", **self.auth,
+        )
+
+    def test_parts_resume_and_complete(self):
+        data = b"0123456789"
+        upload = self.start(data, sha256=hashlib.sha256(data).hexdigest())
+        self.assertEqual((upload["part_count"], upload["received_parts"]), (3, []))
+
+        # out of order, one part sent twice, one of the wrong size
+        self.assertEqual(self.put_part(upload["upload_id"], 3, b"89").status_code, 200)
+        self.assertEqual(self.put_part(upload["upload_id"], 1, b"xxxx").status_code, 200)
+        self.assertEqual(self.put_part(upload["upload_id"], 1, b"0123").status_code, 200)
+        self.assertEqual(self.put_part(upload["upload_id"], 2, b"45678").status_code, 400)
+
+        status = self.client.get(f"/api/uploads/{upload['upload_id']}", **self.auth).json()
+        self.assertEqual(status["received_parts"], [1, 3])
+        missing = self.client.post(f"/api/uploads/{upload['upload_id']}/complete", **self.auth)
+        self.assertEqual(missing.status_code, 400)
+
+        self.assertEqual(self.put_part(upload["upload_id"], 2, b"4567").status_code, 200)
+        response = self.client.post(f"/api/uploads/{upload['upload_id']}/complete", **self.auth)
+        self.assertEqual(response.status_code, 200, response.content)
+        result = response.json()
+        self.assertEqual(result["sha256"], hashlib.sha256(data).hexdigest())
+        self.assertEqual(result["file_name"], f"{hashlib.sha256(data).hexdigest()}.png")
+        with default_storage.open(result["file_name"], "rb") as stored:
+            self.assertEqual(stored.read(), data)
+        # only the finished file is left
+        self.assertEqual(os.listdir(os.path.join(self.media_root, "uploads", upload["upload_id"])), [])
+
+        again = self.client.post(f"/api/uploads/{upload['upload_id']}/complete", **self.auth)
+        self.assertEqual(again.json(), result)
+
+    def test_part_replaced_while_completing(self):
+        upload = self.start(b"abc")
+        self.assertEqual(self.put_part(upload["upload_id"], 1, b"abc").status_code, 200)
+        save_content = default_storage.save_content
+
+        def replaced_meanwhile(*args, **kwargs):
+            name = save_content(*args, **kwargs)
+            self.assertEqual(self.put_part(upload["upload_id"], 1, b"xyz").status_code, 200)
+            return name
+
+        url = f"/api/uploads/{upload['upload_id']}/complete"
+        with mock.patch.object(default_storage, "save_content", replaced_meanwhile):
+            self.assertEqual(self.client.post(url, **self.auth).status_code, 409)
+        response = self.client.post(url, **self.auth)
+        self.assertEqual(response.json()["sha256"], hashlib.sha256(b"xyz").hexdigest())
+
+    def test_checksum_mismatch_and_other_users(self):
+        upload = self.start(b"abc", sha256="0" * 64)
+        self.assertEqual(self.put_part(upload["upload_id"], 1, b"abc").status_code, 200)
+        response = self.client.post(f"/api/uploads/{upload['upload_id']}/complete", **self.auth)
+        self.assertEqual(response.status_code, 400)
+        # nothing was stored: no blob, no row for collect_blobs to miss
+        self.assertFalse(StoredBlob.objects.exists())
+        self.assertFalse(default_storage.exists(hashlib.sha256(b"abc").hexdigest()))
+        self.assertEqual(os.listdir(os.path.join(self.media_root, ".incoming")), [])
+
+        other = HederaUser.objects.create(username="bob", wallet_address="0.0.1002")
+        response = self.client.get(
+            f"/api/uploads/{upload['upload_id']}", HTTP_AUTHORIZATION=f"Bearer {generate_jwt_token(other)}"
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(DATABASE_REPLICAS=[])
+class MediaServingTests(TestCase):
+    name = f"{'a' * 32}.png"
+    data = bytes(range(256)) * 4
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=media_root.name, MEDIA_CHUNK_SIZE=100)
+        media.enable()
+        self.addCleanup(media.disable)
+        with open(os.path.join(media_root.name, self.name), "wb") as file:
+            file.write(self.data)
+
+    async def get(self, url, **headers):
+        response = await self.async_client.get(url, headers=headers)
+        body = b"".join([chunk async for chunk in response.streaming_content]) if response.streaming else response.content
+        return response, body
+
+    async def test_full_range_and_conditional_requests(self):
+        url = f"/api/read-file/{self.name}"
+        response, body = await self.get(url)
+        self.assertEqual((response.status_code, body), (200, self.data))
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertIn("immutable", response["Cache-Control"])
+
+        ranged, body = await self.get(url, Range="bytes=10-19")
+        self.assertEqual((ranged.status_code, body), (206, self.data[10:20]))
+        self.assertEqual(ranged["Content-Range"], f"bytes 10-19/{len(self.data)}")
+        _, body = await self.get(url, Range="bytes=-5")
+        self.assertEqual(body, self.data[-5:])
+        # a stale If-Range gets the whole file
+        _, body = await self.get(url, Range="bytes=0-0", **{"If-Range": '"old"'})
+        self.assertEqual(body, self.data)
+        unsatisfiable, _ = await self.get(url, Range=f"bytes={len(self.data)}-")
+        self.assertEqual(unsatisfiable.status_code, 416)
+
+        cached, _ = await self.get(url, **{"If-None-Match": response["ETag"]})
+        self.assertEqual(cached.status_code, 304)
+        cached, _ = await self.get(url, **{"If-Modified-Since": response["Last-Modified"]})
+        self.assertEqual(cached.status_code, 304)
+
+    async def test_missing_files_and_accel_redirect(self):
+        missing, _ = await self.get("/api/read-file/nope.png")
+        self.assertEqual(missing.status_code, 404)
+        outside, _ = await self.get("/media/../settings.py")
+        self.assertEqual(outside.status_code, 404)
+        # other users' upload parts and files being stored are not served
+        for name in (f"uploads/{'b' * 32}/00001", f".incoming/{'c' * 32}"):
+            default_storage.save(name, io.BytesIO(b"private"))
+            response, _ = await self.get(f"/media/{name}")
+            self.assertEqual(response.status_code, 404)
+
+        with override_settings(MEDIA_ACCEL_REDIRECT="/protected-media/"):
+            response, body = await self.get(f"/media/{self.name}")
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.name}")
+        self.assertEqual(body, b"")
+
+
+@override_settings(IMAGE_VARIANT_WORKERS=0, API_CACHE_ENABLED=False, DATABASE_REPLICAS=[])
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=media_root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.media_root = media_root.name
+
+    def upload_image(self, size=(2000, 1000)):
+        buffer = io.BytesIO()
+        Image.new("RGB", size, "red").save(buffer, "JPEG")
+        response = self.client.post("/api/upload-file", {"file": SimpleUploadedFile("photo.jpg", buffer.getvalue())})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_upload_builds_variants_once(self):
+        uploaded = self.upload_image()
+        variants = image_variants(uploaded["file_url"])
+        self.assertEqual(set(variants), {"thumb", "card", "hero"})
+        for variant, url in variants.items():
+            with Image.open(default_storage.path(url.rsplit("/", 1)[-1])) as image:
+                self.assertEqual(image.format, "WEBP")
+                self.assertLessEqual(image.size, VARIANTS[variant])
+        self.assertEqual(build_variants(uploaded["file_name"]), [])
+        self.assertEqual(len(os.listdir(os.path.dirname(default_storage.path(uploaded["file_name"])))), 4)
+
+    def test_missing_variant_redirects_to_original(self):
+        uploaded = self.upload_image()
+        card = image_variants(uploaded["file_url"])["card"]
+        default_storage.delete(card.rsplit("/", 1)[-1])
+        response = self.client.get(card)
+        self.assertRedirects(response, uploaded["file_url"], fetch_redirect_response=False)
+
+    def test_campaign_responses_list_variants(self):
+        uploaded = self.upload_image()
+        user = HederaUser.objects.create(username="alice", wallet_address="0.0.1001")
+        Campaign.objects.create(
+            title="Campaign", description="Description", goal=100, image=uploaded["file_url"], organizer=user,
+            campaign_type=CampaignType.objects.create(name="Health"),
+            token=Token.objects.create(name="Token", symbol="TKN", address="0x1"),
+            approved_by_admin=True,
+        )
+        item = self.client.get("/api/campaigns").json()["items"][0]
+        self.assertEqual(item["image_variants"], image_variants(uploaded["file_url"]))
+        self.assertEqual(self.client.get("/api/top-campaigns").json()[0]["image_variants"]["thumb"],
+                         item["image_variants"]["thumb"])
+
+
+@override_settings(IMAGE_VARIANT_WORKERS=0, DATABASE_REPLICAS=[])
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=media_root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.media_root = media_root.name
+
+    def upload(self, data, name="notes.txt"):
+        response = self.client.post("/api/upload-file", {"file": SimpleUploadedFile(name, data)})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_same_content_is_stored_once(self):
+        data = b"same bytes"
+        sha256 = hashlib.sha256(data).hexdigest()
+        first, second = self.upload(data), self.upload(data, "copy.csv")
+        self.assertEqual((first["file_name"], second["file_name"]), (f"{sha256}.txt", f"{sha256}.csv"))
+        self.assertEqual(os.listdir(os.path.join(self.media_root, sha256[:2], sha256[2:4])), [sha256])
+        self.assertEqual(os.listdir(os.path.join(self.media_root, ".incoming")), [])
+        self.assertEqual(StoredBlob.objects.get().size, len(data))
+
+        response = self.client.get(second["file_url"])
+        self.assertEqual((response["Content-Type"], response["Content-Length"]), ("text/csv", str(len(data))))
+
+    def test_images_count_references_and_unreferenced_files_are_collected(self):
+        kept, replaced = self.upload(b"kept")["file_url"], self.upload(b"replaced")["file_url"]
+        user = HederaUser.objects.create(username="alice", wallet_address="0.0.1001", image=replaced)
+        campaign = Campaign.objects.create(
+            title="Campaign", description="", goal=100, image=replaced, organizer=user,
+            campaign_type=CampaignType.objects.create(name="Health"),
+            token=Token.objects.create(name="Token", symbol="TKN", address="0x1"),
+        )
+        refcounts = lambda: dict(StoredBlob.objects.values_list("sha256", "refcount"))
+        kept_sha256, replaced_sha256 = hashlib.sha256(b"kept").hexdigest(), hashlib.sha256(b"replaced").hexdigest()
+        self.assertEqual(refcounts(), {kept_sha256: 0, replaced_sha256: 2})
+
+        user.image = kept
+        user.save()
+        Campaign.objects.only("id").get(pk=campaign.pk).delete()
+        self.assertEqual(refcounts(), {kept_sha256: 1, replaced_sha256: 0})
+
+        # recently unreferenced files survive the grace period
+        call_command("collect_blobs", stdout=io.StringIO())
+        self.assertEqual(len(refcounts()), 2)
+        call_command("collect_blobs", "--older-than", "0", stdout=io.StringIO())
+        self.assertEqual(refcounts(), {kept_sha256: 1})
+        self.assertFalse(default_storage.exists(replaced.rsplit("/", 1)[-1]))
+        self.assertTrue(default_storage.exists(kept.rsplit("/", 1)[-1]))
+
+        StoredBlob.objects.update(refcount=5)
+        call_command("collect_blobs", "--recount", stdout=io.StringIO())
+        self.assertEqual(refcounts(), {kept_sha256: 1})
+
+
+@override_settings(API_CACHE_ENABLED=False, DATABASE_REPLICAS=[], SEARCH_MAX_MATCHES=3, SEARCH_WALK_ROWS=4)
+class CampaignSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organizer = HederaUser.objects.create(username="alice", wallet_address="0.0.1001")
+        defaults = {
+            "goal": 100, "organizer": organizer, "approved_by_admin": True,
+            "campaign_type": CampaignType.objects.create(name="Health"),
+            "token": Token.objects.create(name="Token", symbol="TKN", address="0x1"),
+        }
+        cls.titled = Campaign.objects.create(title="Clean water wells", description="Drilling in villages", **defaults)
+        cls.described = Campaign.objects.create(title="Village fund", description="Wells with clean water", **defaults)
+        for n in range(6):
+            Campaign.objects.create(title=f"Library books {n}", description="Reading rooms", **defaults)
+        Campaign.objects.create(title="Hidden water", description="", **{**defaults, "approved_by_admin": False})
+
+    def search(self, q, **params):
+        response = self.client.get("/api/campaigns/search", {"q": q, "fields": "id,title", **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_ranks_title_matches_first(self):
+        page = self.search("clean water")
+        self.assertEqual([item["id"] for item in page["items"]], [self.titled.id, self.described.id])
+        self.assertIsNone(page["next_cursor"])
+
+    def test_last_word_completes_titles(self):
+        self.assertEqual([item["id"] for item in self.search("clean wat")["items"]], [self.titled.id])
+        # prefixes complete title words only
+        self.assertEqual(self.search("drillin")["items"], [])
+        self.assertEqual([item["id"] for item in self.search("drilling")["items"]], [self.titled.id])
+
+    def test_edits_are_searchable_and_pages_do_not_overlap(self):
+        Campaign.objects.filter(pk=self.described.pk).update(title="Library for the village")
+        ids = []
+        cursor = None
+        while True:
+            page = self.search("library", limit=2, **({"cursor": cursor} if cursor else {}))
+            ids += [item["id"] for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        # the newest SEARCH_MAX_MATCHES matches get ranked
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(len(set(ids)), 3)
+
+    def test_route_and_empty_query(self):
+        self.assertEqual(self.client.get("/api/campaigns/search", {"q": " ?! "}).status_code, 400)
+        self.assertEqual(self.client.get(f"/api/campaigns/{self.titled.id}").status_code, 200)
+
+    def test_typos_match_titles(self):
+        if not has_trigram("default"):
+            self.skipTest("pg_trgm is not installed")
+        self.assertEqual([item["id"] for item in self.search("clen watter")["items"]][:1], [self.titled.id])
+
+
+@override_settings(DATABASE_REPLICAS=[], ADMIN_EXACT_COUNT_LIMIT=3)
+class AdminChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        cls.organizer = HederaUser.objects.create(username="alice", wallet_address="0.0.1001")
+        cls.donor = HederaUser.objects.create(
+            username="bob", wallet_address="0.0.1002", evm_address="0x00000000000000000000000000000000000003ea",
+        )
+        defaults = {
+            "goal": 100, "organizer": cls.organizer,
+            "campaign_type": CampaignType.objects.create(name="Health"),
+            "token": Token.objects.create(name="Token", symbol="TKN", address="0x1"),
+        }
+        cls.campaign = Campaign.objects.create(title="Clean water wells", description="Villages", **defaults)
+        cls.other = Campaign.objects.create(title="Library books", description="Reading rooms", **defaults)
+        for n in range(4):
+            Donation.objects.create(campaign=cls.campaign, user=cls.donor, amount=1, transaction_hash=f"0xabc{n}")
+        Donation.objects.create(campaign=cls.other, user=cls.organizer, amount=1, transaction_hash="0xdef")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def changelist(self, model, **params):
+        response = self.client.get(f"/admin/donation_app/{model}/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.context["cl"]
+
+    def test_counts_use_estimates_past_the_limit(self):
+        with mock.patch("donation_app.changelists.table_estimate", return_value=5000):
+            with self.assertNumQueries(0):
+                self.assertEqual(EstimatedCountPaginator(Donation.objects.all(), 10).count, 5000)
+        # small tables are counted
+        self.assertEqual(EstimatedCountPaginator(Campaign.objects.order_by("id"), 10).count, 2)
+        self.assertEqual(EstimatedCountPaginator(Donation.objects.filter(campaign=self.other), 10).count, 1)
+        # filtered counts stop at the limit and take the planner's word past it
+        matched = Donation.objects.filter(campaign=self.campaign)
+        with mock.patch("donation_app.changelists.query_estimate", return_value=900):
+            self.assertEqual(EstimatedCountPaginator(matched, 10).count, 900)
+
+    def test_changelists_filter_on_autocomplete(self):
+        cl = self.changelist("donation", campaign__id__exact=self.campaign.id)
+        self.assertEqual(cl.result_count, 3)
+        self.assertIsNone(cl.full_result_count)
+        response = self.client.get("/admin/donation_app/donation/", {"user__id__exact": self.organizer.id})
+        self.assertContains(response, "admin-autocomplete")
+        self.assertContains(response, "donation_app/admin/autocomplete_filter.js")
+        self.assertEqual(self.client.get("/admin/donation_app/donation/", {"campaign__id__exact": "x"}).status_code, 302)
+        self.assertEqual(self.changelist("campaign", organizer__id__exact=self.organizer.id).result_count, 2)
+
+    def test_search_uses_exact_identifiers(self):
+        self.assertEqual([d.transaction_hash for d in self.changelist("donation", q="0xdef").result_list], ["0xdef"])
+        self.assertEqual(len(self.changelist("donation", q="0.0.1002").result_list), 4)
+        # EVM addresses match whatever their case
+        self.assertEqual(len(self.changelist("donation", q="0x00000000000000000000000000000000000003EA").result_list), 4)
+        self.assertEqual(list(self.changelist("hederauser", q="BO").result_list), [self.donor])
+        self.assertEqual(list(self.changelist("hederauser", q="0.0.100").result_list), [self.donor, self.organizer])
+        self.assertEqual(list(self.changelist("campaign", q="wel").result_list), [self.campaign])
+        self.assertEqual(list(self.changelist("campaign", q=str(self.other.id)).result_list), [self.other])
@@ -0,0 +1,187 @@
+"""
+Resumable chunked uploads.
+
+    POST /uploads                        -> start(): {upload_id, part_size, part_count}
+    PUT  /uploads/{id}/parts/{number}    -> save_part(): raw part bytes as the body
+    GET  /uploads/{id}                   -> which parts arrived, to resume
+    POST /uploads/{id}/complete          -> complete(): {file_name, file_url, sha256}
+
+Every part is streamed from the request into default_storage in 64 KiB
+pieces (File.DEFAULT_CHUNK_SIZE) and hashed on the way, so a worker holds
+one piece of one part in memory whatever the file size. A failed part is
+simply sent again. Completing streams the parts, in order, into
+content-addressed storage (see storage.py), which hashes the file as a
+whole and names it by that hash; the parts are deleted afterwards.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from ninja.errors import HttpError
+
+from .models import ChunkedUpload, ChunkedUploadPart
+
+FILE_URL_ROOT = "/api/read-file"
+
+
+class HashingReader:
+    """
+    Reads at most `limit` bytes from `stream`, feeding them to `digest`.
+    """
+
+    def __init__(self, stream, digest, limit):
+        self.stream = stream
+        self.digest = digest
+        self.remaining = limit
+        self.size = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.stream.read(size) if size else b""
+        self.remaining -= len(data)
+        self.size += len(data)
+        self.digest.update(data)
+        return data
+
+
+class PartsReader:
+    """
+    The parts of an upload read back to back, as one stream.
+    """
+
+    def __init__(self, storage_names):
+        self._names = iter(storage_names)
+        self._current = None
+
+    def read(self, size=-1):
+        while True:
+            if self._current is None:
+                name = next(self._names, None)
+                if name is None:
+                    return b""
+                self._current = default_storage.open(name, "rb")
+            data = self._current.read(size)
+            if data:
+                return data
+            self._current.close()
+            self._current = None
+
+    def close(self):
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+
+
+def file_url(file_name):
+    return f"{FILE_URL_ROOT}/{file_name}"
+
+
+def start(user_id, original_name, size, sha256=None):
+    if size < 0 or size > settings.UPLOAD_MAX_SIZE:
+        raise HttpError(400, f"File size must be between 0 and {settings.UPLOAD_MAX_SIZE} bytes")
+    return ChunkedUpload.objects.create(
+        user_id=user_id,
+        original_name=original_name,
+        size=size,
+        part_size=settings.UPLOAD_PART_SIZE,
+        expected_sha256=sha256.lower() if sha256 else None,
+    )
+
+
+def get_upload(upload_id, user_id):
+    try:
+        return ChunkedUpload.objects.get(id=upload_id, user_id=user_id)
+    except ChunkedUpload.DoesNotExist:
+        raise HttpError(404, "Upload not found")
+
+
+def save_part(upload, number, stream):
+    """
+    Streams part `number` of `upload` from `stream` into storage. Sending a
+    part again replaces it.
+    """
+    if upload.status != ChunkedUpload.STATUS_PENDING:
+        raise HttpError(409, "Upload is already complete")
+    if not 1 <= number <= upload.part_count:
+        raise HttpError(400, f"Part number must be between 1 and {upload.part_count}")
+
+    expected = upload.part_length(number)
+    # one byte more than the part may hold, to notice an oversized body
+    reader = HashingReader(stream, hashlib.sha256(), expected + 1)
+    storage_name = default_storage.save(f"uploads/{upload.id}/{number:05d}", File(reader))
+    if reader.size != expected:
+        default_storage.delete(storage_name)
+        raise HttpError(400, f"Part {number} must be {expected} bytes, got {reader.size}")
+
+    with transaction.atomic():
+        previous = (
+            ChunkedUploadPart.objects.select_for_update()
+            .filter(upload=upload, number=number)
+            .values_list("storage_name", flat=True)
+            .first()
+        )
+        part, _ = ChunkedUploadPart.objects.update_or_create(
+            upload=upload,
+            number=number,
+            defaults={"size": reader.size, "sha256": reader.digest.hexdigest(), "storage_name": storage_name},
+        )
+        # touch the upload so purge_uploads sees it as active
+        upload.save(update_fields=["updated_at"])
+    if previous and previous != storage_name:
+        default_storage.delete(previous)
+    return part
+
+
+def complete(upload):
+    """
+    Joins the parts of `upload` into its file and deletes them. Completing
+    again returns the same result.
+
+    The file is assembled and checked against the expected SHA-256 with no
+    transaction open, however large it is; only marking the upload complete
+    locks its row, and a part replaced in the meantime makes that fail.
+    """
+    upload = ChunkedUpload.objects.get(pk=upload.pk)
+    if upload.status == ChunkedUpload.STATUS_COMPLETE:
+        return upload
+    parts = list(upload.parts.order_by("number"))
+    missing = sorted(set(range(1, upload.part_count + 1)) - {part.number for part in parts})
+    if missing:
+        raise HttpError(400, f"Missing parts: {', '.join(map(str, missing))}")
+
+    source = PartsReader([part.storage_name for part in parts])
+    try:
+        # a file that does not match is never stored; one that does is a
+        # blob other uploads may share, and collect_blobs removes it if
+        # nothing comes to refer to it
+        file_name = default_storage.save_content(
+            File(source), os.path.splitext(upload.original_name)[1], sha256=upload.expected_sha256
+        )
+    except ValueError:
+        raise HttpError(400, "SHA-256 of the uploaded file does not match")
+    except FileNotFoundError:
+        raise HttpError(409, "A part was replaced while completing the upload; complete it again")
+    finally:
+        source.close()
+
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status == ChunkedUpload.STATUS_COMPLETE:
+            return upload
+        current = list(upload.parts.order_by("number").values_list("storage_name", flat=True))
+        if current != [part.storage_name for part in parts]:
+            raise HttpError(409, "A part was replaced while completing the upload; complete it again")
+
+        upload.file_name = file_name
+        upload.sha256 = file_name[:64]
+        upload.status = ChunkedUpload.STATUS_COMPLETE
+        upload.save(update_fields=["file_name", "sha256", "status", "updated_at"])
+        upload.parts.all().delete()
+
+    for part in parts:
+        default_storage.delete(part.storage_name)
+    return upload
@@ -1,3 +1,14 @@
-from django.shortcuts import render
+from django.http import Http404
 
-# Create your views here.
+from .media import IMMUTABLE_NAME, serve_media
+
+
+def media(request, name):
+    """
+    MEDIA_URL: uploaded files, served like /api/read-file but inline. Only
+    finished uploads and their image variants: the rest of default_storage
+    (pending upload parts, files being stored) is not for anyone to read.
+    """
+    if not IMMUTABLE_NAME.match(name):
+        raise Http404("File not found")
+    return serve_media(request, name)
@@ -7,10 +7,94 @@ For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 
+import asyncio
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hedera_donation.settings")
 
-application = get_asgi_application()
+
+class ClientDisconnected(OSError):
+    pass
+
+
+class ConcurrencyLimit:
+    """
+    Lets at most `limit` HTTP requests per process compute their response at
+    once. Django runs each request's sync code (the async ORM included) on a
+    thread of its own with its own database connection, so without a bound
+    every slow client that finishes its request at the same moment would
+    start a thread and wait on the connection pool.
+
+    A request takes its slot once its body has arrived and gives it back when
+    its response starts, so slow uploads and slow readers hold none. Bodies
+    streamed after that (the donation exports) are limited where they read
+    the database, see donation_app/exports.py. Waiting requests cost nothing
+    but a coroutine on the event loop.
+
+    Once the response has started, a client that goes away makes the next
+    send raise ClientDisconnected: the server would drop the body silently,
+    and Django 4.2 would stream an export to its end for nobody.
+    """
+
+    def __init__(self, app, limit):
+        self.app = app
+        self.limit = limit
+        self._semaphore = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if self._semaphore is None:
+            # created on first use so it binds to the server's event loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+        semaphore = self._semaphore
+        held = False
+        disconnected = asyncio.Event()
+        watcher = None
+
+        async def watch():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        async def limited_receive():
+            nonlocal held
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body", False) and not held:
+                await semaphore.acquire()
+                held = True
+            return message
+
+        async def limited_send(message):
+            nonlocal held, watcher
+            if disconnected.is_set():
+                raise ClientDisconnected("Client disconnected")
+            if message["type"] == "http.response.start":
+                if held:
+                    held = False
+                    semaphore.release()
+                # the request body has been read: receive() now only
+                # reports the client going away
+                watcher = asyncio.ensure_future(watch())
+            await send(message)
+
+        try:
+            return await self.app(scope, limited_receive, limited_send)
+        except ClientDisconnected:
+            pass
+        finally:
+            if held:
+                semaphore.release()
+            if watcher is not None:
+                watcher.cancel()
+
+
+application = ConcurrencyLimit(get_asgi_application(), settings.ASGI_MAX_CONCURRENT_REQUESTS)
+
+# nginx proxies /static/admin/ here; serve it the way runserver did
+if settings.DEBUG:
+    application = ASGIStaticFilesHandler(application)
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Load .env file
@@ -25,11 +26,13 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "corsheaders",  # CORS support
     "donation_app",
 ]
 
 MIDDLEWARE = [
+    "donation_app.middleware.release_connections_middleware",
     "corsheaders.middleware.CorsMiddleware",  # CORS middleware
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -38,6 +41,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "donation_app.middleware.replica_routing_middleware",
 ]
 
 ROOT_URLCONF = "hedera_donation.urls"
@@ -69,9 +73,64 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD", "hedera_hackathon"),
         "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
         "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        # only for the unpooled engine under WSGI; ASGI runs each request on
+        # a fresh thread, so persistent per-thread connections would pile up
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Pooled connections (see donation_app/db/base.py): each process keeps up to
+# POSTGRES_POOL_MAX_SIZE connections open and reuses them across requests.
+# Behind a transaction-mode pooler such as PgBouncer set
+# POSTGRES_TRANSACTION_POOLER, which turns off the session-bound features:
+# prepared statements and server-side cursors.
+POSTGRES_TRANSACTION_POOLER = os.environ.get("POSTGRES_TRANSACTION_POOLER", "False").lower() == "true"
+if os.environ.get("POSTGRES_POOL_ENABLED", "True").lower() == "true":
+    DATABASES["default"].update({
+        "ENGINE": "donation_app.db",
+        # closing hands the connection back to the pool
+        "CONN_MAX_AGE": 0,
+        "DISABLE_SERVER_SIDE_CURSORS": POSTGRES_TRANSACTION_POOLER,
+        "OPTIONS": {
+            "pool": {
+                "max_size": int(os.environ.get("POSTGRES_POOL_MAX_SIZE", "32")),
+                "timeout": int(os.environ.get("POSTGRES_POOL_TIMEOUT", "30")),
+                "max_idle": int(os.environ.get("POSTGRES_POOL_MAX_IDLE", "300")),
+                "max_lifetime": int(os.environ.get("POSTGRES_POOL_MAX_LIFETIME", "3600")),
+            },
+            "prepare_threshold": (
+                None if POSTGRES_TRANSACTION_POOLER
+                else int(os.environ.get("POSTGRES_PREPARE_THRESHOLD", "5")) or None
+            ),
+        },
+    })
+
+# Read replicas: one alias per POSTGRES_REPLICA_HOSTS entry ("host" or
+# "host:port"), same credentials as the primary. Read-only API requests
+# (DATABASE_REPLICA_PATHS) read from them round-robin; see
+# donation_app/db/routers.py. Listing the primary's own host works for local
+# testing. Tests run replicas as mirrors of the test database.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(","))):
+    host, _, port = replica.partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index}")
+DATABASE_ROUTERS = ["donation_app.db.routers.ReplicaRouter"]
+DATABASE_REPLICA_PATHS = ("/api/",)
+# Replicas further behind than this many seconds are skipped
+DATABASE_REPLICA_MAX_LAG = int(os.environ.get("DATABASE_REPLICA_MAX_LAG", "5"))
+DATABASE_REPLICA_CHECK_INTERVAL = int(os.environ.get("DATABASE_REPLICA_CHECK_INTERVAL", "5"))
+# After a successful POST/PUT/PATCH/DELETE the user reads from the primary for
+# this long. The pin lives in the API cache, which must then be shared by all
+# processes (checked below): a request landing on another worker has to see it.
+READ_YOUR_WRITES_SECONDS = int(os.environ.get("READ_YOUR_WRITES_SECONDS", "10"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -90,8 +149,104 @@ USE_TZ = True
 STATIC_URL = "/static/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 MEDIA_URL = "/media/"
+# Uploads are stored once per content hash (see donation_app/storage.py);
+# API replicas share MEDIA_ROOT on one volume
+STORAGES = {
+    "default": {"BACKEND": "donation_app.storage.ContentAddressedStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+# Seconds a stored file must have gone unreferenced before
+# manage.py collect_blobs deletes it
+BLOB_GC_GRACE = int(os.environ.get("BLOB_GC_GRACE", str(24 * 60 * 60)))
+# Internal nginx location that serves MEDIA_ROOT (e.g. "/protected-media/").
+# When set, media responses carry X-Accel-Redirect and nginx sends the bytes.
+MEDIA_ACCEL_REDIRECT = os.environ.get("MEDIA_ACCEL_REDIRECT", "")
+# Bytes read per step when Django sends a media file itself
+MEDIA_CHUNK_SIZE = int(os.environ.get("MEDIA_CHUNK_SIZE", str(256 * 1024)))
+# Processes per web worker building image variants (donation_app/images.py);
+# 0 builds them inline, in the request
+IMAGE_VARIANT_WORKERS = int(os.environ.get("IMAGE_VARIANT_WORKERS", "2"))
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Cache configuration; point CACHE_BACKEND at a shared backend (e.g. Redis)
+# when running more than one process
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "hedera-donation"),
+    }
+}
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+# Response cache for public API endpoints. Cached responses are invalidated
+# through version stamps in the cache, bumped by whichever process wrote:
+# run_indexer, ingest_donations and refresh_leaderboard run outside the API
+# workers, so with a process-local backend their writes would stay unseen
+# for the whole TTL. It is therefore off by default on such a backend, and
+# turning it on there is a configuration error.
+API_CACHE_ALIAS = "default"
+API_CACHE_ENABLED = os.environ.get(
+    "API_CACHE_ENABLED", str(CACHES[API_CACHE_ALIAS]["BACKEND"] not in PROCESS_LOCAL_CACHES)
+).lower() == "true"
+if API_CACHE_ENABLED and CACHES[API_CACHE_ALIAS]["BACKEND"] in PROCESS_LOCAL_CACHES:
+    raise ImproperlyConfigured("API_CACHE_ENABLED needs a CACHE_BACKEND shared by all processes")
+if DATABASE_REPLICAS and CACHES[API_CACHE_ALIAS]["BACKEND"] in PROCESS_LOCAL_CACHES:
+    raise ImproperlyConfigured(
+        "POSTGRES_REPLICA_HOSTS needs a CACHE_BACKEND shared by all processes for read-your-writes pins"
+    )
+
+# In-process cache of authenticated users (see donation_app/auth.py)
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", "1024"))
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", "30"))
+
+# Requests one ASGI process computes a response for at a time (see
+# hedera_donation/asgi.py): each holds a worker thread and a database
+# connection until its response starts; the rest wait on the event loop.
+# Database connections are bounded separately by POSTGRES_POOL_MAX_SIZE.
+ASGI_MAX_CONCURRENT_REQUESTS = int(os.environ.get("ASGI_MAX_CONCURRENT_REQUESTS", "32"))
+
+# Rows fetched per server-side cursor round trip by the donation exports
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", "2000"))
+# Exports one process streams at a time. Each keeps a database connection
+# for its whole download, so keep this well below POSTGRES_POOL_MAX_SIZE;
+# further exports wait on the event loop before reading anything.
+EXPORT_MAX_CONCURRENT = int(os.environ.get("EXPORT_MAX_CONCURRENT", "4"))
+
+# Shared secret for internal service endpoints (X-API-Key); empty disables them
+SERVICE_API_KEY = os.environ.get("SERVICE_API_KEY", "")
+
+# Mirror node indexer (manage.py run_indexer)
+MIRROR_NODE_URL = os.environ.get("MIRROR_NODE_URL", "https://testnet.mirrornode.hedera.com")
+HEDERA_CONTRACT_ID = os.environ.get("HEDERA_CONTRACT_ID", "0.0.5224129")
+# Seconds before an unknown EVM address is looked up on the mirror node again
+EVM_ADDRESS_NEGATIVE_TTL = int(os.environ.get("EVM_ADDRESS_NEGATIVE_TTL", "600"))
+
+# API pagination
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", "20"))
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", "100"))
+# /campaigns/search (see donation_app/search.py): how many matches, newest
+# first, get ranked, and how many of the newest campaigns are scanned for
+# them before the full-text indexes are asked instead
+SEARCH_MAX_MATCHES = int(os.environ.get("SEARCH_MAX_MATCHES", "1000"))
+SEARCH_WALK_ROWS = int(os.environ.get("SEARCH_WALK_ROWS", "50000"))
+# Admin changelists (see donation_app/changelists.py) count filtered rows
+# up to this many, then show the planner's estimate; so do unfiltered
+# tables larger than this
+ADMIN_EXACT_COUNT_LIMIT = int(os.environ.get("ADMIN_EXACT_COUNT_LIMIT", "10000"))
+# Seconds the donation history summaries (counts and totals) are cached
+DONATION_SUMMARY_TTL = int(os.environ.get("DONATION_SUMMARY_TTL", "60"))
+
+# Chunked uploads (see donation_app/uploads.py). UPLOAD_MAX_SIZE bounds the
+# whole file, nginx's client_max_body_size for /api/uploads/ one part. Parts
+# are kept UPLOAD_EXPIRY seconds after the last one arrived before
+# manage.py purge_uploads removes them.
+UPLOAD_PART_SIZE = int(os.environ.get("UPLOAD_PART_SIZE", str(8 * 1024 * 1024)))
+UPLOAD_MAX_SIZE = int(os.environ.get("UPLOAD_MAX_SIZE", str(8000 * 1024 * 1024)))
+UPLOAD_EXPIRY = int(os.environ.get("UPLOAD_EXPIRY", str(24 * 60 * 60)))
+
 # CORS Configuration
 CORS_ALLOW_ALL_ORIGINS = os.environ.get("CORS_ALLOW_ALL_ORIGINS", "True").lower() == "true"
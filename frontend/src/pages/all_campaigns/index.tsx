@@ -1,17 +1,39 @@
 import { UrlMapping } from "@/commons/url-mapping.common";
 import Footer from "@/components/Footer";
 import NavigationBar from "@/components/NavBar";
-import { useCampaigns } from "@/services/apis/core";
+import useInfiniteScroll from "@/hooks/useInfiniteScroll";
+import { useCampaigns, useCampaignSearch } from "@/services/apis/core";
 import { getStatusBadgeClass } from "@/utils/colors";
 import { formatDistanceToNow } from "date-fns";
-import React from "react";
+import React, { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 
 const AllCampaignsPage: React.FC = () => {
   const navigate = useNavigate();
+  const [searchInput, setSearchInput] = useState("");
+  const [query, setQuery] = useState("");
 
-  // Fetch campaigns data from the API
-  const { data: campaigns, isLoading, error } = useCampaigns();
+  // Search once the user stops typing for a moment
+  useEffect(() => {
+    const timer = setTimeout(() => setQuery(searchInput.trim()), 300);
+    return () => clearTimeout(timer);
+  }, [searchInput]);
+
+  // Fetch campaigns data from the API: newest first, or best matches
+  const listing = useCampaigns({ enabled: !query });
+  const search = useCampaignSearch({ variables: { q: query }, enabled: !!query });
+  const {
+    data,
+    isLoading,
+    error,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = query ? search : listing;
+  const campaigns = data?.pages.flatMap((page) => page.items);
+
+  // Load the next page when the user scrolls to the bottom
+  useInfiniteScroll(fetchNextPage, isFetchingNextPage, hasNextPage);
 
   return (
     <div className="bg-gray-50 min-h-screen">
@@ -22,6 +44,14 @@ const AllCampaignsPage: React.FC = () => {
           All Campaigns
         </h2>
 
+        <input
+          type="search"
+          value={searchInput}
+          onChange={(event) => setSearchInput(event.target.value)}
+          placeholder="Search campaigns..."
+          className="w-full md:w-1/2 mx-auto block mb-12 px-4 py-3 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+        />
+
         {/* Show loading state */}
         {isLoading && (
           <p className="text-center text-gray-600">Loading campaigns...</p>
@@ -32,6 +62,12 @@ const AllCampaignsPage: React.FC = () => {
           <p className="text-center text-red-600">Failed to load campaigns.</p>
         )}
 
+        {!isLoading && query && campaigns?.length === 0 && (
+          <p className="text-center text-gray-600">
+            No campaigns match "{query}".
+          </p>
+        )}
+
         {/* Campaigns grid */}
         {!isLoading && campaigns && (
           <section className="grid grid-cols-1 md:grid-cols-3 gap-12">
@@ -41,7 +77,7 @@ const AllCampaignsPage: React.FC = () => {
                 className="bg-white shadow-lg rounded-lg overflow-hidden hover:shadow-xl transition duration-300 flex flex-col min-h-[500px]"
               >
                 <img
-                  src={campaign.image || "https://via.placeholder.com/150"}
+                  src={campaign.image_variants?.card || campaign.image || "https://via.placeholder.com/150"}
                   alt={campaign.title}
                   className="w-full h-56 object-cover"
                 />
@@ -43,12 +43,16 @@ const CampaignDetailsPage: React.FC = () => {
   });
 
   const {
-    data: donationHistory,
+    data: donationPages,
     isLoading: isHistoryLoading,
     refetch: refreshHistory,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
   } = useDonationHistoryByCampaign({
     variables: { campaignId: Number(id) },
   });
+  const donationHistory = donationPages?.pages.flatMap((page) => page.items);
 
   const { getTokenBalance, balance } = useTokenBalance();
 
@@ -103,7 +107,7 @@ const CampaignDetailsPage: React.FC = () => {
       return <p>No donations yet.</p>;
     }
 
-    return donationHistory.map((donation, index) => (
+    const donations = donationHistory.map((donation, index) => (
       <div
         key={index}
         className="p-3 border rounded-lg shadow-lg flex items-center space-x-6 hover:bg-gray-50 transition ease-in-out duration-300 mt-3"
@@ -146,6 +150,21 @@ const CampaignDetailsPage: React.FC = () => {
         </div>
       </div>
     ));
+
+    return (
+      <>
+        {donations}
+        {hasNextPage && (
+          <button
+            className="mt-4 text-blue-700 hover:underline"
+            onClick={() => fetchNextPage()}
+            disabled={isFetchingNextPage}
+          >
+            {isFetchingNextPage ? "Loading..." : "Load more donations"}
+          </button>
+        )}
+      </>
+    );
   };
 
   const renderRelatedCampaigns = () => {
@@ -157,7 +176,7 @@ const CampaignDetailsPage: React.FC = () => {
         className="bg-white shadow-lg rounded-lg overflow-hidden hover:shadow-xl transition duration-300"
       >
         <img
-          src={related.image}
+          src={related.image_variants?.card || related.image}
           alt={related.title}
           className="w-full h-56 object-cover"
         />
@@ -243,7 +262,7 @@ const CampaignDetailsPage: React.FC = () => {
         {/* Campaign Image */}
         <div className="relative mb-12">
           <img
-            src={campaign?.image || "https://via.placeholder.com/150"}
+            src={campaign?.image_variants?.hero || campaign?.image || "https://via.placeholder.com/150"}
             alt="Campaign"
             className="w-full max-h-[80vh] rounded-lg object-cover shadow-xl p-5"
           />
@@ -72,7 +72,7 @@ const HomePage: React.FC = () => {
                   className="bg-white shadow-md rounded-lg overflow-hidden hover:shadow-xl transition duration-300 flex flex-col"
                 >
                   <img
-                    src={campaign.image || "https://via.placeholder.com/150"}
+                    src={campaign.image_variants?.card || campaign.image || "https://via.placeholder.com/150"}
                     alt={campaign.title}
                     className="w-full h-56 object-cover"
                   />
@@ -155,7 +155,7 @@ const HomePage: React.FC = () => {
 
               {topDonors?.map((donor) => (
                 <div
-                  key={donor.id}
+                  key={`${donor.id}-${donor.token_id}`}
                   className="bg-white shadow-lg rounded-lg p-8 flex items-center space-x-6 hover:shadow-xl transition duration-300"
                 >
                   <div className="min-w-16 min-h-16 rounded-full bg-yellow-400 text-white flex items-center justify-center font-bold text-2xl shadow-md">
@@ -1,5 +1,6 @@
 import { UrlMapping } from "@/commons/url-mapping.common";
 import env from "@/env";
+import useInfiniteScroll from "@/hooks/useInfiniteScroll";
 import { useDonationHistory } from "@/services/apis/core";
 import { shortenTransactionHash } from "@/utils/transaction_string";
 import { formatDistanceToNow } from "date-fns";
@@ -7,10 +8,19 @@ import React from "react";
 import { useNavigate } from "react-router-dom";
 
 const DonationHistoryTab: React.FC = () => {
-  const { data: donationHistory, isLoading: isHistoryLoading } =
-    useDonationHistory();
+  const {
+    data,
+    isLoading: isHistoryLoading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useDonationHistory();
+  const donationHistory = data?.pages.flatMap((page) => page.items);
   const navigate = useNavigate();
 
+  // Load the next page when the user scrolls to the bottom
+  useInfiniteScroll(fetchNextPage, isFetchingNextPage, hasNextPage);
+
   const handleViewCampaign = (id: number) => {
     navigate(`${UrlMapping.campaign_detail}/${id}`);
   };
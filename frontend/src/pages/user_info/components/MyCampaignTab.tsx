@@ -48,7 +48,7 @@ const MyCampaignTab: React.FC = () => {
             >
               <div className="flex items-center space-x-6">
                 <img
-                  src={campaign?.image || "https://via.placeholder.com/150"}
+                  src={campaign?.image_variants?.card || campaign?.image || "https://via.placeholder.com/150"}
                   alt={campaign.title}
                   className="w-24 h-24 object-cover rounded-lg"
                 />
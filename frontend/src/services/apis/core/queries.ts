@@ -1,4 +1,8 @@
-import { createMutation, createQuery } from "react-query-kit";
+import {
+  createInfiniteQuery,
+  createMutation,
+  createQuery,
+} from "react-query-kit";
 import {
   createCampaign,
   getCampaignDetails,
@@ -11,15 +15,17 @@ import {
   getUserInfo,
   listCampaignTypes,
   listTokens,
+  searchCampaigns,
   updateUser,
 } from "./request";
 import {
   ICampaign,
   ICampaignDetailResponse,
-  ICampaignDonationHistory,
+  ICampaignDonationPage,
+  ICampaignPage,
   ICampaignType,
   ICreateCampaignPayload,
-  IDonationHistory,
+  IDonationHistoryPage,
   IToken,
   ITopCampaign,
   ITopDonor,
@@ -32,10 +38,28 @@ export const useUserInfo = createQuery<IUserInfo>({
   fetcher: () => getUserInfo(),
 });
 
-export const useCampaigns = createQuery<ICampaign[]>({
+export const useCampaigns = createInfiniteQuery<
+  ICampaignPage,
+  void,
+  Error,
+  string | null
+>({
   queryKey: ["useCampaigns"],
-  fetcher: () => getCampaigns(),
-  refetchInterval: 1000 * 3, // 3 seconds
+  fetcher: (_variables, { pageParam }) => getCampaigns(pageParam),
+  initialPageParam: null,
+  getNextPageParam: (lastPage) => lastPage.next_cursor,
+});
+
+export const useCampaignSearch = createInfiniteQuery<
+  ICampaignPage,
+  { q: string },
+  Error,
+  string | null
+>({
+  queryKey: ["useCampaignSearch"],
+  fetcher: ({ q }, { pageParam }) => searchCampaigns(q, pageParam),
+  initialPageParam: null,
+  getNextPageParam: (lastPage) => lastPage.next_cursor,
 });
 
 export const useCampaignDetails = createQuery<
@@ -47,10 +71,16 @@ export const useCampaignDetails = createQuery<
   refetchInterval: 1000 * 3, // 3 seconds
 });
 
-export const useDonationHistory = createQuery<IDonationHistory[]>({
+export const useDonationHistory = createInfiniteQuery<
+  IDonationHistoryPage,
+  void,
+  Error,
+  string | null
+>({
   queryKey: ["useDonationHistory"],
-  fetcher: () => getDonationHistory(),
-  refetchInterval: 1000 * 3, // 3 seconds
+  fetcher: (_variables, { pageParam }) => getDonationHistory(pageParam),
+  initialPageParam: null,
+  getNextPageParam: (lastPage) => lastPage.next_cursor,
 });
 
 export const useTopDonors = createQuery<ITopDonor[]>({
@@ -83,13 +113,17 @@ export const useUserCampaigns = createQuery<ICampaign[]>({
   refetchInterval: 1000 * 3, // 3 seconds
 });
 
-export const useDonationHistoryByCampaign = createQuery<
-  ICampaignDonationHistory[],
-  { campaignId: number }
+export const useDonationHistoryByCampaign = createInfiniteQuery<
+  ICampaignDonationPage,
+  { campaignId: number },
+  Error,
+  string | null
 >({
   queryKey: ["useDonationHistoryByCampaign"],
-  fetcher: ({ campaignId }) => getDonationHistoryByCampaign(campaignId),
-  refetchInterval: 1000 * 3, // 3 seconds
+  fetcher: ({ campaignId }, { pageParam }) =>
+    getDonationHistoryByCampaign(campaignId, pageParam),
+  initialPageParam: null,
+  getNextPageParam: (lastPage) => lastPage.next_cursor,
 });
 
 export const useUpdateUser = createMutation<void, IUserUpdatePayload>({
@@ -2,10 +2,11 @@ import api from "../api";
 import {
   ICampaign,
   ICampaignDetailResponse,
-  ICampaignDonationHistory,
+  ICampaignDonationPage,
+  ICampaignPage,
   ICampaignType,
   ICreateCampaignPayload,
-  IDonationHistory,
+  IDonationHistoryPage,
   IToken,
   ITopCampaign,
   ITopDonor,
@@ -19,9 +20,24 @@ export const getUserInfo = async (): Promise<IUserInfo> => {
   return response.data;
 };
 
-// Fetch campaigns
-export const getCampaigns = async (): Promise<ICampaign[]> => {
-  const response = await api.get<ICampaign[]>("/campaigns");
+// Fetch one page of campaigns
+export const getCampaigns = async (
+  cursor?: string | null
+): Promise<ICampaignPage> => {
+  const response = await api.get<ICampaignPage>("/campaigns", {
+    params: cursor ? { cursor } : undefined,
+  });
+  return response.data;
+};
+
+// Fetch one page of campaigns matching a search query, best matches first
+export const searchCampaigns = async (
+  q: string,
+  cursor?: string | null
+): Promise<ICampaignPage> => {
+  const response = await api.get<ICampaignPage>("/campaigns/search", {
+    params: cursor ? { q, cursor } : { q },
+  });
   return response.data;
 };
 
@@ -33,9 +49,14 @@ export const getCampaignDetails = async (
   return response.data;
 };
 
-// Fetch donation history
-export const getDonationHistory = async (): Promise<IDonationHistory[]> => {
-  const response = await api.get<IDonationHistory[]>("/user/donation-history");
+// Fetch one page of donation history
+export const getDonationHistory = async (
+  cursor?: string | null
+): Promise<IDonationHistoryPage> => {
+  const response = await api.get<IDonationHistoryPage>(
+    "/user/donation-history",
+    { params: cursor ? { cursor } : undefined }
+  );
   return response.data;
 };
 
@@ -68,12 +89,14 @@ export const getUserCampaigns = async (): Promise<ICampaign[]> => {
   return response.data;
 };
 
-// Fetch donation history by campaign
+// Fetch one page of donation history by campaign
 export const getDonationHistoryByCampaign = async (
-  campaignId: number
-): Promise<ICampaignDonationHistory[]> => {
-  const response = await api.get<ICampaignDonationHistory[]>(
-    `/campaigns/${campaignId}/donations`
+  campaignId: number,
+  cursor?: string | null
+): Promise<ICampaignDonationPage> => {
+  const response = await api.get<ICampaignDonationPage>(
+    `/campaigns/${campaignId}/donations`,
+    { params: cursor ? { cursor } : undefined }
   );
   return response.data;
 };
@@ -39,12 +39,20 @@ export interface Organizer {
   email: string | null;
 }
 
+// Resized copies of an uploaded image; null for external images
+export interface IImageVariants {
+  thumb: string;
+  card: string;
+  hero: string;
+}
+
 // Core campaign type used for listings
 export interface ICampaign {
   id: number;
   title: string;
   description: string;
   image: string | null;
+  image_variants?: IImageVariants | null;
   goal: number;
   current_amount: number;
   progress: number;
@@ -62,6 +70,12 @@ export interface ICampaign {
   transaction_hash_withdrawn: string | null;
 }
 
+// One page of campaigns from the cursor-paginated listing
+export interface ICampaignPage {
+  items: ICampaign[];
+  next_cursor: string | null;
+}
+
 // Campaign detail type for a single campaign with additional fields
 
 // Related campaign type for the related campaigns list
@@ -70,6 +84,7 @@ export interface IRelatedCampaign {
   title: string;
   description: string;
   image: string;
+  image_variants?: IImageVariants | null;
   progress: number; // Percentage completed
   date: string; // Percentage completed
 }
@@ -102,12 +117,27 @@ export interface ICampaignDonationHistory {
   transaction_hash: string;
 }
 
+// One page of the cursor-paginated donation histories
+export interface IDonationHistoryPage {
+  items: IDonationHistory[];
+  next_cursor: string | null;
+}
+
+export interface ICampaignDonationPage {
+  items: ICampaignDonationHistory[];
+  next_cursor: string | null;
+}
+
 export interface ITopDonor {
   id: string;
   name: string;
   username: string;
   totalDonations: string;
   initials: string;
+  token_id: number;
+  token_symbol: string;
+  token_decimal: number;
+  total_amount: number;
 }
 
 export interface ITopCampaign {
@@ -115,6 +145,7 @@ export interface ITopCampaign {
   title: string;
   description: string;
   image: string;
+  image_variants?: IImageVariants | null;
   progress: number;
   status: CampaignStatus | null;
   date: string;
@@ -15,4 +15,7 @@ export const ENV = {
     RPC_URL: process.env.RPC_URL || "https://testnet.hashio.io/api",
     WORKER_PRIVATE_KEY: process.env.WORKER_PRIVATE_KEY || "",
     MIRROR_NODE: process.env.MIRROR_NODE || "https://testnet.mirrornode.hedera.com",
+    // The backend's run_indexer owns the "crawl_onchain" position; crawl here
+    // only where it does not run
+    CRAWL_LOGS: (process.env.CRAWL_LOGS || "false").toLowerCase() === "true",
 };
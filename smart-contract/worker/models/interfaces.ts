@@ -82,6 +82,7 @@ export interface ApprovedCampaignJoin {
     campaign_type_name: string;
     organizer_username: string;
     organizer_wallet_address: string;
+    organizer_evm_address: string | null;
     transaction_hash_create: string;
     transaction_hash_withdrawn: string;
 }
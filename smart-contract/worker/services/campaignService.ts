@@ -29,7 +29,8 @@ export const getApprovedCampaignJoins = async (): Promise<ApprovedCampaignJoin[]
                 t.decimal AS token_decimal,
                 ct.name AS campaign_type_name,
                 u.username AS organizer_username,
-                u.wallet_address AS organizer_wallet_address
+                u.wallet_address AS organizer_wallet_address,
+                u.evm_address AS organizer_evm_address
             FROM donation_app_campaign c
             INNER JOIN donation_app_token t ON c.token_id = t.id
             INNER JOIN donation_app_campaigntype ct ON c.campaign_type_id = ct.id
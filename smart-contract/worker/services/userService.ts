@@ -29,3 +29,19 @@ export const getUserByWalletAddress = async (walletAddress: string): Promise<Use
         if (client) client.release();
     }
 };
+
+export const setUserEvmAddress = async (walletAddress: string, evmAddress: string): Promise<void> => {
+    let client: PoolClient | undefined;
+
+    try {
+        client = await pool.connect();
+        await client.query(
+            "UPDATE donation_app_hederauser SET evm_address = $1 WHERE wallet_address = $2 AND evm_address IS NULL",
+            [evmAddress.toLowerCase(), walletAddress],
+        );
+    } catch (error) {
+        console.error("Error storing user EVM address:", error);
+    } finally {
+        if (client) client.release();
+    }
+};
@@ -3,6 +3,7 @@ import { abi, contractAddress, workerSigner } from "../config/contract";
 import { CampaignStatus } from "../models/enums";
 import { CampaignPublishResult } from "../models/interfaces";
 import { getApprovedCampaignJoins, updateCampaignIdOnchainAndStatus } from "../services/campaignService";
+import { setUserEvmAddress } from "../services/userService";
 import { accountIdToEvmAddress } from "../utils/conversions";
 
 async function publishAndApproveCampaign(campaignDetails: {
@@ -61,7 +62,11 @@ export const processNewCampaigns = async (): Promise<void> => {
 
     for (const campaign of pendingCampaigns) {
         console.log(`Processing campaign: ${campaign.title}`);
-        const evmAddress = await accountIdToEvmAddress(campaign.organizer_wallet_address);
+        let evmAddress = campaign.organizer_evm_address;
+        if (!evmAddress) {
+            evmAddress = await accountIdToEvmAddress(campaign.organizer_wallet_address);
+            await setUserEvmAddress(campaign.organizer_wallet_address, evmAddress);
+        }
 
         const campaignDetails = {
             offChainId: campaign.id,